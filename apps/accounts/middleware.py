@@ -1,6 +1,7 @@
-from django.core.cache import cache
 from django.http import JsonResponse
 
+from apps.common.cache import tiered_cache
+
 
 class MaintenanceModeMiddleware:
     """
@@ -22,13 +23,13 @@ class MaintenanceModeMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        if cache.get('system:maintenance_mode', False):
+        if tiered_cache.get('system:maintenance_mode', False):
             # Always let exempt paths through
             if not any(request.path.startswith(p) for p in self.EXEMPT_PREFIXES):
                 user = getattr(request, 'user', None)
                 role = getattr(user, 'role', None) if user and user.is_authenticated else None
                 if role != 'tasc_admin':
-                    message = cache.get(
+                    message = tiered_cache.get(
                         'system:maintenance_message',
                         'The platform is currently under maintenance. Please check back shortly.',
                     )
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_user_session"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="organization",
+            name="seat_alert_threshold",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+    ]
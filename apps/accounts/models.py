@@ -132,6 +132,8 @@ class Organization(models.Model):
     max_seats = models.PositiveIntegerField(
         null=True, blank=True, help_text="Maximum number of seats"
     )
+    # Highest seat-usage alert level (0/80/100 %) already sent; see check_seat_capacity
+    seat_alert_threshold = models.PositiveSmallIntegerField(default=0, editable=False)
 
     # Billing
     billing_email = models.EmailField(blank=True, null=True)
@@ -288,3 +290,44 @@ class UserSession(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.session_key[:8]}... ({self.ip_address})"
+
+
+class UserImportJob(models.Model):
+    """
+    A CSV user import run off the request path (apps.accounts.user_import).
+    Counters are updated after every chunk so clients can poll progress.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="user_import_jobs",
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    # Roles the requester may assign, fixed when the job is created
+    allowed_roles = models.JSONField(default=list)
+    # The uploaded CSV; cleared once the job finishes
+    source = models.TextField(blank=True, default="")
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"User import #{self.pk} ({self.status})"
@@ -0,0 +1,104 @@
+"""
+Organization seat usage.
+
+Member counts for one organization (`get_seat_usage`) or for every active
+organization (`all_seat_usage`) come from a single grouped aggregate and
+are cached per organization for ``SEAT_USAGE_CACHE_TTL`` seconds, so the
+seat usage and billing views and the daily capacity check share the same
+numbers. `apps.accounts.signals` drops an organization's entry whenever
+one of its memberships, or the organization itself, is saved or deleted.
+"""
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+
+CACHE_PREFIX = "seat_usage"
+
+# Alert levels for the capacity check, as percentages of max_seats
+WARNING_THRESHOLD = 80
+CAPACITY_THRESHOLD = 100
+
+
+@dataclass(frozen=True)
+class SeatUsage:
+    """Active membership counts of an organization against its seat limit."""
+
+    organization_id: int
+    max_seats: int | None
+    members: int = 0
+    seat_members: int = 0
+    learners: int = 0
+    # Organization.seat_alert_threshold when the counts were read
+    alert_threshold: int = 0
+
+    def percent_used(self, used=None):
+        """``used`` (by default all active members) as a percentage of max_seats."""
+        if not self.max_seats:
+            return 0
+        return (self.members if used is None else used) / self.max_seats * 100
+
+    def threshold(self):
+        """The highest alert level reached: 0, WARNING_THRESHOLD or CAPACITY_THRESHOLD."""
+        percent = self.percent_used()
+        if percent >= CAPACITY_THRESHOLD:
+            return CAPACITY_THRESHOLD
+        if percent >= WARNING_THRESHOLD:
+            return WARNING_THRESHOLD
+        return 0
+
+
+def _key(organization_id):
+    return f"{CACHE_PREFIX}:{organization_id}"
+
+
+def _annotated(queryset):
+    from .models import Membership
+
+    active = Q(memberships__is_active=True)
+    return queryset.annotate(
+        members=Count("memberships", filter=active),
+        # Org admins and managers don't occupy a seat
+        seat_members=Count(
+            "memberships",
+            filter=active & ~Q(memberships__role__in=[Membership.Role.ORG_ADMIN, Membership.Role.ORG_MANAGER]),
+        ),
+        learners=Count("memberships", filter=active & Q(memberships__role=Membership.Role.ORG_LEARNER)),
+    ).values_list("id", "max_seats", "members", "seat_members", "learners", "seat_alert_threshold")
+
+
+def all_seat_usage():
+    """Return ``{organization_id: SeatUsage}`` for every active organization, refreshing the cache."""
+    from .models import Organization
+
+    usage = {
+        row[0]: SeatUsage(*row)
+        for row in _annotated(Organization.objects.filter(is_active=True).order_by())
+    }
+    cache.set_many(
+        {_key(org_id): seats for org_id, seats in usage.items()},
+        settings.SEAT_USAGE_CACHE_TTL,
+    )
+    return usage
+
+
+def get_seat_usage(organization):
+    """Return the (cached) SeatUsage of ``organization``."""
+    from .models import Organization
+
+    usage = cache.get(_key(organization.pk))
+    if usage is None:
+        row = _annotated(Organization.objects.filter(pk=organization.pk).order_by()).first()
+        usage = SeatUsage(*row) if row else SeatUsage(organization.pk, organization.max_seats)
+        cache.set(_key(organization.pk), usage, settings.SEAT_USAGE_CACHE_TTL)
+    return usage
+
+
+def invalidate(organization_id):
+    """Drop an organization's cached usage now and again once the transaction commits."""
+    key = _key(organization_id)
+    cache.delete(key)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete(key))
@@ -1,7 +1,11 @@
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from apps.accounts import seat_usage
+from apps.accounts.models import Membership, Organization
+
 
 @receiver(user_logged_in)
 def create_user_session(sender, request, user, **kwargs):
@@ -61,8 +65,22 @@ def create_user_session(sender, request, user, **kwargs):
         logging.warning(f"Failed to create user session for {user.email}: {e}")
 
     try:
-        from apps.learning.badge_engine import check_and_award_badges
-        check_and_award_badges(user, criteria_types=['login_streak'])
+        from apps.learning.badge_engine import queue_badge_evaluation
+        queue_badge_evaluation(user.pk, ['login_streak'])
     except Exception as e:
         import logging
         logging.warning(f"Failed to check login streak badge for {user.email}: {e}")
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def invalidate_membership_seat_usage(sender, instance, **kwargs):
+    """Drop the cached seat usage of the membership's organization."""
+    seat_usage.invalidate(instance.organization_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization_seat_usage(sender, instance, **kwargs):
+    """A changed max_seats (or a deleted organization) invalidates its usage."""
+    seat_usage.invalidate(instance.pk)
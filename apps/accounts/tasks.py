@@ -0,0 +1,15 @@
+from celery import shared_task
+
+
+@shared_task
+def run_user_import(job_id):
+    """Run a queued CSV user import (see apps.accounts.user_import)."""
+    from apps.accounts.models import UserImportJob
+    from apps.accounts.user_import import run_import
+
+    job = UserImportJob.objects.filter(
+        pk=job_id, status=UserImportJob.Status.PENDING
+    ).first()
+    if job is None:
+        return None
+    return run_import(job)
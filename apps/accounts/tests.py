@@ -1983,43 +1983,105 @@ class AdminBulkImportNoOrganizationFieldTest(TestCase):
         from django.core.files.uploadedfile import SimpleUploadedFile
         return SimpleUploadedFile('import.csv', rows_csv.encode('utf-8'), content_type='text/csv')
 
+    def _import(self, csv_data, auth):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/admin/users/bulk_import/',
+                {'file': self._csv_file(csv_data)},
+                format='multipart',
+                **auth,
+            )
+        self.assertEqual(response.status_code, 202)
+        return self.client.get(f"/api/v1/admin/users/bulk_import/{response.json()['job_id']}/", **auth)
+
     def test_lms_manager_bulk_import_does_not_crash(self):
         """Regression: User() constructor must not receive organization=."""
         csv_data = "email,first_name,last_name,role,department,phone_number\nbulktest1@example.com,Bulk,Test,learner,,\n"
-        response = self.client.post(
-            '/api/v1/admin/users/bulk_import/',
-            {'file': self._csv_file(csv_data)},
-            format='multipart',
-            **self.mgr_auth,
-        )
-        self.assertIn(response.status_code, (200, 201))
+        response = self._import(csv_data, self.mgr_auth)
+        self.assertEqual(response.status_code, 200)
         data = response.json()
+        self.assertEqual(data['status'], 'completed')
         self.assertEqual(data['imported'], 1)
         self.assertTrue(User.objects.filter(email='bulktest1@example.com').exists())
 
     def test_tasc_admin_bulk_import_still_works(self):
         csv_data = "email,first_name,last_name,role,department,phone_number\nbulktest2@example.com,Admin,Import,learner,,\n"
-        response = self.client.post(
-            '/api/v1/admin/users/bulk_import/',
-            {'file': self._csv_file(csv_data)},
-            format='multipart',
-            **self.admin_auth,
-        )
-        self.assertIn(response.status_code, (200, 201))
+        response = self._import(csv_data, self.admin_auth)
+        self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()['imported'], 1)
 
     def test_imported_user_has_no_organization_attribute(self):
         """User model has no organization field; imported users must not have one."""
         csv_data = "email,first_name,last_name,role,department,phone_number\nbulktest3@example.com,No,Org,learner,,\n"
-        self.client.post(
-            '/api/v1/admin/users/bulk_import/',
-            {'file': self._csv_file(csv_data)},
-            format='multipart',
-            **self.mgr_auth,
-        )
+        self._import(csv_data, self.mgr_auth)
         user = User.objects.get(email='bulktest3@example.com')
         self.assertFalse(hasattr(user, 'organization'))
 
+    @override_settings(USER_IMPORT_CHUNK_SIZE=2, EMAIL_QUEUE_ENABLED=True)
+    def test_import_runs_in_chunks_with_set_based_checks(self):
+        from apps.accounts.models import UserImportJob
+        from apps.notifications.models import OutboundEmail
+
+        User.objects.create_user(username='taken', email='Taken@example.com', password='pass1234')
+        csv_data = (
+            "email,full_name,role\n"
+            "one@example.com,One Person,learner\n"
+            "taken@example.com,Already Here,learner\n"
+            "two@example.com,Two,instructor\n"
+            "ONE@example.com,Dup,learner\n"
+            "three@example.com,Three,lms_manager\n"
+            "not-an-email,Bad,learner\n"
+        )
+        response = self._import(csv_data, self.mgr_auth)
+
+        data = response.json()
+        self.assertEqual(
+            (data['status'], data['total_rows'], data['imported'], data['failed']),
+            ('completed', 6, 2, 4),
+        )
+        self.assertEqual(
+            [(e['row'], e['error']) for e in data['errors']],
+            [
+                (3, 'User already exists'),
+                (5, 'Duplicate email in file'),
+                (6, "Invalid role: 'lms_manager'. Must be one of: learner, instructor"),
+                (7, 'Invalid email format'),
+            ],
+        )
+        one = User.objects.get(email='one@example.com')
+        self.assertEqual((one.first_name, one.last_name), ('One', 'Person'))
+        self.assertFalse(one.has_usable_password())
+        self.assertTrue(one.must_set_password)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+        self.assertEqual(UserImportJob.objects.get().source, '')
+
+        # Another manager cannot read this job
+        other = User.objects.create_user(
+            username='other_mgr', email='other_mgr@example.com', password='pass1234', role=User.Role.LMS_MANAGER
+        )
+        token = RefreshToken.for_user(other)
+        response = self.client.get(
+            f"/api/v1/admin/users/bulk_import/{data['job_id']}/",
+            HTTP_AUTHORIZATION=f'Bearer {token.access_token}',
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_superadmin_bulk_import_accepts_manager_role(self):
+        csv_data = "email,full_name,role\nsa_import@example.com,Super Import,manager\n"
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                '/api/v1/superadmin/users/bulk_import/',
+                {'file': self._csv_file(csv_data)},
+                format='multipart',
+                **self.admin_auth,
+            )
+        self.assertEqual(response.status_code, 202)
+        response = self.client.get(
+            f"/api/v1/superadmin/users/bulk_import/{response.json()['job_id']}/", **self.admin_auth
+        )
+        self.assertEqual(response.json()['imported'], 1)
+        self.assertEqual(User.objects.get(email='sa_import@example.com').role, User.Role.LMS_MANAGER)
+
 
 class LivestreamPermissionAdminLikeTests(TestCase):
     def test_tasc_admin_passes_instructor_or_read_only_permission(self):
@@ -2049,3 +2111,88 @@ class LivestreamPermissionAdminLikeTests(TestCase):
         session_like_obj.instructor = instructor_user
 
         self.assertTrue(permission.has_object_permission(request, None, session_like_obj))
+
+
+class SeatUsageTests(TestCase):
+    """Grouped seat usage, its cache, and the daily capacity check."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.org = Organization.objects.create(name="Seat Org", max_seats=5)
+        self.other_org = Organization.objects.create(name="Roomy Org", max_seats=100)
+        self.admin = self._member("seat_admin", Membership.Role.ORG_ADMIN, role=User.Role.ORG_ADMIN)
+        for i in range(3):
+            self._member(f"seat_learner{i}", Membership.Role.ORG_LEARNER)
+        self._member("seat_inactive", Membership.Role.ORG_LEARNER, is_active=False)
+
+    def _member(self, username, membership_role, role=User.Role.LEARNER, org=None, is_active=True):
+        user = User.objects.create_user(
+            username=username, email=f"{username}@example.com",
+            password="testpass123", role=role,
+            email_verified=True, is_active=True,
+        )
+        Membership.objects.create(
+            user=user, organization=org or self.org,
+            role=membership_role, is_active=is_active,
+        )
+        return user
+
+    def test_all_orgs_counted_in_one_query(self):
+        from apps.accounts.seat_usage import all_seat_usage
+
+        with self.assertNumQueries(1):
+            usage = all_seat_usage()
+
+        seats = usage[self.org.id]
+        self.assertEqual((seats.members, seats.seat_members, seats.learners), (4, 3, 3))
+        self.assertEqual(usage[self.other_org.id].members, 0)
+
+    def test_cached_usage_is_dropped_when_membership_changes(self):
+        from apps.accounts.seat_usage import get_seat_usage
+
+        self.assertEqual(get_seat_usage(self.org).members, 4)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_seat_usage(self.org).members, 4)
+
+        self._member("seat_learner_new", Membership.Role.ORG_LEARNER)
+        self.assertEqual(get_seat_usage(self.org).members, 5)
+
+    def test_billing_usage_view_reports_cached_member_count(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.get("/api/v1/auth/manager/billing/usage/")
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["active_users"], 4)
+
+    @patch("apps.notifications.services.send_seat_capacity_warning")
+    def test_capacity_check_alerts_once_per_threshold_crossing(self, mock_warning):
+        from apps.payments.tasks import check_seat_capacity
+
+        # 4 of 5 seats: crosses the 80% warning
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(check_seat_capacity(), 1)
+        mock_warning.assert_called_once()
+        self.assertEqual(mock_warning.call_args.args[0], self.org)
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.seat_alert_threshold, 80)
+
+        # Same level the next day: no repeat
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(check_seat_capacity(), 0)
+
+        # Full: alerts again at 100%
+        self._member("seat_learner_full", Membership.Role.ORG_LEARNER)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(check_seat_capacity(), 1)
+        self.assertEqual(mock_warning.call_count, 2)
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.seat_alert_threshold, 100)
+
+        # Usage drops: the level resets without an alert
+        Membership.objects.filter(user__username="seat_learner_full").delete()
+        Membership.objects.filter(user__username="seat_learner0").delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(check_seat_capacity(), 0)
+        self.org.refresh_from_db()
+        self.assertEqual(self.org.seat_alert_threshold, 0)
+        self.assertEqual(mock_warning.call_count, 2)
@@ -103,3 +103,22 @@ def test_user_superadmin_crud_tasc_admin(api_client, tasc_admin_user):
     assert response.status_code == 200
     assert response["Content-Type"] == "text/csv"
     assert "attachment; filename" in response["Content-Disposition"]
+
+
+@pytest.mark.django_db
+def test_superadmin_exports_stream_csv(api_client, tasc_admin_user, regular_learner_user):
+    Organization.objects.create(name="Export Org", slug="export-org")
+    api_client.force_authenticate(user=tasc_admin_user)
+
+    response = api_client.get("/api/v1/superadmin/organizations/export-csv/")
+    assert response.status_code == 200
+    assert response.streaming
+    content = b"".join(response.streaming_content).decode()
+    assert content.splitlines()[0] == "ID,Name,Country,City,Contact Email,Active,Created At"
+    assert "Export Org" in content
+
+    response = api_client.get("/api/v1/superadmin/users/export-csv/", {"role": "learner"})
+    assert response.status_code == 200
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == "ID,Email,First Name,Last Name,Role,Active,Date Joined"
+    assert [line.split(",")[1] for line in lines[1:]] == ["learner@test.com"]
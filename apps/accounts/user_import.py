@@ -0,0 +1,278 @@
+"""
+CSV user import.
+
+`start_import` validates the upload, stores it on a UserImportJob and
+queues `apps.accounts.tasks.run_user_import`; the request returns 202 with
+the job, and clients poll it (`job_payload`) for progress.
+
+`run_import` streams the CSV in chunks of ``USER_IMPORT_CHUNK_SIZE`` rows.
+Each chunk checks existing emails and usernames with one query each,
+bulk-creates its users and records progress. Imported users get an
+unusable password and must_set_password, and are sent the set-password
+invitation, so no password is hashed during the import.
+"""
+import csv
+import io
+import logging
+import re
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.common.async_tasks import enqueue_task_on_commit
+
+from .models import UserImportJob
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+MAX_FILE_SIZE = 10 * 1024 * 1024
+# Errors kept on the job; the failed counter covers the rest
+MAX_STORED_ERRORS = 1000
+# Role names accepted in the CSV that map onto a User.Role
+ROLE_ALIASES = {"manager": User.Role.LMS_MANAGER}
+
+
+def start_import(request, allowed_roles):
+    """Validate the uploaded CSV and queue an import job. Returns the response for the view."""
+    if "file" not in request.FILES:
+        return Response({"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+    csv_file = request.FILES["file"]
+    if not csv_file.name.endswith(".csv"):
+        return Response({"error": "File must be a CSV file"}, status=status.HTTP_400_BAD_REQUEST)
+    if csv_file.size > MAX_FILE_SIZE:
+        return Response(
+            {"error": "File size exceeds 10 MB limit"}, status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        source = csv_file.read().decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        return Response(
+            {"error": f"Failed to parse CSV file: {str(e)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    from .tasks import run_user_import
+
+    job = UserImportJob.objects.create(
+        created_by=request.user, allowed_roles=list(allowed_roles), source=source
+    )
+    enqueue_task_on_commit(run_user_import, job.pk)
+    return Response(job_payload(job), status=status.HTTP_202_ACCEPTED)
+
+
+def job_payload(job):
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "message": {
+            UserImportJob.Status.PENDING: "Bulk import queued.",
+            UserImportJob.Status.RUNNING: "Bulk import in progress.",
+            UserImportJob.Status.COMPLETED: "Bulk import completed.",
+            UserImportJob.Status.FAILED: "Bulk import failed.",
+        }[job.status],
+        "total_rows": job.total_rows,
+        "processed_rows": job.processed_rows,
+        "imported": job.imported,
+        "failed": job.failed,
+        "errors": job.errors[:100],
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def job_response(request, job_id):
+    """Progress of an import job started by the requester (any job for TASC admins)."""
+    jobs = UserImportJob.objects.all()
+    if getattr(request.user, "role", None) != User.Role.TASC_ADMIN:
+        jobs = jobs.filter(created_by=request.user)
+    job = jobs.filter(pk=job_id).first()
+    if job is None:
+        return Response({"detail": "Import job not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(job_payload(job))
+
+
+def _parse_row(row):
+    email = (row.get("email") or row.get("email_address") or "").strip()
+    role = (row.get("role") or row.get("user_role") or "learner").strip().lower()
+    first_name = (row.get("first_name") or "").strip()
+    last_name = (row.get("last_name") or "").strip()
+    full_name = (row.get("full_name") or "").strip()
+    if not first_name and not last_name and full_name:
+        first_name, _, last_name = full_name.partition(" ")
+    return {
+        "email": email,
+        "role": ROLE_ALIASES.get(role, role),
+        "first_name": first_name,
+        "last_name": last_name,
+        "phone_number": (row.get("phone_number") or "").strip(),
+    }
+
+
+def _usernames(emails):
+    """The email as username, suffixed where that username is already taken."""
+    taken = set(User.objects.filter(username__in=emails).values_list("username", flat=True))
+    return {
+        email: (
+            f"{email.split('@')[0][:25]}{get_random_string(6, '0123456789')}"
+            if email in taken or len(email) > 150
+            else email
+        )
+        for email in emails
+    }
+
+
+def _import_chunk(job, rows, seen_emails, allowed_roles):
+    """Validate and create one chunk of ``(row_num, row)``. Returns (created users, errors)."""
+    errors = []
+    candidates = []
+    for row_num, row in rows:
+        entry = _parse_row(row)
+        email = entry["email"]
+        if not email:
+            errors.append({"row": row_num, "email": "", "error": "Email is required"})
+        elif not EMAIL_RE.match(email):
+            errors.append({"row": row_num, "email": email, "error": "Invalid email format"})
+        elif email.lower() in seen_emails:
+            errors.append({"row": row_num, "email": email, "error": "Duplicate email in file"})
+        elif entry["role"] not in allowed_roles:
+            errors.append({
+                "row": row_num,
+                "email": email,
+                "error": f"Invalid role: '{entry['role']}'. Must be one of: {', '.join(allowed_roles)}",
+            })
+        else:
+            seen_emails.add(email.lower())
+            candidates.append((row_num, entry))
+
+    existing = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[entry["email"].lower() for _, entry in candidates])
+        .values_list("email_lower", flat=True)
+    )
+    to_create = []
+    for row_num, entry in candidates:
+        if entry["email"].lower() in existing:
+            errors.append({"row": row_num, "email": entry["email"], "error": "User already exists"})
+        else:
+            to_create.append(entry)
+
+    usernames = _usernames([entry["email"] for entry in to_create])
+    users = [
+        User(
+            email=entry["email"],
+            username=usernames[entry["email"]],
+            first_name=entry["first_name"],
+            last_name=entry["last_name"],
+            role=entry["role"],
+            phone_number=entry["phone_number"] or None,
+            password=make_password(None),
+            must_set_password=True,
+            email_verified=True,
+            is_active=True,
+        )
+        for entry in to_create
+    ]
+    if users:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+                transaction.on_commit(lambda: _send_invitations(job, users))
+        except IntegrityError:
+            # An email or username was taken while the chunk was being checked
+            logger.warning("User import %s: chunk conflicted with existing users", job.pk, exc_info=True)
+            errors.extend(
+                {"row": 0, "email": user.email, "error": "User already exists"} for user in users
+            )
+            users = []
+    return users, errors
+
+
+def _send_invitations(job, users):
+    from apps.notifications.services import send_tasc_email
+
+    frontend_base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:5173")
+    for user in users:
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        token = default_token_generator.make_token(user)
+        try:
+            send_tasc_email(
+                subject="Welcome to TASC LMS - Set Your Password",
+                to=[user.email],
+                template="emails/auth/user_invitation.html",
+                context={
+                    "user": user,
+                    "inviter": job.created_by,
+                    "set_password_url": f"{frontend_base}/set-password/{uid}/{token}/",
+                    "organization_name": "TASC",
+                    "role_display": user.get_role_display(),
+                },
+                dedup_key=f"user-import:{job.pk}:{user.pk}",
+            )
+        except Exception:
+            logger.exception("User import %s: invitation to %s failed", job.pk, user.email)
+
+
+def run_import(job):
+    """Import every row of ``job.source``, recording progress after each chunk."""
+    UserImportJob.objects.filter(pk=job.pk).update(
+        status=UserImportJob.Status.RUNNING, started_at=timezone.now()
+    )
+    max_rows = settings.USER_IMPORT_MAX_ROWS
+    rows = enumerate(csv.DictReader(io.StringIO(job.source)), start=2)
+    seen_emails = set()
+    counts = {"processed_rows": 0, "imported": 0, "failed": 0}
+    errors = []
+
+    try:
+        while chunk := list(islice(rows, settings.USER_IMPORT_CHUNK_SIZE)):
+            over = max(0, counts["processed_rows"] + len(chunk) - max_rows)
+            if over:
+                chunk = chunk[: len(chunk) - over]
+            created, chunk_errors = _import_chunk(job, chunk, seen_emails, job.allowed_roles)
+            counts["processed_rows"] += len(chunk)
+            counts["imported"] += len(created)
+            counts["failed"] += len(chunk_errors)
+            errors.extend(chunk_errors[: MAX_STORED_ERRORS - len(errors)])
+            if over:
+                errors.append({"row": 0, "email": "", "error": f"Max {max_rows} records per file exceeded"})
+                counts["failed"] += 1
+            UserImportJob.objects.filter(pk=job.pk).update(
+                total_rows=counts["processed_rows"], errors=errors, **counts
+            )
+            if over:
+                break
+    except Exception as e:
+        logger.exception("User import %s failed", job.pk)
+        errors.append({"row": 0, "email": "", "error": f"Import failed: {str(e)}"})
+        final_status = UserImportJob.Status.FAILED
+    else:
+        final_status = UserImportJob.Status.COMPLETED
+
+    UserImportJob.objects.filter(pk=job.pk).update(
+        status=final_status,
+        finished_at=timezone.now(),
+        total_rows=counts["processed_rows"],
+        errors=errors,
+        source="",
+        **counts,
+    )
+    logger.info(
+        "User import %s: %s rows, %s imported, %s failed",
+        job.pk, counts["processed_rows"], counts["imported"], counts["failed"],
+    )
+    return counts
@@ -35,6 +35,7 @@ from django.db import models, IntegrityError, transaction
 from .tokens import email_verification_token
 from .rbac import is_admin_like, get_active_membership_organization
 from .models import Membership, BusinessTestimonial
+from .seat_usage import get_seat_usage
 
 from apps.notifications.services import send_tasc_email
 
@@ -606,184 +607,28 @@ class UserAdminViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"])
     def bulk_import(self, request):
         """
-        Accepts a CSV file of users and imports them.
+        Accepts a CSV file of users and queues its import.
         CSV format: email,first_name,last_name,role,department,phone_number
+        Returns 202 with the job; poll bulk_import/{job_id}/ for progress.
         """
-        import csv
-        import random
-        import string
-        from django.db import transaction
-        from django.contrib.auth.hashers import make_password
+        from apps.accounts.user_import import start_import
 
         self.check_admin_permission(request)
 
-        if "file" not in request.FILES:
-            return Response(
-                {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        csv_file = request.FILES["file"]
-
-        if not csv_file.name.endswith(".csv"):
-            return Response(
-                {"error": "File must be a CSV file"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if csv_file.size > 10 * 1024 * 1024:
-            return Response(
-                {"error": "File size exceeds 10 MB limit"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        try:
-            decoded_file = csv_file.read().decode("utf-8")
-            reader = csv.DictReader(decoded_file.splitlines())
-        except Exception as e:
-            return Response(
-                {"error": f"Failed to parse CSV file: {str(e)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         # Managers can import learners and instructors. Superadmins can also import managers.
         if getattr(request.user, "role", "") == "lms_manager":
             valid_roles = ["learner", "instructor"]
         else:
-            valid_roles = ["learner", "instructor", "manager", "lms_manager"]
-
-        total_rows = 0
-        imported = 0
-        errors = []
-        users_to_create = []
-
-        for row_num, row in enumerate(reader, start=2):
-            total_rows += 1
-
-            # Map frontend export columns to backend expected columns
-            email = (row.get("email") or row.get("email_address") or "").strip()
-            role = (
-                (row.get("role") or row.get("user_role") or "learner").strip().lower()
-            )
-            department = row.get("department", "").strip()
-            phone_number = row.get("phone_number", "").strip()
-
-            # Handle full_name splitting if first_name/last_name are missing
-            first_name = row.get("first_name", "").strip()
-            last_name = row.get("last_name", "").strip()
-            full_name = row.get("full_name", "").strip()
-
-            if not first_name and not last_name and full_name:
-                parts = full_name.split(" ", 1)
-                first_name = parts[0]
-                if len(parts) > 1:
-                    last_name = parts[1]
-
-            if not email:
-                errors.append(
-                    {"row": row_num, "email": "", "error": "Email is required"}
-                )
-                continue
-
-            import re
-
-            if not re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email):
-                errors.append(
-                    {"row": row_num, "email": email, "error": "Invalid email format"}
-                )
-                continue
-
-            if User.objects.filter(email=email).exists():
-                errors.append(
-                    {"row": row_num, "email": email, "error": "User already exists"}
-                )
-                continue
-
-            if role not in valid_roles:
-                errors.append(
-                    {
-                        "row": row_num,
-                        "email": email,
-                        "error": f"Invalid role: '{role}'. Must be one of: {', '.join(valid_roles)}",
-                    }
-                )
-                continue
-
-            if total_rows > 5000:
-                errors.append(
-                    {
-                        "row": row_num,
-                        "email": email,
-                        "error": "Max 5000 records per file exceeded",
-                    }
-                )
-                break
+            valid_roles = ["learner", "instructor", "lms_manager"]
+        return start_import(request, valid_roles)
 
-            random_password = "".join(
-                random.choices(string.ascii_letters + string.digits, k=12)
-            )
+    @action(detail=False, methods=["get"], url_path=r"bulk_import/(?P<job_id>\d+)")
+    def bulk_import_status(self, request, job_id=None):
+        """Progress and results of a bulk import job."""
+        from apps.accounts.user_import import job_response
 
-            user = User(
-                email=email,
-                username=email.split("@")[0]
-                + "".join(random.choices(string.digits, k=4)),
-                first_name=first_name,
-                last_name=last_name,
-                role=role,
-                phone_number=phone_number,
-                password=make_password(random_password),
-                is_active=True,
-            )
-            users_to_create.append(user)
-
-        if users_to_create:
-            try:
-                with transaction.atomic():
-                    User.objects.bulk_create(users_to_create)
-                    imported = len(users_to_create)
-
-                    # Send invitation emails to imported users
-                    from django.core.mail import send_mail
-                    from django.conf import settings
-
-                    for user in users_to_create:
-                        try:
-                            # Generate password reset token for user to set their password
-                            from django.contrib.auth.tokens import default_token_generator
-                            from django.utils.http import urlsafe_base64_encode
-                            from django.utils.encoding import force_bytes
-
-                            uid = urlsafe_base64_encode(force_bytes(user.pk))
-                            token = default_token_generator.make_token(user)
-                            set_password_url = f"{settings.FRONTEND_BASE_URL}/set-password/{uid}/{token}/"
-
-                            send_mail(
-                                subject=f"Welcome to TASC LMS - Set Your Password",
-                                message=f"""
-Hello {user.first_name or user.username},
-
-You have been added to the TASC Learning Management System by your organization.
-
-To get started, please set your password using the link below:
-{set_password_url}
-
-If you have any questions, please contact your organization administrator.
-
-Best regards,
-TASC Team
-                            """.strip(),
-                                from_email=settings.DEFAULT_FROM_EMAIL,
-                                recipient_list=[user.email],
-                                fail_silently=False,
-                            )
-                        except Exception as email_err:
-                            # Log but don't fail the entire import for one email error
-                            import logging
-                            logging.warning(f"Failed to send invitation email to {user.email}: {email_err}")
-
-            except Exception as e:
-                errors.append(
-                    {"row": 0, "email": "", "error": f"Database error: {str(e)}"}
-                )
-                imported = 0
+        self.check_admin_permission(request)
+        return job_response(request, job_id)
 
     @action(detail=False, methods=["get"])
     def csv_template(self, request):
@@ -862,18 +707,13 @@ class OrganizationSeatUsageView(APIView):
         
         org = membership.organization
         max_seats = org.max_seats
+        usage = get_seat_usage(org)
         
-        # Count active members (excluding other org admins/managers for seat count)
-        active_members = Membership.objects.filter(
-            organization=org,
-            is_active=True
-        ).exclude(role__in=[Membership.Role.ORG_ADMIN, Membership.Role.ORG_MANAGER])
-        
-        # If user is LMS Manager, only count learners
+        # Active members, excluding org admins/managers; LMS Managers only count learners
         if user.role == User.Role.LMS_MANAGER:
-            active_members = active_members.filter(role=Membership.Role.ORG_LEARNER)
-        
-        used_seats = active_members.count()
+            used_seats = usage.learners
+        else:
+            used_seats = usage.seat_members
         remaining = max(0, max_seats - used_seats) if max_seats else None
         percent_used = (used_seats / max_seats * 100) if max_seats and max_seats > 0 else 0
         
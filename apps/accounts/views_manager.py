@@ -22,6 +22,7 @@ from django.utils import timezone
 from datetime import timedelta
 from .models import Membership
 from .rbac import get_active_membership_organization
+from .seat_usage import get_seat_usage
 from .serializers import ManagerOrganizationSerializer, UserListSerializer
 from apps.notifications.services import send_tasc_email
 from apps.payments.models import UserSubscription
@@ -158,9 +159,7 @@ class ManagerBillingUsageView(APIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        active_users = Membership.objects.filter(
-            organization=org, is_active=True
-        ).count()
+        active_users = get_seat_usage(org).members
 
         active_courses = Enrollment.objects.filter(
             organization=org, status=Enrollment.Status.ACTIVE
@@ -9,7 +9,6 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from apps.notifications.services import send_tasc_email
 
 User = get_user_model()
 from .models import Organization, DemoRequest, UserSession
@@ -71,8 +70,7 @@ class OrganizationSuperadminViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path="export-csv")
     def export_csv(self, request):
         """GET /api/v1/superadmin/organizations/export-csv/ — respects is_active, search filters"""
-        import csv as csv_module
-        from django.http import HttpResponse
+        from apps.common.csv_export import iter_rows, stream_csv
 
         qs = self.get_queryset()
 
@@ -84,25 +82,14 @@ class OrganizationSuperadminViewSet(viewsets.ModelViewSet):
         if search:
             from django.db.models import Q as DQ
             qs = qs.filter(DQ(name__icontains=search) | DQ(contact_email__icontains=search))
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="organizations.csv"'
-        writer = csv_module.writer(response)
-        writer.writerow(
-            ["ID", "Name", "Country", "City", "Contact Email", "Active", "Created At"]
+        return stream_csv(
+            "organizations.csv",
+            ["ID", "Name", "Country", "City", "Contact Email", "Active", "Created At"],
+            iter_rows(
+                qs,
+                ["id", "name", "country", "city", "contact_email", "is_active", "created_at"],
+            ),
         )
-        for org in qs:
-            writer.writerow(
-                [
-                    org.id,
-                    org.name,
-                    org.country,
-                    org.city,
-                    org.contact_email,
-                    org.is_active,
-                    org.created_at,
-                ]
-            )
-        return response
 
 
 class UserSuperadminViewSet(viewsets.ModelViewSet):
@@ -174,175 +161,20 @@ class UserSuperadminViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["post"])
     def bulk_import(self, request):
         """
-        Accepts a CSV file of users and imports them.
+        Accepts a CSV file of users and queues its import.
         CSV format: email,first_name,last_name,role,department,phone_number
+        Returns 202 with the job; poll bulk_import/{job_id}/ for progress.
         """
-        import csv
-        import random
-        import string
-        from django.db import transaction
-        from django.contrib.auth.hashers import make_password
+        from apps.accounts.user_import import start_import
 
-        if "file" not in request.FILES:
-            return Response(
-                {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
-            )
-
-        csv_file = request.FILES["file"]
+        return start_import(request, ["learner", "instructor", "lms_manager"])
 
-        if not csv_file.name.endswith(".csv"):
-            return Response(
-                {"error": "File must be a CSV file"}, status=status.HTTP_400_BAD_REQUEST
-            )
+    @action(detail=False, methods=["get"], url_path=r"bulk_import/(?P<job_id>\d+)")
+    def bulk_import_status(self, request, job_id=None):
+        """Progress and results of a bulk import job."""
+        from apps.accounts.user_import import job_response
 
-        if csv_file.size > 10 * 1024 * 1024:
-            return Response(
-                {"error": "File size exceeds 10 MB limit"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        try:
-            decoded_file = csv_file.read().decode("utf-8")
-            reader = csv.DictReader(decoded_file.splitlines())
-        except Exception as e:
-            return Response(
-                {"error": f"Failed to parse CSV file: {str(e)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        valid_roles = ["learner", "instructor", "manager"]
-
-        total_rows = 0
-        imported = 0
-        errors = []
-
-        users_to_create = []
-
-        for row_num, row in enumerate(reader, start=2):
-            total_rows += 1
-
-            # Map frontend export columns to backend expected columns
-            email = (row.get("email") or row.get("email_address") or "").strip()
-            role = (
-                (row.get("role") or row.get("user_role") or "learner").strip().lower()
-            )
-            department = row.get("department", "").strip()
-            phone_number = row.get("phone_number", "").strip()
-
-            # Handle full_name splitting if first_name/last_name are missing
-            first_name = row.get("first_name", "").strip()
-            last_name = row.get("last_name", "").strip()
-            full_name = row.get("full_name", "").strip()
-
-            if not first_name and not last_name and full_name:
-                parts = full_name.split(" ", 1)
-                first_name = parts[0]
-                if len(parts) > 1:
-                    last_name = parts[1]
-
-            if not email:
-                errors.append(
-                    {"row": row_num, "email": "", "error": "Email is required"}
-                )
-                continue
-
-            import re
-
-            if not re.match(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$", email):
-                errors.append(
-                    {"row": row_num, "email": email, "error": "Invalid email format"}
-                )
-                continue
-
-            if User.objects.filter(email=email).exists():
-                errors.append(
-                    {"row": row_num, "email": email, "error": "User already exists"}
-                )
-                continue
-
-            if role not in valid_roles:
-                errors.append(
-                    {
-                        "row": row_num,
-                        "email": email,
-                        "error": f"Invalid role: '{role}'. Must be one of: {', '.join(valid_roles)}",
-                    }
-                )
-                continue
-
-            if total_rows > 5000:
-                errors.append(
-                    {
-                        "row": row_num,
-                        "email": email,
-                        "error": "Max 5000 records per file exceeded",
-                    }
-                )
-                break
-
-            random_password = "".join(
-                random.choices(string.ascii_letters + string.digits, k=12)
-            )
-
-            user = User(
-                email=email,
-                first_name=first_name,
-                last_name=last_name,
-                role=role,
-                department=department,
-                phone_number=phone_number,
-                password=make_password(random_password),
-                is_active=True,
-            )
-            users_to_create.append(user)
-
-        if users_to_create:
-            try:
-                with transaction.atomic():
-                    User.objects.bulk_create(users_to_create)
-                    imported = len(users_to_create)
-                
-                    # Send invitation emails to imported users
-                    for user in users_to_create:
-                        try:
-                            from django.contrib.auth.tokens import default_token_generator
-                            from django.utils.http import urlsafe_base64_encode
-                            from django.utils.encoding import force_bytes
-                            from django.conf import settings
-                        
-                            uid = urlsafe_base64_encode(force_bytes(user.pk))
-                            token = default_token_generator.make_token(user)
-                            frontend_base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:5173")
-                            set_password_url = f"{frontend_base}/set-password/{uid}/{token}/"
-                        
-                            send_tasc_email(
-                                subject="Welcome to TASC LMS - Set Your Password",
-                                to=[user.email],
-                                template="emails/auth/user_invitation.html",
-                                context={
-                                    "user": user,
-                                    "inviter": request.user,
-                                    "set_password_url": set_password_url,
-                                    "organization_name": "TASC",
-                                    "role_display": user.get_role_display(),
-                                },
-                            )
-                        except Exception as email_err:
-                            import logging
-                            logging.warning(f"Failed to send invitation email to {user.email}: {email_err}")
-            except Exception as e:
-                errors.append({"row": 0, "email": "", "error": f"Database error: {str(e)}"})
-                imported = 0
-
-        return Response(
-            {
-                "message": "Bulk import completed.",
-                "total_rows": total_rows,
-                "imported": imported,
-                "failed": len(errors),
-                "errors": errors[:100],
-            }
-        )
+        return job_response(request, job_id)
 
     @action(detail=False, methods=["get"])
     def csv_template(self, request):
@@ -377,8 +209,7 @@ class UserSuperadminViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"], url_path="export-csv")
     def export_csv(self, request):
         """GET /api/v1/superadmin/users/export-csv/ — respects role, is_active, search filters"""
-        import csv as csv_module
-        from django.http import HttpResponse
+        from apps.common.csv_export import iter_rows, stream_csv
 
         qs = self.get_queryset()
 
@@ -396,25 +227,14 @@ class UserSuperadminViewSet(viewsets.ModelViewSet):
                 DQ(email__icontains=search) | DQ(first_name__icontains=search) |
                 DQ(last_name__icontains=search)
             )
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="users.csv"'
-        writer = csv_module.writer(response)
-        writer.writerow(
-            ["ID", "Email", "First Name", "Last Name", "Role", "Active", "Date Joined"]
+        return stream_csv(
+            "users.csv",
+            ["ID", "Email", "First Name", "Last Name", "Role", "Active", "Date Joined"],
+            iter_rows(
+                qs,
+                ["id", "email", "first_name", "last_name", "role", "is_active", "date_joined"],
+            ),
         )
-        for user in qs:
-            writer.writerow(
-                [
-                    user.id,
-                    user.email,
-                    user.first_name,
-                    user.last_name,
-                    user.role,
-                    user.is_active,
-                    user.date_joined,
-                ]
-            )
-        return response
 
 
 class SecurityStatsView(APIView):
@@ -720,7 +540,7 @@ class SystemSettingsView(APIView):
 
     def _get_config(self):
         from django.conf import settings as django_settings
-        from django.core.cache import cache
+        from apps.common.cache import tiered_cache
 
         return {
             "platform_name": getattr(django_settings, "PLATFORM_NAME", "TASC LMS"),
@@ -728,8 +548,8 @@ class SystemSettingsView(APIView):
             "support_email": getattr(django_settings, "SUPPORT_EMAIL", ""),
             "default_timezone": getattr(django_settings, "TIME_ZONE", "UTC"),
             "max_upload_mb": getattr(django_settings, "MAX_UPLOAD_MB", 500),
-            "maintenance_mode": cache.get("system:maintenance_mode", False),
-            "maintenance_message": cache.get(
+            "maintenance_mode": tiered_cache.get("system:maintenance_mode", False),
+            "maintenance_message": tiered_cache.get(
                 "system:maintenance_message",
                 "We are performing scheduled maintenance. Please check back shortly.",
             ),
@@ -739,7 +559,7 @@ class SystemSettingsView(APIView):
         return Response(self._get_config())
 
     def patch(self, request):
-        from django.core.cache import cache
+        from apps.common.cache import tiered_cache
 
         allowed = {
             "platform_name", "platform_url", "support_email",
@@ -747,11 +567,11 @@ class SystemSettingsView(APIView):
         }
         updates = {k: v for k, v in request.data.items() if k in allowed}
 
-        # Persist maintenance_mode and message to cache (no expiry — survives restarts via DB cache)
+        # Persist maintenance_mode and message to the shared cache (no expiry)
         if "maintenance_mode" in request.data:
-            cache.set("system:maintenance_mode", bool(request.data["maintenance_mode"]), timeout=None)
+            tiered_cache.set("system:maintenance_mode", bool(request.data["maintenance_mode"]))
         if "maintenance_message" in request.data:
-            cache.set("system:maintenance_message", str(request.data["maintenance_message"]), timeout=None)
+            tiered_cache.set("system:maintenance_message", str(request.data["maintenance_message"]))
 
         return Response({**self._get_config(), **updates})
 
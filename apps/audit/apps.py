@@ -5,3 +5,6 @@ class AuditConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.audit"
     verbose_name = "Audit Logs"
+
+    def ready(self):
+        import apps.audit.signals  # noqa
@@ -1,4 +1,36 @@
 """Audit logging service."""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+ACTOR_ORG_CACHE_PREFIX = "audit:actor_org"
+# Cached for actors without a membership, since None reads as a cache miss
+_NO_ORGANIZATION = 0
+
+
+def _actor_org_key(user_id):
+    return f"{ACTOR_ORG_CACHE_PREFIX}:{user_id}"
+
+
+def actor_organization_id(user_id):
+    """Organization id of the user's first membership (cached), or None."""
+    key = _actor_org_key(user_id)
+    org_id = cache.get(key)
+    if org_id is None:
+        from apps.accounts.models import Membership
+
+        org_id = (
+            Membership.objects.filter(user_id=user_id)
+            .order_by("pk")
+            .values_list("organization_id", flat=True)
+            .first()
+        ) or _NO_ORGANIZATION
+        cache.set(key, org_id, settings.AUDIT_ACTOR_ORG_CACHE_TTL)
+    return org_id or None
+
+
+def forget_actor_organization(user_id):
+    cache.delete(_actor_org_key(user_id))
 
 
 def log_event(
@@ -22,19 +54,22 @@ def log_event(
     - resource_id: optional resource identifier
     - metadata: optional JSON dict
     - organization: optional Organization (inferred from actor if not provided)
+
+    With AUDIT_LOG_ASYNC the entry is written by the background writer in
+    apps.audit.writer once the current transaction commits; otherwise it is
+    inserted right away.
     """
-    from .models import AuditLog
+    from django.utils import timezone
 
     actor_name = ""
     actor_email = ""
+    organization_id = getattr(organization, "pk", None)
     if actor:
         fn = getattr(actor, "get_full_name", None)
         actor_name = (fn() if callable(fn) else "") or getattr(actor, "email", "") or ""
         actor_email = getattr(actor, "email", "") or ""
         if organization is None and hasattr(actor, "memberships"):
-            m = actor.memberships.first()
-            if m:
-                organization = m.organization
+            organization_id = actor_organization_id(actor.pk)
 
     ip_address = None
     if request:
@@ -44,8 +79,8 @@ def log_event(
         else:
             ip_address = request.META.get("REMOTE_ADDR")
 
-    AuditLog.objects.create(
-        actor=actor,
+    record = dict(
+        actor_id=getattr(actor, "pk", None),
         actor_name=actor_name,
         actor_email=actor_email,
         action=action,
@@ -53,6 +88,17 @@ def log_event(
         resource_id=resource_id,
         details=details,
         ip_address=ip_address,
-        organization=organization,
+        organization_id=organization_id,
         metadata=metadata,
+        created_at=timezone.now(),
     )
+
+    if not settings.AUDIT_LOG_ASYNC:
+        from .writer import write_records
+
+        write_records([record])
+        return
+
+    from .writer import audit_writer
+
+    transaction.on_commit(lambda: audit_writer.submit(record))
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.accounts.models import Membership
+from apps.audit.services import forget_actor_organization
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def forget_member_audit_organization(sender, instance, **kwargs):
+    """Audit entries attribute actors to their first membership; recompute it."""
+    forget_actor_organization(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def forget_new_user_audit_organization(sender, instance, created, **kwargs):
+    """A new user never inherits an entry cached under a reused id."""
+    if created:
+        forget_actor_organization(instance.pk)
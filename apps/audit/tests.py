@@ -3,13 +3,16 @@
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from apps.accounts.models import Membership, Organization
 from apps.audit.models import AuditLog
+from apps.audit.services import log_event
+from apps.audit.writer import AuditWriter
 
 User = get_user_model()
 
@@ -204,3 +207,90 @@ class LoginAuditLogTests(TestCase):
 
         log = AuditLog.objects.get(actor=self.user, action=AuditLog.Action.LOGIN)
         self.assertEqual(log.ip_address, "192.168.1.100")
+
+
+class AuditWriterTests(TestCase):
+    """Buffered audit writes and the cached actor organization."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="auditwriter",
+            email="auditwriter@example.com",
+            password="pass",
+            email_verified=True,
+            is_active=True,
+        )
+        self.org = Organization.objects.create(name="Writer Org", slug="writer-org")
+        Membership.objects.create(user=self.user, organization=self.org, role=Membership.Role.ORG_ADMIN)
+
+    @patch("apps.audit.writer.threading.Thread")
+    def test_queued_records_are_written_in_one_insert(self, _thread):
+        writer = AuditWriter()
+        with override_settings(AUDIT_LOG_ASYNC=True), patch("apps.audit.writer.audit_writer", writer):
+            with self.captureOnCommitCallbacks(execute=True):
+                for i in range(3):
+                    log_event(actor=self.user, action="updated", resource="user", details=f"edit {i}")
+            self.assertFalse(AuditLog.objects.exists())
+
+        with self.assertNumQueries(1):
+            writer.flush()
+
+        logs = AuditLog.objects.order_by("created_at")
+        self.assertEqual([log.details for log in logs], ["edit 0", "edit 1", "edit 2"])
+        self.assertTrue(all(log.organization_id == self.org.pk for log in logs))
+
+    @override_settings(AUDIT_LOG_QUEUE_SIZE=1)
+    @patch("apps.audit.writer.threading.Thread")
+    def test_full_queue_writes_synchronously(self, _thread):
+        writer = AuditWriter()
+        record = dict(action="created", resource="user", details="", created_at=self.user.date_joined)
+        writer.submit(record)
+        writer.submit(dict(record, details="overflow"))
+
+        self.assertEqual(list(AuditLog.objects.values_list("details", flat=True)), ["overflow"])
+        writer.flush()
+        self.assertEqual(AuditLog.objects.count(), 2)
+
+    @patch("apps.audit.writer.threading.Thread")
+    def test_flush_writes_the_batch_being_collected(self, _thread):
+        writer = AuditWriter()
+        record = dict(action="created", resource="user", details="", created_at=self.user.date_joined)
+        for i in range(3):
+            writer.submit(dict(record, details=f"edit {i}"))
+        with override_settings(AUDIT_LOG_BATCH_SIZE=2):
+            writer._collect()
+
+        writer.flush()
+        self.assertEqual(
+            sorted(AuditLog.objects.values_list("details", flat=True)), ["edit 0", "edit 1", "edit 2"]
+        )
+
+    @patch("apps.audit.writer.threading.Thread")
+    def test_failed_batch_is_retried_row_by_row(self, _thread):
+        from apps.audit import writer as writer_module
+
+        real_write = writer_module.write_records
+
+        def fail_batches(records):
+            if len(records) > 1:
+                raise RuntimeError("batch insert failed")
+            real_write(records)
+
+        writer = AuditWriter()
+        record = dict(action="created", resource="user", details="", created_at=self.user.date_joined)
+        for i in range(3):
+            writer.submit(dict(record, details=f"edit {i}"))
+        with patch("apps.audit.writer.write_records", side_effect=fail_batches):
+            writer.flush()
+
+        self.assertEqual(AuditLog.objects.count(), 3)
+
+    def test_actor_organization_is_cached_until_membership_changes(self):
+        log_event(actor=self.user, action="login", resource="user")
+        with self.assertNumQueries(1):
+            log_event(actor=self.user, action="logout", resource="user")
+
+        Membership.objects.filter(user=self.user).delete()
+        log_event(actor=self.user, action="login", resource="user")
+        self.assertIsNone(AuditLog.objects.latest("id").organization_id)
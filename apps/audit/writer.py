@@ -0,0 +1,119 @@
+"""
+Buffered AuditLog writer.
+
+`log_event` hands committed audit records to `audit_writer`, which keeps
+them in an in-process queue and inserts them from a daemon thread with
+``bulk_create``: a batch is written once it holds ``AUDIT_LOG_BATCH_SIZE``
+records or ``AUDIT_LOG_FLUSH_INTERVAL`` seconds after its first record.
+If the queue is full (``AUDIT_LOG_QUEUE_SIZE``) the caller writes its own
+record rather than dropping it. Records taken off the queue stay pending
+until they are written, so the exit flush also covers the batch the thread
+is still collecting. A batch whose insert fails is retried one row at a
+time, and only rows that fail again are logged and given up on.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def write_records(records):
+    """Insert audit records (dicts of AuditLog field values) in one bulk_create."""
+    from .models import AuditLog
+
+    AuditLog.objects.bulk_create(
+        [AuditLog(**record) for record in records],
+        batch_size=settings.AUDIT_LOG_BATCH_SIZE,
+    )
+
+
+class AuditWriter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Held while pending records are moved or written
+        self._write_lock = threading.Lock()
+        self._queue = None
+        self._pending = []
+        self._pid = None
+
+    def _ensure_started(self):
+        # Threads don't survive fork, so a forked worker starts its own
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=settings.AUDIT_LOG_QUEUE_SIZE)
+            self._pending = []
+            threading.Thread(target=self._run, name="audit-writer", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, record):
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            write_records([record])
+
+    def _take(self, record):
+        with self._write_lock:
+            self._pending.append(record)
+
+    def _collect(self):
+        """Move the next batch off the queue into the pending records."""
+        self._take(self._queue.get())
+        deadline = time.monotonic() + settings.AUDIT_LOG_FLUSH_INTERVAL
+        for _ in range(settings.AUDIT_LOG_BATCH_SIZE - 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                self._take(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+    def _write_pending(self):
+        """Write the pending records; the caller holds ``_write_lock``."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        close_old_connections()
+        try:
+            write_records(batch)
+            return
+        except Exception:
+            logger.exception("Failed to write %d audit log records, retrying one by one", len(batch))
+        for record in batch:
+            try:
+                write_records([record])
+            except Exception:
+                logger.exception("Dropped audit log record %r", record)
+
+    def _run(self):
+        while True:
+            self._collect()
+            with self._write_lock:
+                self._write_pending()
+
+    def flush(self):
+        """Write everything queued or pending so far from the calling thread."""
+        if self._pid != os.getpid():
+            return
+        with self._write_lock:
+            while True:
+                try:
+                    self._pending.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_pending()
+
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.flush)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class CatalogueConfig(AppConfig):
     name = "apps.catalogue"
+
+    def ready(self):
+        import apps.catalogue.signals  # noqa
@@ -0,0 +1,40 @@
+# Generated by Django 5.1.5 on 2026-10-16 18:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_sessions_count(apps, schema_editor):
+    Course = apps.get_model("catalogue", "Course")
+    Session = apps.get_model("catalogue", "Session")
+    counts = (
+        Session.objects.filter(course=OuterRef("pk"))
+        .order_by()
+        .values("course")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Course.objects.update(
+        sessions_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalogue", "0025_ensure_quizquestion_explanation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="sessions_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Number of Session rows; maintained by signals for progress rollups",
+            ),
+        ),
+        migrations.RunPython(backfill_sessions_count, migrations.RunPython.noop),
+    ]
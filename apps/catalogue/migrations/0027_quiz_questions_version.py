@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 19:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalogue", "0026_course_sessions_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="quiz",
+            name="questions_version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
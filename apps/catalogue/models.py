@@ -74,6 +74,11 @@ class Course(models.Model):
     )
     duration_weeks = models.PositiveIntegerField(default=0, help_text="Recommended weeks to complete")
     total_sessions = models.PositiveIntegerField(default=0)
+    sessions_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of Session rows; maintained by signals for progress rollups",
+    )
 
     # Instructor and Creator
     instructor = models.ForeignKey(
@@ -436,6 +441,9 @@ class Quiz(models.Model):
         related_name='quiz',
     )
     settings = models.JSONField(default=dict, blank=True)
+    # Bumped on every question change; keys the cached grading table
+    # (apps.learning.quiz_grading).
+    questions_version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
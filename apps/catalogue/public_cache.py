@@ -0,0 +1,145 @@
+"""
+Response cache for the public (anonymous) catalogue endpoints.
+
+Each cached response is keyed by view, host, path and normalized query
+params, plus the current version of every model it depends on. Writes to
+those models bump the version (see `apps.catalogue.signals`), so stale
+entries are simply never read again and age out on their TTL.
+
+Cached responses carry ETag / Last-Modified so browsers and CDNs can
+revalidate with a 304 instead of downloading the body again.
+"""
+import functools
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+CACHE_PREFIX = 'public_catalogue'
+
+
+def _version_key(name):
+    return f'{CACHE_PREFIX}:version:{name}'
+
+
+def get_versions(names):
+    """Return ``{name: version}`` for the given dependency names."""
+    keys = {name: _version_key(name) for name in names}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for name, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            # Seed from the clock rather than 1 so an evicted counter can
+            # never come back at a value older entries were keyed with.
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        versions[name] = version
+    return versions
+
+
+def _bump(name):
+    key = _version_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_version(name):
+    """
+    Invalidate every cached response that depends on ``name``.
+
+    Bumps right away and again once the transaction commits, so a request
+    that re-fills the cache from the pre-commit snapshot doesn't outlive it.
+    """
+    _bump(name)
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: _bump(name))
+
+
+def _normalized_query(request):
+    return sorted(
+        (key, sorted(v for v in values if v != ''))
+        for key, values in request.query_params.lists()
+        if any(v != '' for v in values)
+    )
+
+
+def _cache_key(view, request, versions):
+    raw = json.dumps(
+        [request.get_host(), request.path, _normalized_query(request), sorted(versions.items())],
+        separators=(',', ':'),
+    )
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f'{CACHE_PREFIX}:response:{view.__class__.__name__}:{digest}'
+
+
+def _not_modified(request, entry):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        etags = parse_etags(if_none_match)
+        return '*' in etags or entry['etag'] in etags
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and entry['last_modified'] <= if_modified_since
+
+
+def _finalize(response, entry, anonymous_only):
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    patch_cache_control(response, public=True, max_age=settings.PUBLIC_CATALOGUE_MAX_AGE)
+    if anonymous_only:
+        patch_vary_headers(response, ('Authorization',))
+    return response
+
+
+def cache_public_response(depends_on, anonymous_only=False):
+    """
+    Cache a public viewset action's response data.
+
+    Args:
+        depends_on: Version names (e.g. ``('course', 'category')``) whose
+                    bump should invalidate the cached response.
+        anonymous_only: Serve authenticated requests uncached, for views
+                        whose output is personalised for the caller.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(view, request, *args, **kwargs):
+            if anonymous_only and request.user.is_authenticated:
+                return func(view, request, *args, **kwargs)
+
+            versions = get_versions(depends_on)
+            key = _cache_key(view, request, versions)
+            entry = cache.get(key)
+            response = None
+
+            if entry is None:
+                response = func(view, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+                entry = {
+                    'data': response.data,
+                    'etag': quote_etag(hashlib.md5(body.encode()).hexdigest()),
+                    'last_modified': int(timezone.now().timestamp()),
+                }
+                cache.set(key, entry, settings.PUBLIC_CATALOGUE_CACHE_TTL)
+
+            if _not_modified(request, entry):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            elif response is None:
+                response = Response(entry['data'])
+            return _finalize(response, entry, anonymous_only)
+        return wrapper
+    return decorator
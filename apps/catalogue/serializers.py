@@ -3,6 +3,7 @@ from django.utils.text import slugify
 from drf_spectacular.utils import extend_schema_field
 
 from .models import Assignment, BankQuestion, Category, Course, CourseApprovalRequest, Module, Quiz, QuizQuestion, QuestionCategory, Session, Tag, CourseReview, SessionAttachment
+from .utils.video_embed import validate_external_video_url
 
 
 def _get_user_enrollment(user, course):
@@ -14,7 +15,24 @@ def _get_user_enrollment(user, course):
         return Enrollment.objects.get(user=user, course=course)
     except Enrollment.DoesNotExist:
         return None
-from .utils.video_embed import validate_external_video_url
+
+
+def _get_user_enrollments(user, course_ids):
+    """
+    Return {course_id: enrollment or None} for every id in course_ids.
+
+    One query for the whole batch; anonymous users get all None without
+    touching the database.
+    """
+    enrollments = dict.fromkeys(course_ids)
+    if not enrollments or not user or not user.is_authenticated:
+        return enrollments
+    from apps.learning.models import Enrollment
+    for enrollment in Enrollment.objects.filter(
+        user=user, course_id__in=list(enrollments)
+    ).only('id', 'course_id', 'status', 'progress_percentage', 'enrolled_at'):
+        enrollments[enrollment.course_id] = enrollment
+    return enrollments
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -629,6 +647,23 @@ class BankQuestionListSerializer(serializers.ModelSerializer):
         return {'id': obj.category.id, 'name': obj.category.name}
 
 
+class CourseEnrollmentListSerializer(serializers.ListSerializer):
+    """
+    List serializer for courses that resolves the requesting user's
+    enrollments for the whole page in one query and shares them with the
+    child serializer via context['user_enrollments'].
+    """
+
+    def to_representation(self, data):
+        courses = list(data.all() if hasattr(data, 'all') else data)
+        request = self.context.get('request')
+        if request is not None:
+            self.context.setdefault('user_enrollments', {}).update(
+                _get_user_enrollments(request.user, [course.pk for course in courses])
+            )
+        return super().to_representation(courses)
+
+
 class CourseListSerializer(serializers.ModelSerializer):
     """Serializer for Course list view (minimal data)."""
     category = CategorySerializer(read_only=True)
@@ -656,6 +691,7 @@ class CourseListSerializer(serializers.ModelSerializer):
             'is_free', 'enrollment_status', 'enrollment_id', 'progress_percentage', 'enrolled_at',
         ]
         read_only_fields = ['id', 'enrollment_count']
+        list_serializer_class = CourseEnrollmentListSerializer
     
     @extend_schema_field(serializers.CharField(allow_null=True))
     def get_instructor_name(self, obj):
@@ -673,7 +709,12 @@ class CourseListSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request:
             return None
-        return _get_user_enrollment(request.user, obj)
+        # Prefetched by CourseEnrollmentListSerializer for list pages;
+        # single-object renders fall back to one lookup per course.
+        enrollments = self.context.setdefault('user_enrollments', {})
+        if obj.pk not in enrollments:
+            enrollments[obj.pk] = _get_user_enrollment(request.user, obj)
+        return enrollments[obj.pk]
     
     @extend_schema_field(serializers.CharField)
     def get_enrollment_status(self, obj):
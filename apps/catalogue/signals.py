@@ -0,0 +1,72 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.catalogue.models import Category, Course, Quiz, QuizQuestion, Session, Tag
+from apps.catalogue.public_cache import bump_version
+
+
+def _adjust_sessions_count(course_id, delta):
+    """Keep Course.sessions_count in step and re-derive enrollment progress from it."""
+    from apps.learning.models import Enrollment
+
+    Course.objects.filter(pk=course_id).update(
+        sessions_count=Greatest(F('sessions_count') + delta, 0)
+    )
+    total = Course.objects.filter(pk=course_id).values_list('sessions_count', flat=True).first()
+    if total is not None:
+        Enrollment.refresh_course_progress(course_id, total)
+
+
+@receiver(post_save, sender=Session)
+def increment_course_sessions_count(sender, instance, created, **kwargs):
+    if created:
+        _adjust_sessions_count(instance.course_id, 1)
+
+
+@receiver(post_delete, sender=Session)
+def decrement_course_sessions_count(sender, instance, **kwargs):
+    _adjust_sessions_count(instance.course_id, -1)
+
+
+@receiver(post_save, sender=QuizQuestion)
+@receiver(post_delete, sender=QuizQuestion)
+def bump_quiz_questions_version(sender, instance, **kwargs):
+    """Retire the quiz's cached grading table."""
+    Quiz.objects.filter(pk=instance.quiz_id).update(questions_version=F('questions_version') + 1)
+
+
+# ── Public catalogue cache invalidation ───────────────────────
+
+@receiver(post_save, sender=Course)
+@receiver(post_delete, sender=Course)
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def bump_course_version(sender, **kwargs):
+    # Sessions are listed on the public course detail page
+    bump_version('course')
+
+
+@receiver(m2m_changed, sender=Course.tags.through)
+def bump_course_version_on_tags(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version('course')
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_category_version(sender, **kwargs):
+    bump_version('category')
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def bump_tag_version(sender, **kwargs):
+    bump_version('tag')
+
+
+@receiver(post_save, sender='learning.Certificate')
+@receiver(post_delete, sender='learning.Certificate')
+def bump_certificate_version(sender, **kwargs):
+    bump_version('certificate')
@@ -2111,6 +2111,298 @@ class PublicCatalogAccessTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class CourseListEnrollmentPrefetchTest(APITestCase):
+    """Course list pages resolve the learner's enrollments in a single query."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.learner = User.objects.create_user(
+            username='prefetch_learner',
+            email='prefetch_learner@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        instructor = _make_instructor(suffix='_prefetch')
+        self.courses = [
+            Course.objects.create(
+                title=f'Prefetch Course {i}',
+                slug=f'prefetch-course-{i}',
+                status='published',
+                instructor=instructor,
+                published_at=timezone.now(),
+            )
+            for i in range(5)
+        ]
+        for course in self.courses[:3]:
+            Enrollment.objects.create(user=self.learner, course=course)
+
+    def _user_enrollment_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **_auth(self.learner))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [
+            q['sql'] for q in ctx.captured_queries
+            if '"learning_enrollment"."user_id" =' in q['sql']
+        ]
+        return response.json()['results'], queries
+
+    def _assert_enrollment_fields(self, results):
+        by_id = {row['id']: row for row in results}
+        for course in self.courses[:3]:
+            self.assertEqual(by_id[course.id]['enrollment_status'], 'active')
+            self.assertIsNotNone(by_id[course.id]['enrollment_id'])
+        for course in self.courses[3:]:
+            self.assertEqual(by_id[course.id]['enrollment_status'], 'none')
+            self.assertIsNone(by_id[course.id]['enrollment_id'])
+
+    def test_course_viewset_list_single_enrollment_query(self):
+        results, queries = self._user_enrollment_queries(COURSES_URL)
+        self.assertEqual(len(queries), 1)
+        self._assert_enrollment_fields(results)
+
+    def test_public_course_list_single_enrollment_query(self):
+        results, queries = self._user_enrollment_queries('/api/v1/public/courses/')
+        self.assertEqual(len(queries), 1)
+        self._assert_enrollment_fields(results)
+
+
+class StatisticsSingleQueryTest(APITestCase):
+    """Bucketed stats endpoints count every bucket in one aggregate query."""
+
+    def setUp(self):
+        from .models import CourseReview
+
+        self.client = APIClient()
+        self.manager = _make_manager(suffix='_bucket')
+        instructor = _make_instructor(suffix='_bucket')
+        statuses = ['published', 'published', 'draft', 'archived', 'pending_approval']
+        self.courses = [
+            Course.objects.create(
+                title=f'Bucket Course {i}', slug=f'bucket-course-{i}', status=course_status,
+                instructor=instructor,
+            )
+            for i, course_status in enumerate(statuses)
+        ]
+        for i, rating in enumerate([5, 5, 4, 2]):
+            learner = User.objects.create_user(
+                username=f'bucket_learner{i}', email=f'bucket_learner{i}@example.com', password='pass1234',
+            )
+            CourseReview.objects.create(course=self.courses[0], user=learner, rating=rating, is_approved=True)
+
+    def _queries_on(self, table, url, params=None):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, params, **_auth(self.manager))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [q['sql'] for q in ctx.captured_queries if f'FROM "{table}"' in q['sql'] and 'COUNT(' in q['sql']]
+        return response.json(), queries
+
+    def test_course_stats_counts_in_one_query(self):
+        data, queries = self._queries_on('catalogue_course', f'{COURSES_URL}stats/')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            data,
+            {'total': 5, 'published': 2, 'draft': 1, 'archived': 1, 'pending_approval': 1},
+        )
+
+    def test_review_summary_counts_in_one_query(self):
+        data, queries = self._queries_on(
+            'catalogue_coursereview', '/api/v1/catalogue/course-reviews/summary/', {'course': self.courses[0].id}
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(data['total'], 4)
+        self.assertEqual(data['average'], 4.0)
+        self.assertEqual(data['distribution'], [2, 1, 0, 1, 0])
+
+
+class CourseExportCsvTest(APITestCase):
+    """GET /api/v1/catalogue/courses/export-csv/ streams one row per course."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.manager = _make_manager(suffix='_export')
+        instructor = _make_instructor(suffix='_export')
+        instructor.first_name, instructor.last_name = 'Ada', 'Lovelace'
+        instructor.save()
+        self.course = Course.objects.create(
+            title='Exported Course',
+            status='published',
+            instructor=instructor,
+            category=_make_category(),
+        )
+        for i in range(2):
+            learner = User.objects.create_user(
+                username=f'export_learner{i}', email=f'export_learner{i}@example.com', password='pass1234',
+            )
+            Enrollment.objects.create(user=learner, course=self.course)
+
+    def test_export_streams_rows(self):
+        import csv
+        import io
+
+        response = self.client.get(f'{COURSES_URL}export-csv/', **_auth(self.manager))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['ID', 'Title', 'Status'])
+        row = next(r for r in rows[1:] if r[0] == str(self.course.id))
+        self.assertEqual(row[3], 'Web Dev')
+        self.assertEqual(row[4], 'Ada Lovelace')
+        self.assertEqual(row[7], '2')
+
+
+class PublicCatalogueCacheTest(APITestCase):
+    """Anonymous public catalogue responses are cached, versioned and revalidatable."""
+
+    URL = '/api/v1/public/courses/'
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.client = APIClient()
+        self.instructor = _make_instructor(suffix='_pubcache')
+        Course.objects.create(
+            title='Cached Course',
+            slug='cached-course',
+            status='published',
+            instructor=self.instructor,
+            published_at=timezone.now(),
+        )
+
+    def test_repeat_request_served_without_queries(self):
+        first = self.client.get(self.URL)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.URL)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_query_param_order_shares_cache_entry(self):
+        self.client.get(self.URL, {'level': 'beginner', 'featured': 'true'})
+        with self.assertNumQueries(0):
+            self.client.get(f'{self.URL}?featured=true&level=beginner&search=')
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.URL)['ETag']
+        response = self.client.get(self.URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_course_write_invalidates_cached_list(self):
+        first = self.client.get(self.URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(
+                title='Fresh Course',
+                slug='fresh-course',
+                status='published',
+                instructor=self.instructor,
+                published_at=timezone.now(),
+            )
+        second = self.client.get(self.URL)
+        self.assertEqual(second.json()['count'], first.json()['count'] + 1)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        # Clients holding the old ETag get the new body
+        revalidated = self.client.get(self.URL, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(revalidated.status_code, status.HTTP_200_OK)
+
+    def test_tag_write_invalidates_cached_tags(self):
+        self.client.get('/api/v1/public/tags/')
+        Tag.objects.create(name='Caching', slug='caching')
+        response = self.client.get('/api/v1/public/tags/')
+        self.assertIn('caching', [t['slug'] for t in response.json()['results']])
+
+    def test_authenticated_course_list_bypasses_cache(self):
+        self.client.get(self.URL)
+        learner = User.objects.create_user(
+            username='pubcache_learner',
+            email='pubcache_learner@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        Enrollment.objects.create(user=learner, course=Course.objects.get(slug='cached-course'))
+        response = self.client.get(self.URL, **_auth(learner))
+        self.assertNotIn('ETag', response)
+        self.assertEqual(response.json()['results'][0]['enrollment_status'], 'active')
+
+
+class PublicInstructorLeaderboardTest(APITestCase):
+    """GET /api/v1/public/instructors/ ranks instructors in a single query."""
+
+    URL = '/api/v1/public/instructors/'
+
+    def setUp(self):
+        from .models import CourseReview
+
+        self.client = APIClient()
+        learners = [
+            User.objects.create_user(
+                username=f'board_learner{i}',
+                email=f'board_learner{i}@example.com',
+                password='pass1234',
+                role=User.Role.LEARNER,
+            )
+            for i in range(3)
+        ]
+        self.instructors = [_make_instructor(suffix=f'_board{i}') for i in range(4)]
+        # Instructor i teaches two published courses with i distinct students
+        for i, instructor in enumerate(self.instructors[:3]):
+            for n in range(2):
+                course = Course.objects.create(
+                    title=f'Board Course {i}-{n}',
+                    slug=f'board-course-{i}-{n}',
+                    status='published',
+                    instructor=instructor,
+                )
+                for learner in learners[:i]:
+                    Enrollment.objects.create(user=learner, course=course)
+                    CourseReview.objects.create(
+                        course=course, user=learner, rating=5, is_approved=True,
+                    )
+        # No published courses: left off the leaderboard
+        Course.objects.create(
+            title='Board Draft', slug='board-draft', status='draft', instructor=self.instructors[3],
+        )
+
+    def test_list_ranks_by_distinct_students_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.json()
+        self.assertEqual(
+            [row['id'] for row in rows],
+            [self.instructors[2].id, self.instructors[1].id, self.instructors[0].id],
+        )
+        self.assertEqual(rows[0]['total_students'], 2)
+        self.assertEqual(rows[0]['total_courses'], 2)
+        self.assertEqual(rows[0]['total_reviews'], 4)
+        self.assertEqual(rows[2]['total_students'], 0)
+        self.assertEqual(rows[2]['total_reviews'], 0)
+
+    def test_retrieve_returns_same_stats(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'{self.URL}{self.instructors[1].id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['total_students'], 1)
+        self.assertEqual(response.json()['total_courses'], 2)
+        self.assertEqual(response.json()['total_reviews'], 2)
+
+    def test_retrieve_unknown_instructor_404(self):
+        response = self.client.get(f'{self.URL}{self.instructors[0].id + 1000}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
 # ---------------------------------------------------------------------------
 # Course approval workflow (Phase 1)
 # ---------------------------------------------------------------------------
@@ -1,4 +1,5 @@
-from django.db.models import Avg, Count, Q
+from django.db.models import Avg, Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
@@ -19,6 +20,7 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 from apps.accounts.rbac import is_admin_like
+from apps.common.aggregates import bucket_counts
 from apps.common.spaces import create_boto3_client, delete_spaces_object
 from apps.payments.permissions import HasActiveSubscription
 from apps.learning.models import Enrollment, QuizSubmission, Submission
@@ -347,6 +349,9 @@ class CourseViewSet(viewsets.ModelViewSet):
             if role == User.Role.INSTRUCTOR:
                 queryset = queryset.filter(instructor_id=self.request.user.id)
 
+        if self.action == "list":
+            queryset = queryset.select_related("category", "instructor").prefetch_related("tags")
+
         # NOTE:
         # Do not annotate with `enrollment_count` because Course defines a
         # read-only @property with the same name. Annotating that name causes
@@ -360,30 +365,49 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=["get"])
     def stats(self, request):
         """Admin-level course statistics."""
-        qs = Course.objects.all()
-        return Response(
+        counts = bucket_counts(
+            Course.objects.all(),
             {
-                "total": qs.count(),
-                "published": qs.filter(status=Course.Status.PUBLISHED).count(),
-                "draft": qs.filter(status=Course.Status.DRAFT).count(),
-                "archived": qs.filter(status=Course.Status.ARCHIVED).count(),
-                "pending_approval": qs.filter(
-                    status=Course.Status.PENDING_APPROVAL
-                ).count(),
-            }
+                "total": None,
+                "published": Q(status=Course.Status.PUBLISHED),
+                "draft": Q(status=Course.Status.DRAFT),
+                "archived": Q(status=Course.Status.ARCHIVED),
+                "pending_approval": Q(status=Course.Status.PENDING_APPROVAL),
+            },
         )
+        return Response(counts)
 
     @action(detail=False, methods=["get"], url_path="export-csv")
     def export_csv(self, request):
         """GET /api/v1/catalogue/courses/export-csv/"""
-        import csv as csv_module
-        from django.http import HttpResponse
-
-        qs = self.get_queryset().select_related("instructor", "category")
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="courses.csv"'
-        writer = csv_module.writer(response)
-        writer.writerow(
+        from apps.common.csv_export import full_name, iter_rows, stream_csv
+
+        enrollments = (
+            Enrollment.objects.filter(course=OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        qs = self.get_queryset().annotate(
+            enrollments_total=Coalesce(Subquery(enrollments, output_field=IntegerField()), 0)
+        )
+        fields = [
+            "id", "title", "status", "category__name",
+            "instructor__first_name", "instructor__last_name",
+            "level", "price", "enrollments_total", "created_at",
+        ]
+
+        def to_row(row):
+            (pk, title, status_, category, first_name, last_name,
+             level, price, enrollments_total, created_at) = row
+            return [
+                pk, title, status_, category or "", full_name(first_name, last_name),
+                level, price, enrollments_total, created_at,
+            ]
+
+        return stream_csv(
+            "courses.csv",
             [
                 "ID",
                 "Title",
@@ -394,23 +418,9 @@ class CourseViewSet(viewsets.ModelViewSet):
                 "Price",
                 "Enrollment Count",
                 "Created At",
-            ]
+            ],
+            iter_rows(qs, fields, to_row),
         )
-        for course in qs:
-            writer.writerow(
-                [
-                    course.id,
-                    course.title,
-                    course.status,
-                    course.category.name if course.category else "",
-                    course.instructor.get_full_name() if course.instructor else "",
-                    course.level,
-                    course.price,
-                    getattr(course, "enrollment_count", 0),
-                    course.created_at,
-                ]
-            )
-        return response
 
     @extend_schema(
         summary="List courses",
@@ -1896,7 +1906,12 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
             )
 
         reviews = CourseReview.objects.filter(course=course, is_approved=True)
-        total = reviews.count()
+        counts = bucket_counts(
+            reviews,
+            {"total": None, **{f"rating_{stars}": Q(rating=stars) for stars in range(5, 0, -1)}},
+            average=Avg("rating"),
+        )
+        total = counts["total"]
 
         if total == 0:
             return Response(
@@ -1908,15 +1923,10 @@ class CourseReviewViewSet(viewsets.ModelViewSet):
                 }
             )
 
-        avg_rating = reviews.aggregate(Avg("rating"))["rating__avg"]
+        avg_rating = counts["average"]
 
-        distribution = [
-            reviews.filter(rating=5).count(),
-            reviews.filter(rating=4).count(),
-            reviews.filter(rating=3).count(),
-            reviews.filter(rating=2).count(),
-            reviews.filter(rating=1).count(),
-        ]
+        # Five stars first
+        distribution = [counts[f"rating_{stars}"] for stars in range(5, 0, -1)]
 
         reviews_list = reviews.order_by("-created_at")[:20]
 
@@ -10,12 +10,14 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.decorators import action
 
-from django.db.models import Count, Q, Avg
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 import hashlib
 from datetime import date
 
 from .models import Category, Course, Tag, CourseReview
+from .public_cache import cache_public_response
 from .serializers import (
     CategorySerializer,
     TagSerializer,
@@ -156,6 +158,7 @@ class PublicCourseViewSet(viewsets.ReadOnlyModelViewSet):
             )
         ]
     )
+    @cache_public_response(('course', 'category', 'tag'), anonymous_only=True)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
@@ -208,6 +211,7 @@ class PublicCourseViewSet(viewsets.ReadOnlyModelViewSet):
             )
         ]
     )
+    @cache_public_response(('course', 'category', 'tag'), anonymous_only=True)
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -234,6 +238,7 @@ class PublicCategoryViewSet(viewsets.ReadOnlyModelViewSet):
         description='Returns list of all active course categories. No authentication required.',
         responses={200: CategorySerializer(many=True)},
     )
+    @cache_public_response(('category', 'course'))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
@@ -242,6 +247,7 @@ class PublicCategoryViewSet(viewsets.ReadOnlyModelViewSet):
         description='Returns detailed information about a category. No authentication required.',
         responses={200: CategorySerializer},
     )
+    @cache_public_response(('category', 'course'))
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -266,6 +272,7 @@ class PublicTagViewSet(viewsets.ReadOnlyModelViewSet):
         description='Returns list of all course tags. No authentication required.',
         responses={200: TagSerializer(many=True)},
     )
+    @cache_public_response(('tag',))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
     
@@ -274,6 +281,7 @@ class PublicTagViewSet(viewsets.ReadOnlyModelViewSet):
         description='Returns detailed information about a tag. No authentication required.',
         responses={200: TagSerializer},
     )
+    @cache_public_response(('tag',))
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -301,6 +309,7 @@ class PublicStatsViewSet(viewsets.ViewSet):
             }
         },
     )
+    @cache_public_response(('course', 'certificate'))
     def list(self, request):
         from django.contrib.auth import get_user_model
         from apps.learning.models import Certificate
@@ -406,6 +415,60 @@ def _monthly_rating(instructor_id: int, actual_avg=None) -> float:
     return round(4.0 + monthly_offset * 1.0, 1)
 
 
+def _instructor_stats_queryset():
+    """
+    Active instructors annotated with their public stats in a single query.
+
+    Each stat is a correlated subquery rather than a join-and-Count so the
+    course, enrollment and review counts don't multiply each other.
+    """
+    from apps.learning.models import Enrollment
+
+    User = get_user_model()
+
+    def per_instructor(queryset, instructor_path, aggregate, output_field):
+        return Subquery(
+            queryset.filter(**{instructor_path: OuterRef('pk')})
+            .order_by()
+            .values(instructor_path)
+            .annotate(value=aggregate)
+            .values('value')[:1],
+            output_field=output_field,
+        )
+
+    approved_reviews = CourseReview.objects.filter(is_approved=True)
+    return User.objects.filter(role='instructor', is_active=True).annotate(
+        total_courses=Coalesce(per_instructor(
+            Course.objects.filter(status='published'), 'instructor',
+            Count('pk'), IntegerField(),
+        ), 0),
+        total_students=Coalesce(per_instructor(
+            Enrollment.objects.all(), 'course__instructor',
+            Count('user', distinct=True), IntegerField(),
+        ), 0),
+        total_reviews=Coalesce(per_instructor(
+            approved_reviews, 'course__instructor', Count('pk'), IntegerField(),
+        ), 0),
+        avg_rating=per_instructor(
+            approved_reviews, 'course__instructor', Avg('rating'), FloatField(),
+        ),
+    )
+
+
+def _instructor_payload(inst):
+    return {
+        'id': inst.id,
+        'name': inst.get_full_name() or inst.email,
+        'bio': inst.bio or '',
+        'avatar_url': inst.avatar,
+        'rating': _monthly_rating(inst.id, inst.avg_rating),
+        'total_reviews': inst.total_reviews,
+        'total_students': inst.total_students,
+        'total_courses': inst.total_courses,
+        'social_links': {},
+    }
+
+
 class PublicInstructorViewSet(viewsets.ViewSet):
     """
     GET /api/v1/public/instructors/          — list featured instructors
@@ -415,72 +478,15 @@ class PublicInstructorViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
 
     def list(self, request):
-        User = get_user_model()
-        instructors = User.objects.filter(role='instructor', is_active=True)
-        results = []
-        for inst in instructors:
-            total_courses = Course.objects.filter(instructor=inst, status='published').count()
-            if total_courses == 0:
-                continue
-            from apps.learning.models import Enrollment
-            total_students = (
-                Enrollment.objects
-                .filter(course__instructor=inst)
-                .values('user')
-                .distinct()
-                .count()
-            )
-            rating_data = (
-                CourseReview.objects
-                .filter(course__instructor=inst, is_approved=True)
-                .aggregate(avg=Avg('rating'), count=Count('id'))
-            )
-        results.append({
-            'id': inst.id,
-            'name': inst.get_full_name() or inst.email,
-            'bio': inst.bio or '',
-            'avatar_url': inst.avatar,
-            'rating': _monthly_rating(inst.id, rating_data['avg']),
-            'total_reviews': rating_data['count'],
-            'total_students': total_students,
-            'total_courses': total_courses,
-            'social_links': {},
-        })
-        results.sort(key=lambda x: x['total_students'], reverse=True)
-        return Response(results[:8])
+        instructors = (
+            _instructor_stats_queryset()
+            .filter(total_courses__gt=0)
+            .order_by('-total_students', 'id')[:8]
+        )
+        return Response([_instructor_payload(inst) for inst in instructors])
 
     def retrieve(self, request, pk=None):
-        User = get_user_model()
-        try:
-            instructor = User.objects.get(pk=pk, role='instructor', is_active=True)
-        except User.DoesNotExist:
+        instructor = _instructor_stats_queryset().filter(pk=pk).first()
+        if instructor is None:
             return Response({'detail': 'Instructor not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        total_courses = Course.objects.filter(instructor=instructor, status='published').count()
-
-        from apps.learning.models import Enrollment
-        total_students = (
-            Enrollment.objects
-            .filter(course__instructor=instructor)
-            .values('user')
-            .distinct()
-            .count()
-        )
-
-        rating_data = (
-            CourseReview.objects
-            .filter(course__instructor=instructor, is_approved=True)
-            .aggregate(avg=Avg('rating'), count=Count('id'))
-        )
-
-        return Response({
-            'id': instructor.id,
-            'name': instructor.get_full_name() or instructor.email,
-            'bio': instructor.bio or '',
-            'avatar_url': instructor.avatar,
-            'rating': _monthly_rating(instructor.id, rating_data['avg']),
-            'total_reviews': rating_data['count'],
-            'total_students': total_students,
-            'total_courses': total_courses,
-            'social_links': {},
-        })
+        return Response(_instructor_payload(instructor))
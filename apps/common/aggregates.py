@@ -0,0 +1,20 @@
+"""
+Single-query bucket counts for statistics endpoints.
+
+Declare the buckets as data (``{name: Q}``) and `bucket_counts` evaluates
+all of them, plus any other aggregates, as ``COUNT(...) FILTER (WHERE ...)``
+columns of one ``aggregate()`` query instead of one ``count()`` per bucket.
+"""
+from django.db.models import Count
+
+
+def bucket_counts(queryset, buckets, **aggregates):
+    """
+    Count the rows of ``queryset`` matching each condition in ``buckets``
+    (``None`` counts every row) and evaluate ``aggregates`` in the same
+    query. Returns a dict keyed by bucket and aggregate name.
+    """
+    expressions = {
+        name: Count("pk", filter=condition) for name, condition in buckets.items()
+    }
+    return queryset.aggregate(**expressions, **aggregates)
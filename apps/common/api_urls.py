@@ -8,7 +8,7 @@ from apps.accounts.views import (
     OrganizationSeatUsageView,
     OrganizationMemberViewSet,
 )
-from apps.common.views import PresignUploadView, StorageQuotaView
+from apps.common.views import ConfirmUploadView, PresignUploadView, StorageQuotaView
 
 # Admin router for user management
 admin_router = DefaultRouter()
@@ -22,6 +22,7 @@ admin_router.register(
 
 urlpatterns = [
     path("uploads/presign/", PresignUploadView.as_view(), name="uploads-presign"),
+    path("uploads/confirm/", ConfirmUploadView.as_view(), name="uploads-confirm"),
     path("uploads/quota/", StorageQuotaView.as_view(), name="uploads-quota"),
     path("", include("apps.common.urls")),
     path("auth/", include("apps.accounts.urls")),
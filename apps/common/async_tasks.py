@@ -0,0 +1,36 @@
+"""
+Helpers for handing work to Celery without losing it.
+
+Not every environment runs a worker (local dev, tests and the single-box
+staging deploy use the placeholder ``django://`` broker), so dispatch falls
+back to running the task inline when the broker rejects the message.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+_broker_warned = set()
+
+
+def enqueue_task(task, *args, **kwargs):
+    """Send ``task`` to the broker, or run it inline if that isn't possible."""
+    if getattr(settings, "CELERY_TASK_ALWAYS_EAGER", False):
+        return task.apply(args=args, kwargs=kwargs)
+    try:
+        return task.delay(*args, **kwargs)
+    except Exception as e:
+        # Warn once per task per process; without a broker this path is the norm
+        if task.name not in _broker_warned:
+            _broker_warned.add(task.name)
+            logger.warning(
+                "Could not queue %s (%s); running inline instead.", task.name, e
+            )
+        return task.apply(args=args, kwargs=kwargs)
+
+
+def enqueue_task_on_commit(task, *args, **kwargs):
+    """Queue ``task`` once the surrounding transaction commits."""
+    transaction.on_commit(lambda: enqueue_task(task, *args, **kwargs))
@@ -0,0 +1,56 @@
+"""
+Two-tier cache for hot, rarely-changing values (feature flags, platform
+settings).
+
+Reads are served from a plain in-process dict for ``CACHE_L1_TTL`` seconds
+and fall through to the shared Django cache (Redis in production) after
+that. A write goes to the shared cache and drops this process's copy, so
+it takes effect here at once and in other processes within one L1 TTL.
+
+The L1 is never pruned, so keep it to a small, fixed set of keys.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class TieredCache:
+    """An in-process L1 in front of a Django cache alias."""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+        self._local = {}
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def get(self, key, default=None):
+        entry = self._local.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[0] > now:
+            value = entry[1]
+        else:
+            value = self.shared.get(key, _MISSING)
+            # Misses are kept too, so an unset flag doesn't hit the shared cache per request
+            self._local[key] = (now + settings.CACHE_L1_TTL, value)
+        return default if value is _MISSING else value
+
+    def set(self, key, value, timeout=None):
+        """Store ``value``; ``timeout=None`` keeps it until it is replaced."""
+        self.shared.set(key, value, timeout)
+        self._local.pop(key, None)
+
+    def delete(self, key):
+        self.shared.delete(key)
+        self._local.pop(key, None)
+
+    def clear_local(self):
+        """Forget every value held in this process."""
+        self._local.clear()
+
+
+tiered_cache = TieredCache()
@@ -0,0 +1,153 @@
+"""
+Shared HTTP layer for third-party providers (payments, meetings).
+
+Each provider gets a pooled ``requests.Session`` per thread, so repeated
+calls reuse the same TCP/TLS connection, with retry and exponential
+backoff for connection failures and for 429/5xx answers to idempotent
+requests. POSTs are never retried after they reach the provider: a
+retried charge or meeting creation could happen twice.
+
+Every call is timed; `latency_stats()` returns per-provider totals and
+each call is logged at DEBUG.
+
+`TokenCache` keeps OAuth access tokens in the shared cache and refreshes
+them a margin before they expire, instead of once per service instance.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {"calls": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+
+
+def _build_session():
+    retry = Retry(
+        total=settings.PROVIDER_HTTP_RETRIES,
+        backoff_factor=settings.PROVIDER_HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.PROVIDER_HTTP_POOL_SIZE,
+        pool_maxsize=settings.PROVIDER_HTTP_POOL_SIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(provider):
+    """Return this thread's pooled session for ``provider``."""
+    sessions = getattr(_local, "sessions", None)
+    if sessions is None:
+        sessions = _local.sessions = {}
+    session = sessions.get(provider)
+    if session is None:
+        session = sessions[provider] = _build_session()
+    return session
+
+
+def _record(provider, elapsed_ms, failed):
+    with _stats_lock:
+        stats = _stats[provider]
+        stats["calls"] += 1
+        stats["errors"] += int(failed)
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+def latency_stats():
+    """Return ``{provider: {calls, errors, total_ms, max_ms}}`` for this process."""
+    with _stats_lock:
+        return {provider: dict(stats) for provider, stats in _stats.items()}
+
+
+class ProviderClient:
+    """
+    Pooled, retrying, timed HTTP client for one provider.
+
+    Methods mirror ``requests`` (``get``, ``post``, ...) and return the
+    ``requests.Response``; errors surface as the usual ``requests``
+    exceptions.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", settings.PROVIDER_HTTP_TIMEOUT)
+        started = time.monotonic()
+        response = None
+        try:
+            response = get_session(self.provider).request(method, url, **kwargs)
+            return response
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000
+            failed = response is None or response.status_code >= 500
+            _record(self.provider, elapsed_ms, failed)
+            logger.debug(
+                "%s %s %s -> %s in %.1fms",
+                self.provider,
+                method.upper(),
+                urlsplit(url).path,
+                response.status_code if response is not None else "error",
+                elapsed_ms,
+            )
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+
+class TokenCache:
+    """
+    An access token shared by every process through the Django cache.
+
+    ``fetch`` returns ``(token, expires_in_seconds)``. A cached token is
+    replaced once it is within ``PROVIDER_TOKEN_REFRESH_MARGIN`` seconds of
+    expiring, so callers never present one that lapses mid-request.
+    """
+
+    def __init__(self, key, fetch):
+        self.key = key
+        self.fetch = fetch
+
+    def get(self):
+        entry = cache.get(self.key)
+        now = time.time()
+        if entry and entry["expires_at"] - settings.PROVIDER_TOKEN_REFRESH_MARGIN > now:
+            return entry["token"]
+
+        token, expires_in = self.fetch()
+        expires_at = now + expires_in
+        timeout = max(1, int(expires_in - settings.PROVIDER_TOKEN_REFRESH_MARGIN))
+        cache.set(self.key, {"token": token, "expires_at": expires_at}, timeout)
+        return token
+
+    def clear(self):
+        cache.delete(self.key)
@@ -697,6 +697,7 @@ class Command(BaseCommand):
                 self.summary["progress_updated"] += 1
 
         ratio = complete_count / len(sessions)
+        enrollment.completed_sessions_count = complete_count
         enrollment.progress_percentage = Decimal(str(round(ratio * 100, 2)))
         if ratio >= 0.9:
             enrollment.status = Enrollment.Status.COMPLETED
@@ -704,7 +705,9 @@ class Command(BaseCommand):
         else:
             enrollment.status = Enrollment.Status.ACTIVE
             enrollment.completed_at = None
-        enrollment.save(update_fields=["progress_percentage", "status", "completed_at"])
+        enrollment.save(
+            update_fields=["completed_sessions_count", "progress_percentage", "status", "completed_at"]
+        )
         return ratio
 
     def _ensure_certificate(self, enrollment):
@@ -1,3 +1,74 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+
+class StoredObject(models.Model):
+    """
+    One object in a Spaces bucket and the byte count charged for it.
+    Maintained by apps.common.storage_usage.
+    """
+
+    bucket = models.CharField(max_length=255)
+    key = models.CharField(max_length=1024)
+    size_bytes = models.BigIntegerField(default=0)
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="stored_objects",
+    )
+    course = models.ForeignKey(
+        "catalogue.Course",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="stored_objects",
+    )
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="stored_objects",
+    )
+    # Last confirmation or bucket scan that saw the object
+    last_seen_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["bucket", "key"], name="unique_stored_object"),
+        ]
+        indexes = [
+            models.Index(fields=["bucket", "last_seen_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket}/{self.key} ({self.size_bytes} bytes)"
+
+
+class StorageUsage(models.Model):
+    """Running byte total of the StoredObjects charged to one user, course, organization or the platform."""
+
+    class Scope(models.TextChoices):
+        USER = "user", "User"
+        COURSE = "course", "Course"
+        ORGANIZATION = "organization", "Organization"
+        PLATFORM = "platform", "Platform"
+
+    scope = models.CharField(max_length=20, choices=Scope.choices)
+    # Id of the user, course or organization; 0 for the platform total
+    scope_id = models.BigIntegerField()
+    used_bytes = models.BigIntegerField(default=0)
+    object_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "scope_id"], name="unique_storage_usage_scope"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}:{self.scope_id} {self.used_bytes} bytes"
@@ -22,15 +22,25 @@ def delete_spaces_object(bucket: str, key: str) -> bool:
     """Best-effort delete of a single object from DigitalOcean Spaces.
 
     Returns True on success, False on failure.  Failures are logged but
-    never raised so callers can treat this as fire-and-forget.
+    never raised so callers can treat this as fire-and-forget.  A deleted
+    object stops counting towards storage quotas.
     """
     try:
         client = create_boto3_client()
         client.delete_object(Bucket=bucket, Key=key)
         logger.info("Deleted Spaces object %s/%s", bucket, key)
-        return True
     except Exception:
         logger.warning(
             "Failed to delete Spaces object %s/%s", bucket, key, exc_info=True
         )
-        return False
\ No newline at end of file
+        return False
+
+    from .storage_usage import forget_object
+
+    try:
+        forget_object(bucket, key)
+    except Exception:
+        logger.warning(
+            "Failed to release storage usage for %s/%s", bucket, key, exc_info=True
+        )
+    return True
@@ -0,0 +1,327 @@
+"""
+Storage usage ledger.
+
+Every uploaded Spaces object has a StoredObject row carrying its size and
+the user, course and organization it is charged to, and StorageUsage keeps
+a running total per user, course, organization and for the whole platform.
+`record_object` (called when an upload is confirmed) and `forget_object`
+(called by `delete_spaces_object`) adjust those totals in the same
+transaction as the ledger row, so a quota check is one lookup on the
+(scope, scope_id) unique index instead of a bucket listing.
+
+`reconcile` is the safety net for uploads that were never confirmed and
+deletes that happened elsewhere: it pages through the buckets, brings the
+ledger in line with what is actually stored and rebuilds the totals.
+"""
+import logging
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+PLATFORM_SCOPE_ID = 0
+
+SESSION_ASSET_KEY = re.compile(r"^session-assets/course_(\d+)/")
+SUBMISSION_FILE_KEY = re.compile(r"^submission-files/enrollment_(\d+)/")
+
+
+def _key_attribution(keys):
+    """Return ``{key: (owner_id, course_id)}`` for keys whose path names a course or enrollment."""
+    from apps.learning.models import Enrollment
+
+    attribution = {}
+    enrollment_keys = {}
+    for key in keys:
+        match = SESSION_ASSET_KEY.match(key)
+        if match:
+            attribution[key] = (None, int(match.group(1)))
+            continue
+        match = SUBMISSION_FILE_KEY.match(key)
+        if match:
+            enrollment_keys[key] = int(match.group(1))
+    if enrollment_keys:
+        enrollments = dict(
+            (pk, (user_id, course_id))
+            for pk, user_id, course_id in Enrollment.objects.filter(
+                pk__in=set(enrollment_keys.values())
+            ).values_list("pk", "user_id", "course_id")
+        )
+        for key, enrollment_id in enrollment_keys.items():
+            if enrollment_id in enrollments:
+                attribution[key] = enrollments[enrollment_id]
+    return attribution
+
+
+def _organization_ids(user_ids):
+    """Return ``{user_id: organization_id}`` from each user's first active membership."""
+    from apps.accounts.models import Membership
+
+    organizations = {}
+    for user_id, organization_id in (
+        Membership.objects.filter(user_id__in=set(user_ids), is_active=True)
+        .order_by("-pk")
+        .values_list("user_id", "organization_id")
+    ):
+        organizations[user_id] = organization_id
+    return organizations
+
+
+def _scopes(owner_id, course_id, organization_id):
+    from .models import StorageUsage
+
+    scopes = [(StorageUsage.Scope.PLATFORM, PLATFORM_SCOPE_ID)]
+    if owner_id:
+        scopes.append((StorageUsage.Scope.USER, owner_id))
+    if course_id:
+        scopes.append((StorageUsage.Scope.COURSE, course_id))
+    if organization_id:
+        scopes.append((StorageUsage.Scope.ORGANIZATION, organization_id))
+    return scopes
+
+
+def _apply(stored, size_delta, count_delta):
+    """Add the deltas to every total ``stored`` is charged to."""
+    from .models import StorageUsage
+
+    if not size_delta and not count_delta:
+        return
+    for scope, scope_id in _scopes(stored.owner_id, stored.course_id, stored.organization_id):
+        usage = StorageUsage.objects.filter(scope=scope, scope_id=scope_id)
+        changes = dict(
+            used_bytes=F("used_bytes") + size_delta,
+            object_count=F("object_count") + count_delta,
+        )
+        if usage.update(**changes):
+            continue
+        try:
+            with transaction.atomic():
+                StorageUsage.objects.create(
+                    scope=scope, scope_id=scope_id, used_bytes=size_delta, object_count=count_delta
+                )
+        except IntegrityError:
+            # Created concurrently
+            usage.update(**changes)
+
+
+def record_object(bucket, key, size_bytes, owner=None):
+    """
+    Record (or resize) a stored object. A new object is charged to ``owner``
+    (or the enrollment's learner for submission files), the course its key
+    belongs to, and the owner's organization. Returns the StoredObject.
+    """
+    from .models import StoredObject
+
+    with transaction.atomic():
+        stored = StoredObject.objects.select_for_update().filter(bucket=bucket, key=key).first()
+        if stored is not None:
+            size_delta = size_bytes - stored.size_bytes
+            stored.size_bytes = size_bytes
+            stored.last_seen_at = timezone.now()
+            stored.save(update_fields=["size_bytes", "last_seen_at"])
+            _apply(stored, size_delta, 0)
+            return stored
+
+        owner_id, course_id = _key_attribution([key]).get(key, (None, None))
+        owner_id = owner_id or getattr(owner, "pk", None)
+        organization_id = _organization_ids([owner_id]).get(owner_id) if owner_id else None
+        try:
+            with transaction.atomic():
+                stored = StoredObject.objects.create(
+                    bucket=bucket,
+                    key=key,
+                    size_bytes=size_bytes,
+                    owner_id=owner_id,
+                    course_id=course_id,
+                    organization_id=organization_id,
+                )
+        except IntegrityError:
+            # Confirmed concurrently; that call charged it
+            return StoredObject.objects.get(bucket=bucket, key=key)
+        _apply(stored, size_bytes, 1)
+        return stored
+
+
+def forget_object(bucket, key):
+    """Drop a deleted object from the ledger and its totals."""
+    from .models import StoredObject
+
+    with transaction.atomic():
+        stored = StoredObject.objects.select_for_update().filter(bucket=bucket, key=key).first()
+        if stored is None:
+            return
+        stored.delete()
+        _apply(stored, -stored.size_bytes, -1)
+
+
+def used_bytes(scope, scope_id):
+    """Bytes currently charged to one scope."""
+    from .models import StorageUsage
+
+    return (
+        StorageUsage.objects.filter(scope=scope, scope_id=scope_id)
+        .values_list("used_bytes", flat=True)
+        .first()
+    ) or 0
+
+
+def quota_scope(user):
+    """
+    The scope whose usage ``user`` sees and is limited by: the platform for
+    LMS managers and TASC admins, otherwise the user's organization, or the
+    user themselves outside any organization.
+    """
+    from .models import StorageUsage
+
+    if getattr(user, "role", None) in (user.Role.LMS_MANAGER, user.Role.TASC_ADMIN):
+        return StorageUsage.Scope.PLATFORM, PLATFORM_SCOPE_ID
+    organization_id = _organization_ids([user.pk]).get(user.pk)
+    if organization_id:
+        return StorageUsage.Scope.ORGANIZATION, organization_id
+    return StorageUsage.Scope.USER, user.pk
+
+
+def quota_for(user):
+    """Return ``{"scope", "used_bytes", "total_bytes"}`` for ``user``."""
+    scope, scope_id = quota_scope(user)
+    return {
+        "scope": scope,
+        "used_bytes": used_bytes(scope, scope_id),
+        "total_bytes": settings.STORAGE_QUOTA_BYTES,
+    }
+
+
+def is_over_quota(user):
+    """Whether new uploads by ``user`` should be refused. The platform total is never enforced."""
+    from .models import StorageUsage
+
+    if not settings.STORAGE_QUOTA_ENFORCED:
+        return False
+    scope, scope_id = quota_scope(user)
+    if scope == StorageUsage.Scope.PLATFORM:
+        return False
+    return used_bytes(scope, scope_id) >= settings.STORAGE_QUOTA_BYTES
+
+
+def _sync_page(bucket, sizes, seen_at, counts):
+    from .models import StoredObject
+
+    existing = dict(
+        StoredObject.objects.filter(bucket=bucket, key__in=list(sizes)).values_list("key", "size_bytes")
+    )
+    resized = [
+        key for key, size in sizes.items() if key in existing and existing[key] != size
+    ]
+    new_keys = [key for key in sizes if key not in existing]
+    if new_keys:
+        attribution = _key_attribution(new_keys)
+        organizations = _organization_ids(
+            owner_id for owner_id, _ in attribution.values() if owner_id
+        )
+        new_objects = []
+        for key in new_keys:
+            owner_id, course_id = attribution.get(key, (None, None))
+            new_objects.append(
+                StoredObject(
+                    bucket=bucket,
+                    key=key,
+                    size_bytes=sizes[key],
+                    owner_id=owner_id,
+                    course_id=course_id,
+                    organization_id=organizations.get(owner_id),
+                    last_seen_at=seen_at,
+                )
+            )
+        StoredObject.objects.bulk_create(new_objects, ignore_conflicts=True)
+    if resized:
+        to_update = list(StoredObject.objects.filter(bucket=bucket, key__in=resized))
+        for stored in to_update:
+            stored.size_bytes = sizes[stored.key]
+        StoredObject.objects.bulk_update(to_update, ["size_bytes"])
+    StoredObject.objects.filter(bucket=bucket, key__in=list(sizes)).update(last_seen_at=seen_at)
+    counts["scanned"] += len(sizes)
+    counts["added"] += len(new_keys)
+    counts["resized"] += len(resized)
+
+
+def rebuild_totals():
+    """Recompute every StorageUsage row from the ledger."""
+    from .models import StorageUsage, StoredObject
+
+    totals = defaultdict(lambda: [0, 0])
+    groupings = [
+        (StorageUsage.Scope.USER, "owner_id"),
+        (StorageUsage.Scope.COURSE, "course_id"),
+        (StorageUsage.Scope.ORGANIZATION, "organization_id"),
+    ]
+    for scope, field in groupings:
+        rows = (
+            StoredObject.objects.filter(**{f"{field}__isnull": False})
+            .values(field)
+            .annotate(used=Sum("size_bytes"), objects=Count("pk"))
+            .order_by()
+        )
+        for row in rows:
+            totals[(scope, row[field])] = [row["used"], row["objects"]]
+    platform = StoredObject.objects.aggregate(used=Sum("size_bytes"), objects=Count("pk"))
+    totals[(StorageUsage.Scope.PLATFORM, PLATFORM_SCOPE_ID)] = [platform["used"] or 0, platform["objects"]]
+
+    with transaction.atomic():
+        StorageUsage.objects.all().delete()
+        StorageUsage.objects.bulk_create(
+            StorageUsage(scope=scope, scope_id=scope_id, used_bytes=used, object_count=objects)
+            for (scope, scope_id), (used, objects) in totals.items()
+        )
+
+
+def reconcile(client=None):
+    """
+    Page through the upload prefixes of the public and private buckets,
+    add, resize or drop ledger rows to match, and rebuild the totals.
+    Returns counts of scanned, added, resized and removed objects.
+    """
+    from .models import StoredObject
+    from .spaces import create_boto3_client
+    from .views import ALLOWED_UPLOAD_PREFIXES
+
+    counts = {"scanned": 0, "added": 0, "resized": 0, "removed": 0}
+    buckets = [
+        bucket
+        for bucket in {settings.DO_SPACES_PUBLIC_BUCKET, settings.DO_SPACES_PRIVATE_BUCKET}
+        if bucket
+    ]
+    if not buckets or not settings.DO_SPACES_ENDPOINT:
+        return counts
+
+    client = client or create_boto3_client()
+    paginator = client.get_paginator("list_objects_v2")
+    for bucket in sorted(buckets):
+        seen_at = timezone.now()
+        try:
+            for prefix in sorted(ALLOWED_UPLOAD_PREFIXES):
+                pages = paginator.paginate(
+                    Bucket=bucket,
+                    Prefix=f"{prefix}/",
+                    PaginationConfig={"PageSize": settings.STORAGE_RECONCILE_PAGE_SIZE},
+                )
+                for page in pages:
+                    sizes = {obj["Key"]: obj.get("Size", 0) for obj in page.get("Contents", [])}
+                    if sizes:
+                        _sync_page(bucket, sizes, seen_at, counts)
+        except Exception:
+            # An incomplete listing must not drop the objects it didn't reach
+            logger.exception("Storage reconcile: listing bucket %s failed", bucket)
+            continue
+        removed, _ = StoredObject.objects.filter(bucket=bucket, last_seen_at__lt=seen_at).delete()
+        counts["removed"] += removed
+
+    rebuild_totals()
+    logger.info(
+        "Storage reconcile: %(scanned)d scanned, %(added)d added, %(resized)d resized, %(removed)d removed",
+        counts,
+    )
+    return counts
@@ -0,0 +1,9 @@
+from celery import shared_task
+
+
+@shared_task
+def reconcile_storage_usage():
+    """Bring the storage ledger in line with the buckets (see apps.common.storage_usage)."""
+    from apps.common.storage_usage import reconcile
+
+    return reconcile()
@@ -1,16 +1,22 @@
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import override_settings
+from django.test import SimpleTestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from apps.accounts.models import Membership, Organization
 from apps.catalogue.models import Category, Course, Session
+from apps.common import storage_usage
+from apps.common.models import StorageUsage, StoredObject
+from apps.common.spaces import delete_spaces_object
 
 User = get_user_model()
 
 PRESIGN_URL = "/api/v1/uploads/presign/"
+CONFIRM_URL = "/api/v1/uploads/confirm/"
+QUOTA_URL = "/api/v1/uploads/quota/"
 
 PRESIGN_SETTINGS = {
     "DO_SPACES_REGION": "lon1",
@@ -297,6 +303,122 @@ class UploadPresignApiTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+@override_settings(**PRESIGN_SETTINGS, STORAGE_QUOTA_BYTES=1000, STORAGE_QUOTA_ENFORCED=True)
+class StorageUsageLedgerTest(APITestCase):
+    """Confirmed uploads and deletes keep per-scope totals that the quota reads."""
+
+    def setUp(self):
+        self.instructor = User.objects.create_user(
+            username="ledger-instructor",
+            email="ledger-instructor@example.com",
+            password="pass1234",
+            role="instructor",
+            email_verified=True,
+            is_active=True,
+        )
+        self.org = Organization.objects.create(name="Ledger Org")
+        Membership.objects.create(
+            user=self.instructor, organization=self.org, role=Membership.Role.ORG_MANAGER
+        )
+        self.course = Course.objects.create(
+            title="Ledger Course", slug="ledger-course", description="Desc", instructor=self.instructor
+        )
+        self.auth = _auth_headers(self.instructor)
+        self.key = f"session-assets/course_{self.course.id}/session_1/abc/intro.mp4"
+
+    def _usage(self, scope, scope_id):
+        return storage_usage.used_bytes(scope, scope_id)
+
+    @patch("apps.common.views.create_boto3_client")
+    def test_confirm_charges_user_course_and_organization(self, mock_factory):
+        mock_factory.return_value.head_object.return_value = {"ContentLength": 600}
+
+        response = self.client.post(
+            CONFIRM_URL, {"bucket": "tasc-private", "object_key": self.key}, format="json", **self.auth
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["size_bytes"], 600)
+        self.assertEqual(response.data["used_bytes"], 600)
+        self.assertEqual(response.data["scope"], StorageUsage.Scope.ORGANIZATION)
+        self.assertEqual(self._usage(StorageUsage.Scope.USER, self.instructor.id), 600)
+        self.assertEqual(self._usage(StorageUsage.Scope.COURSE, self.course.id), 600)
+        self.assertEqual(self._usage(StorageUsage.Scope.PLATFORM, 0), 600)
+
+        # Re-confirming the same object only applies the size change
+        mock_factory.return_value.head_object.return_value = {"ContentLength": 400}
+        self.client.post(
+            CONFIRM_URL, {"bucket": "tasc-private", "object_key": self.key}, format="json", **self.auth
+        )
+        self.assertEqual(self._usage(StorageUsage.Scope.ORGANIZATION, self.org.id), 400)
+        self.assertEqual(StoredObject.objects.count(), 1)
+
+    def test_confirm_rejects_other_instructors_course(self):
+        other = User.objects.create_user(
+            username="ledger-other", email="ledger-other@example.com", password="pass1234", role="instructor"
+        )
+        response = self.client.post(
+            CONFIRM_URL,
+            {"bucket": "tasc-private", "object_key": self.key},
+            format="json",
+            **_auth_headers(other),
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(StoredObject.objects.exists())
+
+    @patch("apps.common.spaces.create_boto3_client")
+    def test_delete_releases_usage_and_quota_is_one_lookup(self, _mock_factory):
+        storage_usage.record_object("tasc-private", self.key, 1000, owner=self.instructor)
+
+        with self.assertNumQueries(2):  # membership -> organization, then its total
+            quota = storage_usage.quota_for(self.instructor)
+        self.assertEqual(quota["used_bytes"], 1000)
+        self.assertTrue(storage_usage.is_over_quota(self.instructor))
+
+        self.assertTrue(delete_spaces_object("tasc-private", self.key))
+
+        self.assertEqual(self._usage(StorageUsage.Scope.ORGANIZATION, self.org.id), 0)
+        self.assertFalse(StoredObject.objects.exists())
+        response = self.client.get(QUOTA_URL, **self.auth)
+        self.assertEqual(response.data["used_bytes"], 0)
+        self.assertEqual(response.data["total_bytes"], 1000)
+
+    def test_presign_is_refused_over_quota(self):
+        storage_usage.record_object("tasc-public", "course-thumbnails/full.png", 1500, owner=self.instructor)
+
+        response = self.client.post(
+            PRESIGN_URL,
+            {"prefix": "course-thumbnails", "filename": "a.png", "content_type": "image/png"},
+            format="json",
+            **self.auth,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_507_INSUFFICIENT_STORAGE)
+
+    def test_reconcile_pages_through_buckets_and_rebuilds_totals(self):
+        storage_usage.record_object("tasc-private", self.key, 100, owner=self.instructor)
+        storage_usage.record_object("tasc-public", "avatars/gone.png", 50, owner=self.instructor)
+        listing = {
+            ("tasc-private", "session-assets/"): [
+                [{"Key": self.key, "Size": 300}],
+                [{"Key": f"session-assets/course_{self.course.id}/session_2/x/new.pdf", "Size": 20}],
+            ],
+        }
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix, PaginationConfig):
+                return [{"Contents": page} for page in listing.get((Bucket, Prefix), [])]
+
+        client = type("Client", (), {"get_paginator": lambda self, name: Paginator()})()
+
+        counts = storage_usage.reconcile(client=client)
+
+        self.assertEqual(counts, {"scanned": 2, "added": 1, "resized": 1, "removed": 1})
+        self.assertEqual(self._usage(StorageUsage.Scope.COURSE, self.course.id), 320)
+        self.assertEqual(self._usage(StorageUsage.Scope.USER, self.instructor.id), 300)
+        self.assertEqual(self._usage(StorageUsage.Scope.PLATFORM, 0), 320)
+
+
 class SwaggerRedirectRoutingTests(APITestCase):
     def test_invalid_non_api_non_admin_path_redirects_to_documentation(self):
         response = self.client.get("/this-does-not-exist", follow=False)
@@ -313,3 +435,91 @@ class SwaggerRedirectRoutingTests(APITestCase):
             self.assertNotEqual(response.headers.get("Location"), "/documentation/")
         else:
             self.assertIn(response.status_code, {status.HTTP_404_NOT_FOUND, status.HTTP_200_OK})
+
+
+class TieredCacheTest(SimpleTestCase):
+    """The in-process tier serves reads until its TTL, and local writes are seen at once."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.common.cache import TieredCache
+
+        cache.clear()
+        self.tiered = TieredCache()
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    @override_settings(CACHE_L1_TTL=60)
+    def test_reads_served_locally_until_written(self):
+        from django.core.cache import cache
+
+        self.assertFalse(self.tiered.get("system:maintenance_mode", False))
+        # Another node flips the flag: this process keeps its copy until the TTL
+        cache.set("system:maintenance_mode", True)
+        self.assertFalse(self.tiered.get("system:maintenance_mode", False))
+
+        self.tiered.set("system:maintenance_mode", True)
+        self.assertTrue(self.tiered.get("system:maintenance_mode", False))
+        self.tiered.delete("system:maintenance_mode")
+        self.assertFalse(self.tiered.get("system:maintenance_mode", False))
+
+    @override_settings(CACHE_L1_TTL=0)
+    def test_expired_local_copy_rereads_shared_cache(self):
+        from django.core.cache import cache
+
+        self.assertIsNone(self.tiered.get("flag"))
+        cache.set("flag", "on")
+        self.assertEqual(self.tiered.get("flag"), "on")
+
+
+class ProviderHttpClientTest(SimpleTestCase):
+    """Pooled provider sessions, latency accounting and shared OAuth tokens."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_session_is_reused_per_provider(self):
+        from apps.common.http_client import get_session
+
+        self.assertIs(get_session("pesapal"), get_session("pesapal"))
+        self.assertIsNot(get_session("pesapal"), get_session("zoom"))
+
+    def test_calls_are_timed_per_provider(self):
+        from unittest.mock import MagicMock
+        from apps.common.http_client import ProviderClient, latency_stats
+
+        before = latency_stats().get("stats-test", {}).get("calls", 0)
+        with patch("requests.Session.request", return_value=MagicMock(status_code=200)) as request:
+            ProviderClient("stats-test").get("https://provider.test/ping")
+        self.assertEqual(request.call_args.kwargs["timeout"], 30)
+        self.assertEqual(latency_stats()["stats-test"]["calls"], before + 1)
+
+    @override_settings(PROVIDER_TOKEN_REFRESH_MARGIN=60)
+    def test_token_refreshed_before_expiry(self):
+        import time
+        from apps.common.http_client import TokenCache
+
+        issued = []
+
+        def fetch():
+            issued.append(f"token-{len(issued)}")
+            return issued[-1], 3600
+
+        tokens = TokenCache("test_token", fetch)
+        self.assertEqual(tokens.get(), "token-0")
+        # A second service instance shares the cached token
+        self.assertEqual(TokenCache("test_token", fetch).get(), "token-0")
+
+        with patch("apps.common.http_client.time.time", return_value=time.time() + 3550):
+            self.assertEqual(tokens.get(), "token-1")
+        self.assertEqual(len(issued), 2)
@@ -15,6 +15,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from . import storage_usage
 from .spaces import create_boto3_client
 from apps.accounts.rbac import is_course_writer
 from apps.catalogue.models import Course, Session, Assignment
@@ -97,6 +98,22 @@ class UploadPresignRequestSerializer(serializers.Serializer):
         return attrs
 
 
+class UploadConfirmRequestSerializer(serializers.Serializer):
+    bucket = serializers.CharField(max_length=255)
+    object_key = serializers.CharField(max_length=1024)
+
+    def validate(self, attrs):
+        buckets = {
+            getattr(settings, "DO_SPACES_PUBLIC_BUCKET", None),
+            getattr(settings, "DO_SPACES_PRIVATE_BUCKET", None),
+        } - {None, ""}
+        if attrs["bucket"] not in buckets:
+            raise serializers.ValidationError({"bucket": "Unknown bucket."})
+        if attrs["object_key"].split("/", 1)[0] not in ALLOWED_UPLOAD_PREFIXES:
+            raise serializers.ValidationError({"object_key": "Not an upload key."})
+        return attrs
+
+
 def _key_extension(filename, content_type):
     ext = Path(filename).suffix.lower().lstrip(".")
     if ext in ALLOWED_EXTENSIONS:
@@ -150,7 +167,7 @@ def health(request):
     tags=["Common"],
     summary="Create upload presigned URL",
     request=UploadPresignRequestSerializer,
-    responses={200: dict, 403: dict, 503: dict},
+    responses={200: dict, 403: dict, 503: dict, 507: dict},
     examples=[
         OpenApiExample(
             "Presign response (public image)",
@@ -187,6 +204,12 @@ class PresignUploadView(APIView):
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
+        if storage_usage.is_over_quota(request.user):
+            return Response(
+                {"detail": "Storage quota exceeded. Delete files before uploading more."},
+                status=status.HTTP_507_INSUFFICIENT_STORAGE,
+            )
+
         prefix = data["prefix"]
         is_session_assets = prefix == "session-assets"
         is_submission_files = prefix == "submission-files"
@@ -308,14 +331,71 @@ class PresignUploadView(APIView):
         return Response(response_data)
 
 
+@extend_schema(
+    tags=["Common"],
+    summary="Confirm an upload",
+    description=(
+        "Call after the presigned PUT succeeds. Records the object's size against "
+        "the uploader, its course and organization for storage quotas."
+    ),
+    request=UploadConfirmRequestSerializer,
+    responses={200: dict, 403: dict, 404: dict},
+)
+class ConfirmUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadConfirmRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        bucket = serializer.validated_data["bucket"]
+        key = serializer.validated_data["object_key"]
+
+        enrollment_match = storage_usage.SUBMISSION_FILE_KEY.match(key)
+        course_match = storage_usage.SESSION_ASSET_KEY.match(key)
+        if enrollment_match:
+            enrollment = get_object_or_404(Enrollment, pk=enrollment_match.group(1))
+            if enrollment.user_id != request.user.id:
+                return Response(
+                    {"detail": "You can only confirm submission files for your own enrollments."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+        elif course_match:
+            course = get_object_or_404(Course, pk=course_match.group(1))
+            if not _can_edit_course(request.user, course):
+                return Response(
+                    {"detail": "You do not have permission to upload assets for this course."},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+
+        try:
+            head = create_boto3_client().head_object(Bucket=bucket, Key=key)
+        except Exception:
+            logger.info("Upload confirm: %s/%s not found", bucket, key, exc_info=True)
+            return Response({"detail": "Object not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        stored = storage_usage.record_object(bucket, key, head.get("ContentLength", 0), owner=request.user)
+        return Response(
+            {
+                "bucket": bucket,
+                "object_key": key,
+                "size_bytes": stored.size_bytes,
+                **storage_usage.quota_for(request.user),
+            }
+        )
+
+
 @extend_schema(
     tags=["Common"],
     summary="Get storage quota",
-    description="Get storage usage for the current organization or platform",
+    description=(
+        "Get storage usage for the platform (LMS managers and TASC admins), "
+        "the user's organization, or the user"
+    ),
     responses={
         200: {
             'used_bytes': 5368709120,
-            'total_bytes': 10737418240
+            'total_bytes': 10737418240,
+            'scope': 'organization',
         }
     },
 )
@@ -323,52 +403,9 @@ class StorageQuotaView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        
-        user = request.user
-        role = getattr(user, 'role', None)
-        
-        DEFAULT_QUOTA_BYTES = 10 * 1024 * 1024 * 1024
-        
-        total_bytes = DEFAULT_QUOTA_BYTES
-        
-        used_bytes = 0
-        
-        if hasattr(settings, 'DO_SPACES_CDN_BASE_URL') and settings.DO_SPACES_CDN_BASE_URL:
-            try:
-                s3_client = create_boto3_client()
-                
-                prefix = ""
-                if role in [User.Role.INSTRUCTOR, User.Role.LMS_MANAGER, User.Role.TASC_ADMIN]:
-                    prefix = f"session-assets/course_"
-                elif role == User.Role.LEARNER:
-                    prefix = f"submission-files/"
-                
-                if prefix:
-                    buckets = []
-                    if getattr(settings, 'DO_SPACES_PUBLIC_BUCKET', None):
-                        buckets.append(settings.DO_SPACES_PUBLIC_BUCKET)
-                    if getattr(settings, 'DO_SPACES_PRIVATE_BUCKET', None):
-                        buckets.append(settings.DO_SPACES_PRIVATE_BUCKET)
-                    
-                    for bucket in buckets:
-                        try:
-                            response = s3_client.list_objects_v2(
-                                Bucket=bucket,
-                                Prefix=prefix,
-                                MaxKeys=1000
-                            )
-                            if 'Contents' in response:
-                                for obj in response['Contents']:
-                                    used_bytes += obj.get('Size', 0)
-                        except Exception as e:
-                            logger.warning(f"S3 storage calc failed for bucket {bucket}: {e}")
-
-            except Exception as e:
-                logger.warning(f"S3 storage calc failed: {e}")
-        
+        quota = storage_usage.quota_for(request.user)
         return Response({
-            "used_bytes": used_bytes,
-            "total_bytes": total_bytes
+            "used_bytes": quota["used_bytes"],
+            "total_bytes": quota["total_bytes"],
+            "scope": quota["scope"],
         })
@@ -2,7 +2,7 @@ from django.contrib import admin
 from .models import (
     Enrollment, SessionProgress, Certificate, Submission,
     QuizSubmission, QuizAnswer, Discussion, DiscussionReply,
-    Badge, UserBadge, SavedCourse, Report,
+    Badge, UserBadge, UserBadgeStats, SavedCourse, Report,
 )
 
 
@@ -66,6 +66,13 @@ class UserBadgeAdmin(admin.ModelAdmin):
     raw_id_fields = ('user', 'badge')
 
 
+@admin.register(UserBadgeStats)
+class UserBadgeStatsAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'enrollments_count', 'certificates_count', 'quiz_submissions_count', 'updated_at')
+    search_fields = ('user__email',)
+    raw_id_fields = ('user',)
+
+
 @admin.register(Report)
 class ReportAdmin(admin.ModelAdmin):
     list_display = ('id', 'name', 'report_type', 'status', 'generated_at')
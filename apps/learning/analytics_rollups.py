@@ -0,0 +1,304 @@
+"""
+Pre-aggregated numbers for the learning analytics dashboards.
+
+`CourseAnalyticsRollup` and `EnrollmentDailyRollup` are kept current with
+deltas from the Enrollment / QuizSubmission signals (`record_*`), and
+`rebuild_rollups()` recomputes every table from the raw rows on a Celery
+beat schedule, which also corrects drift from bulk ``update()`` calls that
+bypass signals. `LearnerActivityRollup` holds distinct learner counts and
+is only written by the rebuild.
+
+Dashboards read the rollups only while the last rebuild is recent enough
+(`is_fresh`); otherwise they fall back to aggregating the raw tables.
+"""
+import logging
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_LEARNER_WINDOW = timedelta(days=30)
+
+
+def _localdate(value):
+    return timezone.localdate(value) if value is not None else None
+
+
+def _apply(model, lookup, create_missing, **deltas):
+    """
+    Add ``deltas`` to the rollup row matching ``lookup`` in one UPDATE.
+
+    A missing row is only created for changes to rows that still exist;
+    deletes may be cascading from the course itself, whose rollup rows are
+    going away in the same transaction.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = model.objects.filter(**lookup).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated and create_missing:
+        model.objects.create(**lookup, **deltas)
+
+
+def _course_lookup(enrollment):
+    return {'course_id': enrollment.course_id, 'organization_id': enrollment.organization_id}
+
+
+def _status_counts(status):
+    from apps.learning.models import Enrollment
+
+    return {
+        'active_count': int(status == Enrollment.Status.ACTIVE),
+        'completed_count': int(status == Enrollment.Status.COMPLETED),
+    }
+
+
+def _is_completed(state):
+    from apps.learning.models import Enrollment
+
+    return state['status'] == Enrollment.Status.COMPLETED
+
+
+def record_enrollment_saved(enrollment, created, update_fields=None):
+    """Apply an Enrollment insert or update to the rollups."""
+    from apps.learning.models import CourseAnalyticsRollup, EnrollmentDailyRollup
+
+    new = {name: getattr(enrollment, name) for name in enrollment.ANALYTICS_FIELDS}
+    old = getattr(enrollment, '_analytics_state', None)
+
+    if created:
+        old = {'status': None, 'progress_percentage': Decimal('0'), 'completed_at': None}
+        _apply(
+            EnrollmentDailyRollup,
+            {'date': _localdate(enrollment.enrolled_at), **_course_lookup(enrollment)},
+            True,
+            enrollments=1,
+        )
+    elif old is None:
+        # Loaded with deferred fields; the next rebuild picks the change up.
+        return
+    elif update_fields is not None:
+        new = {
+            name: new[name] if name in update_fields else old[name]
+            for name in enrollment.ANALYTICS_FIELDS
+        }
+
+    new_counts, old_counts = _status_counts(new['status']), _status_counts(old['status'])
+    _apply(
+        CourseAnalyticsRollup,
+        _course_lookup(enrollment),
+        True,
+        enrollments_total=int(created),
+        active_count=new_counts['active_count'] - old_counts['active_count'],
+        completed_count=new_counts['completed_count'] - old_counts['completed_count'],
+        progress_sum=Decimal(new['progress_percentage'] or 0) - Decimal(old['progress_percentage'] or 0),
+    )
+
+    old_completion = _localdate(old['completed_at']) if _is_completed(old) else None
+    new_completion = _localdate(new['completed_at']) if _is_completed(new) else None
+    if old_completion != new_completion:
+        if old_completion is not None:
+            _apply(
+                EnrollmentDailyRollup,
+                {'date': old_completion, **_course_lookup(enrollment)},
+                False,
+                completions=-1,
+            )
+        if new_completion is not None:
+            _apply(
+                EnrollmentDailyRollup,
+                {'date': new_completion, **_course_lookup(enrollment)},
+                True,
+                completions=1,
+            )
+
+    enrollment._analytics_state = new
+
+
+def record_enrollments_created(course_id, organization_id, count, enrolled_at):
+    """Apply ``count`` new active enrollments inserted without signals (bulk_create)."""
+    from apps.learning.models import CourseAnalyticsRollup, EnrollmentDailyRollup
+
+    lookup = {'course_id': course_id, 'organization_id': organization_id}
+    _apply(
+        EnrollmentDailyRollup,
+        {'date': _localdate(enrolled_at), **lookup},
+        True,
+        enrollments=count,
+    )
+    _apply(CourseAnalyticsRollup, lookup, True, enrollments_total=count, active_count=count)
+
+
+def record_enrollment_deleted(enrollment):
+    """Remove a deleted Enrollment's contribution from the rollups."""
+    from apps.learning.models import CourseAnalyticsRollup, EnrollmentDailyRollup
+
+    counts = _status_counts(enrollment.status)
+    _apply(
+        CourseAnalyticsRollup,
+        _course_lookup(enrollment),
+        False,
+        enrollments_total=-1,
+        active_count=-counts['active_count'],
+        completed_count=-counts['completed_count'],
+        progress_sum=-Decimal(enrollment.progress_percentage or 0),
+    )
+    _apply(
+        EnrollmentDailyRollup,
+        {'date': _localdate(enrollment.enrolled_at), **_course_lookup(enrollment)},
+        False,
+        enrollments=-1,
+    )
+    if enrollment.status == enrollment.Status.COMPLETED and enrollment.completed_at:
+        _apply(
+            EnrollmentDailyRollup,
+            {'date': _localdate(enrollment.completed_at), **_course_lookup(enrollment)},
+            False,
+            completions=-1,
+        )
+
+
+def record_quiz_score(enrollment, score, sign=1):
+    """Add (``sign=1``) or remove (``sign=-1``) a scored quiz submission."""
+    from apps.learning.models import CourseAnalyticsRollup
+
+    _apply(
+        CourseAnalyticsRollup,
+        _course_lookup(enrollment),
+        sign > 0,
+        quiz_scored_count=sign,
+        quiz_score_sum=sign * Decimal(score),
+    )
+
+
+# ── Rebuild ───────────────────────────────────────────────────
+
+def rebuild_rollups():
+    """Recompute every rollup table from Enrollment and QuizSubmission."""
+    from apps.learning.models import (
+        CourseAnalyticsRollup,
+        Enrollment,
+        EnrollmentDailyRollup,
+        LearnerActivityRollup,
+        QuizSubmission,
+    )
+
+    now = timezone.now()
+    active_since = now - ACTIVE_LEARNER_WINDOW
+    batch_size = settings.ANALYTICS_ROLLUP_BATCH_SIZE
+
+    with transaction.atomic():
+        courses = {
+            (row['course_id'], row['organization_id']): CourseAnalyticsRollup(**row)
+            for row in Enrollment.objects.order_by()
+            .values('course_id', 'organization_id')
+            .annotate(
+                enrollments_total=Count('id'),
+                active_count=Count('id', filter=Q(status=Enrollment.Status.ACTIVE)),
+                completed_count=Count('id', filter=Q(status=Enrollment.Status.COMPLETED)),
+                progress_sum=Sum('progress_percentage', default=Decimal('0')),
+            )
+        }
+        quiz_rows = (
+            QuizSubmission.objects.filter(score__isnull=False)
+            .order_by()
+            .values('enrollment__course_id', 'enrollment__organization_id')
+            .annotate(scored=Count('id'), score_sum=Sum('score'))
+        )
+        for row in quiz_rows:
+            key = (row['enrollment__course_id'], row['enrollment__organization_id'])
+            rollup = courses.setdefault(
+                key, CourseAnalyticsRollup(course_id=key[0], organization_id=key[1])
+            )
+            rollup.quiz_scored_count = row['scored']
+            rollup.quiz_score_sum = row['score_sum']
+
+        daily = {}
+        enrolled = (
+            Enrollment.objects.order_by()
+            .annotate(day=TruncDate('enrolled_at'))
+            .values('day', 'course_id', 'organization_id')
+            .annotate(count=Count('id'))
+        )
+        completed = (
+            Enrollment.objects.filter(
+                status=Enrollment.Status.COMPLETED, completed_at__isnull=False
+            )
+            .order_by()
+            .annotate(day=TruncDate('completed_at'))
+            .values('day', 'course_id', 'organization_id')
+            .annotate(count=Count('id'))
+        )
+        for rows, field in ((enrolled, 'enrollments'), (completed, 'completions')):
+            for row in rows:
+                key = (row['day'], row['course_id'], row['organization_id'])
+                rollup = daily.setdefault(
+                    key,
+                    EnrollmentDailyRollup(
+                        date=key[0], course_id=key[1], organization_id=key[2]
+                    ),
+                )
+                setattr(rollup, field, row['count'])
+
+        learner_counts = dict(
+            total_learners=Count('user', distinct=True),
+            active_learners=Count(
+                'user', distinct=True, filter=Q(last_accessed_at__gte=active_since)
+            ),
+        )
+        learners = [
+            LearnerActivityRollup(refreshed_at=now, **row)
+            for row in Enrollment.objects.filter(organization__isnull=False)
+            .order_by()
+            .values('organization_id')
+            .annotate(**learner_counts)
+        ]
+        learners.append(
+            LearnerActivityRollup(
+                organization=None,
+                refreshed_at=now,
+                **Enrollment.objects.aggregate(**learner_counts),
+            )
+        )
+
+        CourseAnalyticsRollup.objects.all().delete()
+        EnrollmentDailyRollup.objects.all().delete()
+        LearnerActivityRollup.objects.all().delete()
+        CourseAnalyticsRollup.objects.bulk_create(courses.values(), batch_size=batch_size)
+        EnrollmentDailyRollup.objects.bulk_create(daily.values(), batch_size=batch_size)
+        LearnerActivityRollup.objects.bulk_create(learners, batch_size=batch_size)
+
+    logger.info(
+        'Rebuilt analytics rollups: %d course rows, %d daily rows, %d learner rows',
+        len(courses), len(daily), len(learners),
+    )
+    return {'courses': len(courses), 'daily': len(daily), 'learners': len(learners)}
+
+
+# ── Reading ───────────────────────────────────────────────────
+
+def refreshed_at():
+    """When the rollups were last rebuilt, or None if they never were."""
+    from apps.learning.models import LearnerActivityRollup
+
+    return (
+        LearnerActivityRollup.objects.filter(organization__isnull=True)
+        .values_list('refreshed_at', flat=True)
+        .first()
+    )
+
+
+def is_fresh(max_age):
+    """True if the last rebuild happened within ``max_age`` seconds."""
+    if max_age <= 0:
+        return False
+    last = refreshed_at()
+    return last is not None and timezone.now() - last <= timedelta(seconds=max_age)
@@ -1,22 +1,95 @@
 """
 Badge evaluation engine.
 
-Central function `check_and_award_badges(user, criteria_types=None)` queries
-the user's stats, compares against Badge thresholds, and bulk-creates any
-newly earned UserBadge records.
+Per-user counters live in `UserBadgeStats` and are kept current with deltas
+from the learning signals (`increment_stats`, `record_quiz_result`, ...).
+`check_and_award_badges(user, criteria_types=None)` compares those counters
+against an in-memory index of Badge thresholds and bulk-creates any newly
+earned UserBadge records.
+
+Signals never evaluate inline: they call `queue_badge_evaluation`, which
+collects users per transaction and hands them to the `evaluate_badges`
+Celery task once the transaction commits.
 """
 import logging
-from django.db.models import Q
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.common.async_tasks import enqueue_task
 
 logger = logging.getLogger(__name__)
 
+# Criteria backed by a UserBadgeStats column of the same name.
+COUNTER_FIELDS = (
+    'enrollments_count',
+    'certificates_count',
+    'quiz_submissions_count',
+    'quiz_perfect_score',
+    'quiz_pass_streak',
+    'assignment_full_marks',
+    'discussions_count',
+    'reviews_count',
+    'subscriptions_count',
+)
+
+# Criteria that read another criteria's counter.
+CRITERIA_ALIASES = {
+    'first_certificate': 'certificates_count',
+}
+
+_index_lock = threading.Lock()
+_badge_index = None
+_badge_index_loaded_at = 0.0
+
+_pending = threading.local()
+
+
+def get_badge_index():
+    """
+    Return ``{criteria_type: [Badge, ...]}`` with badges sorted by threshold.
+
+    The index is held in process memory for BADGE_INDEX_TTL_SECONDS and
+    dropped early by `invalidate_badge_index` when a Badge changes.
+    """
+    global _badge_index, _badge_index_loaded_at
+    from apps.learning.models import Badge
+
+    ttl = getattr(settings, 'BADGE_INDEX_TTL_SECONDS', 300)
+    index = _badge_index
+    if index is not None and time.monotonic() - _badge_index_loaded_at < ttl:
+        return index
+
+    with _index_lock:
+        if _badge_index is not None and time.monotonic() - _badge_index_loaded_at < ttl:
+            return _badge_index
+        index = {}
+        for badge in Badge.objects.order_by('criteria_value', 'id'):
+            index.setdefault(badge.criteria_type, []).append(badge)
+        _badge_index = index
+        _badge_index_loaded_at = time.monotonic()
+        return index
+
+
+def invalidate_badge_index():
+    global _badge_index
+    with _index_lock:
+        _badge_index = None
+
 
 def _get_user_stat(user, criteria_type):
     """
-    Return the current numeric value for a given criteria_type.
+    Compute the current value for a criteria_type from the user's history.
+
+    Used to seed UserBadgeStats and for criteria that aren't materialized
+    (profile_complete, login_streak).
     """
     from apps.learning.models import (
-        Enrollment, Certificate, QuizSubmission, QuizAnswer,
+        Enrollment, Certificate, QuizSubmission,
         Discussion, Submission,
     )
     from apps.catalogue.models import CourseReview
@@ -32,16 +105,16 @@ def _get_user_stat(user, criteria_type):
 
     elif criteria_type == 'quiz_perfect_score':
         # Check if any quiz submission scored full marks (score == max_score)
-        from django.db.models import F
         perfect = QuizSubmission.objects.filter(
             enrollment__user=user
         ).filter(score=F('max_score'), max_score__gt=0).exists()
         return 1 if perfect else 0
 
     elif criteria_type == 'quiz_pass_streak':
-        # Count consecutive passed quizzes (most recent first)
+        # Count consecutive passed quizzes (most recent first), ignoring
+        # submissions that haven't been scored yet
         submissions = QuizSubmission.objects.filter(
-            enrollment__user=user
+            enrollment__user=user, score__isnull=False,
         ).order_by('-submitted_at').values_list('passed', flat=True)
         streak = 0
         for passed in submissions:
@@ -56,12 +129,10 @@ def _get_user_stat(user, criteria_type):
         full_marks = Submission.objects.filter(
             enrollment__user=user,
             status='graded',
-        ).select_related('assignment').all()
-        for sub in full_marks:
-            if sub.assignment and sub.score is not None:
-                if sub.score >= sub.assignment.max_points:
-                    return 1
-        return 0
+            grade__isnull=False,
+            grade__gte=F('assignment__max_points'),
+        ).exists()
+        return 1 if full_marks else 0
 
     elif criteria_type == 'discussions_count':
         return Discussion.objects.filter(user=user).count()
@@ -86,7 +157,6 @@ def _get_user_stat(user, criteria_type):
     elif criteria_type == 'login_streak':
         try:
             from apps.accounts.models import UserSession
-            from django.utils import timezone
             from datetime import timedelta
 
             dates = list(
@@ -115,6 +185,104 @@ def _get_user_stat(user, criteria_type):
     return 0
 
 
+# ── Materialized counters ─────────────────────────────────────
+
+def get_user_stats(user_id):
+    """Return the user's UserBadgeStats row, seeding it from history if missing."""
+    from apps.learning.models import UserBadgeStats
+
+    stats = UserBadgeStats.objects.filter(user_id=user_id).first()
+    if stats is None:
+        stats = _seed_user_stats(user_id)
+    return stats
+
+
+def _seed_user_stats(user_id):
+    from apps.learning.models import UserBadgeStats
+
+    values = {field: _get_user_stat(user_id, field) for field in COUNTER_FIELDS}
+    stats, _ = UserBadgeStats.objects.get_or_create(user_id=user_id, defaults=values)
+    return stats
+
+
+def _update_stats(user_id, seed=True, **expressions):
+    """
+    Apply counter expressions in a single UPDATE.
+
+    Signals run after the triggering row is written, so a user without a
+    stats row is seeded from history instead — that already includes the
+    change and must not have the delta applied on top. Returns True when
+    the row was seeded, so callers can skip follow-up deltas for the same
+    change.
+    """
+    from apps.learning.models import UserBadgeStats
+
+    updated = UserBadgeStats.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(), **expressions
+    )
+    if not updated and seed:
+        _seed_user_stats(user_id)
+        return True
+    return False
+
+
+def increment_stats(user_id, **deltas):
+    """
+    Add (or, with negative values, subtract) deltas to the user's counters.
+
+    Returns True when the row was seeded from history instead.
+    """
+    # Decrements never seed a row: they also fire while a user is being
+    # deleted, and a missing row is rebuilt from history when next needed.
+    return _update_stats(
+        user_id,
+        seed=any(delta > 0 for delta in deltas.values()),
+        **{field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()},
+    )
+
+
+def increment_stats_many(user_ids, **deltas):
+    """`increment_stats` for many users in one UPDATE; users without stats are seeded."""
+    from apps.learning.models import UserBadgeStats
+
+    user_ids = set(user_ids)
+    stats = UserBadgeStats.objects.filter(user_id__in=user_ids)
+    missing = user_ids - set(stats.values_list('user_id', flat=True))
+    stats.update(
+        updated_at=timezone.now(),
+        **{field: Greatest(F(field) + delta, Value(0)) for field, delta in deltas.items()},
+    )
+    for user_id in missing:
+        _seed_user_stats(user_id)
+
+
+def record_quiz_result(user_id, passed, perfect):
+    expressions = {
+        'quiz_pass_streak': F('quiz_pass_streak') + 1 if passed else Value(0),
+    }
+    if perfect:
+        expressions['quiz_perfect_score'] = Value(1)
+    _update_stats(user_id, **expressions)
+
+
+def record_full_marks(user_id):
+    _update_stats(user_id, assignment_full_marks=Value(1))
+
+
+def record_full_marks_many(user_ids):
+    """`record_full_marks` for many users in one UPDATE; users without stats are seeded."""
+    from apps.learning.models import UserBadgeStats
+
+    user_ids = set(user_ids)
+    stats = UserBadgeStats.objects.filter(user_id__in=user_ids)
+    missing = user_ids - set(stats.values_list('user_id', flat=True))
+    stats.update(updated_at=timezone.now(), assignment_full_marks=Value(1))
+    for user_id in missing:
+        _seed_user_stats(user_id)
+
+
+# ── Evaluation ────────────────────────────────────────────────
+
 def check_and_award_badges(user, criteria_types=None):
     """
     Evaluate badge criteria for a user and award any newly earned badges.
@@ -127,35 +295,43 @@ def check_and_award_badges(user, criteria_types=None):
     Returns:
         List of newly created UserBadge instances.
     """
-    from apps.learning.models import Badge, UserBadge
+    from apps.learning.models import UserBadge
 
-    # Get badges to evaluate
-    badges_qs = Badge.objects.all()
+    index = get_badge_index()
     if criteria_types:
-        badges_qs = badges_qs.filter(criteria_type__in=criteria_types)
+        criteria = [ct for ct in dict.fromkeys(criteria_types) if ct in index]
+    else:
+        criteria = list(index)
+    if not criteria:
+        return []
 
     # Get already earned badge IDs for this user
     already_earned = set(
         UserBadge.objects.filter(user=user).values_list('badge_id', flat=True)
     )
 
-    # Evaluate each badge
     newly_earned = []
-    # Cache stats per criteria_type to avoid redundant queries
+    stats = None
     stat_cache = {}
 
-    for badge in badges_qs:
-        if badge.id in already_earned:
-            continue
+    for ct in criteria:
+        for badge in index[ct]:
+            if badge.id in already_earned:
+                continue
 
-        ct = badge.criteria_type
-        if ct not in stat_cache:
-            stat_cache[ct] = _get_user_stat(user, ct)
+            if ct not in stat_cache:
+                field = CRITERIA_ALIASES.get(ct, ct)
+                if field in COUNTER_FIELDS:
+                    if stats is None:
+                        stats = get_user_stats(user.id)
+                    stat_cache[ct] = getattr(stats, field)
+                else:
+                    stat_cache[ct] = _get_user_stat(user, ct)
 
-        if stat_cache[ct] >= badge.criteria_value:
-            newly_earned.append(
-                UserBadge(user=user, badge=badge)
-            )
+            # Badges are sorted by threshold, so the rest are out of reach too
+            if stat_cache[ct] < badge.criteria_value:
+                break
+            newly_earned.append(UserBadge(user=user, badge=badge))
 
     # Bulk create, ignoring any race-condition duplicates
     if newly_earned:
@@ -167,6 +343,7 @@ def check_and_award_badges(user, criteria_types=None):
 
         # Create in-app notifications for each earned badge
         try:
+            from apps.notifications.fanout import create_notifications
             from apps.notifications.models import Notification
             notifications = []
             for ub in newly_earned:
@@ -180,11 +357,69 @@ def check_and_award_badges(user, criteria_types=None):
                         link="/learner/badges",
                     )
                 )
-            if notifications:
-                Notification.objects.bulk_create(notifications, ignore_conflicts=True)
+            create_notifications(notifications)
         except Exception as e:
             logger.warning(f"Failed to create badge notifications for user {user.id}: {e}")
 
         return newly_earned
 
     return []
+
+
+def evaluate_badge_batch(batch):
+    """
+    Evaluate a batch of ``[user_id, criteria_types]`` pairs.
+
+    Users are loaded in one query; a failure for one user doesn't stop the rest.
+    """
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    users = User.objects.in_bulk([user_id for user_id, _ in batch])
+    awarded = 0
+    for user_id, criteria_types in batch:
+        user = users.get(user_id)
+        if user is None:
+            continue
+        try:
+            awarded += len(check_and_award_badges(user, criteria_types=criteria_types))
+        except Exception as e:
+            logger.warning(f"Badge evaluation error for user {user_id}: {e}")
+    return awarded
+
+
+# ── Queueing ──────────────────────────────────────────────────
+
+def _pending_evaluations():
+    if not hasattr(_pending, 'evaluations'):
+        _pending.evaluations = {}
+    return _pending.evaluations
+
+
+def queue_badge_evaluation(user_id, criteria_types):
+    """
+    Schedule badge evaluation for a user after the current transaction commits.
+
+    Criteria with no matching Badge are dropped up front. Every user queued
+    in the same transaction goes out in a single `evaluate_badges` task.
+    """
+    from django.db import transaction
+
+    index = get_badge_index()
+    criteria = [ct for ct in criteria_types if ct in index]
+    if not criteria:
+        return
+
+    _pending_evaluations().setdefault(user_id, set()).update(criteria)
+    transaction.on_commit(_flush_badge_evaluations)
+
+
+def _flush_badge_evaluations():
+    pending = _pending_evaluations()
+    if not pending:
+        return
+    batch = [[user_id, sorted(criteria)] for user_id, criteria in pending.items()]
+    pending.clear()
+
+    from apps.learning.tasks import evaluate_badges
+    enqueue_task(evaluate_badges, batch)
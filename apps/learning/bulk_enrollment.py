@@ -0,0 +1,314 @@
+"""
+Bulk enrollment.
+
+`start_bulk_enrollment` checks the requester's scope and the organization's
+seat usage once, stores the target on a BulkEnrollmentJob and queues
+`apps.learning.tasks.run_bulk_enrollment`; the request returns 202 with the
+job, and clients poll it (`job_payload`) for progress.
+
+The target is a list of user ids, or every active member of an organization
+or one of its departments. `run_enrollment` streams it in batches of
+``BULK_ENROLLMENT_BATCH_SIZE``: each batch checks membership and existing
+enrollments with one query each and inserts the rest with ``bulk_create``
+(rechecking and retrying if a concurrent enrollment conflicts, so only rows
+this job inserted are counted as enrolled).
+``bulk_create`` sends no post_save, so the per-row enrollment signals are
+replaced by one `apply_bulk_enrollment_side_effects` task for the whole
+job (see `enrollments_created`): one badge counter UPDATE and evaluation
+task, one rollup delta, and a bulk insert of "enrolled" notifications.
+"""
+import logging
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.accounts.models import Membership
+from apps.accounts.rbac import get_active_membership_organization, is_admin_like
+from apps.catalogue.models import Course
+from apps.common.async_tasks import enqueue_task, enqueue_task_on_commit
+
+from .models import BulkEnrollmentJob, Enrollment
+from .serializers import BulkEnrollmentSerializer
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# Errors kept on the job; the failed counter covers the rest
+MAX_STORED_ERRORS = 1000
+
+
+def start_bulk_enrollment(request):
+    """Validate a bulk enrollment request and queue its job. Returns the response for the view."""
+    user = request.user
+    if is_admin_like(user):
+        scoped_organization = None
+    elif getattr(user, "role", None) == User.Role.ORG_ADMIN:
+        scoped_organization = get_active_membership_organization(user)
+        if scoped_organization is None:
+            return Response(
+                {"error": "You are not an administrator of an active organization."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+    else:
+        return Response(
+            {"error": "Only LMS Managers and Org Admins can bulk enroll users."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    serializer = BulkEnrollmentSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    data = serializer.validated_data
+    # Org admins always enroll within their own organization
+    organization = scoped_organization or data.get("organization")
+    user_ids = list(dict.fromkeys(data.get("user_ids") or []))
+    department = (data.get("department") or "").strip()
+
+    if not user_ids and organization is None:
+        return Response(
+            {"error": "Provide user_ids or an organization to enroll."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if department and organization is None:
+        return Response(
+            {"error": "A department can only be enrolled within an organization."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if organization is not None and organization.max_seats:
+        from apps.accounts.seat_usage import get_seat_usage
+
+        # Only existing members are enrolled, so no seats are taken here;
+        # an organization already over its limit can't enroll anyone
+        usage = get_seat_usage(organization)
+        if usage.members > organization.max_seats:
+            return Response(
+                {
+                    "error": "Organization is over its seat limit.",
+                    "members": usage.members,
+                    "max_seats": organization.max_seats,
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+
+    from .tasks import run_bulk_enrollment
+
+    job = BulkEnrollmentJob.objects.create(
+        created_by=user,
+        course=data["course"],
+        organization=organization,
+        user_ids=user_ids,
+        department=department,
+    )
+    enqueue_task_on_commit(run_bulk_enrollment, job.pk)
+    return Response(job_payload(job), status=status.HTTP_202_ACCEPTED)
+
+
+def job_payload(job):
+    return {
+        "job_id": job.pk,
+        "status": job.status,
+        "course": job.course_id,
+        "organization": job.organization_id,
+        "total": job.total,
+        "processed": job.processed,
+        "enrolled": job.enrolled,
+        "already_enrolled": job.already_enrolled,
+        "failed": job.failed,
+        "errors": job.errors[:100],
+        "created_at": job.created_at,
+        "finished_at": job.finished_at,
+    }
+
+
+def job_response(request, job_id):
+    """Progress of a bulk enrollment started by the requester (any job for LMS managers and TASC admins)."""
+    jobs = BulkEnrollmentJob.objects.all()
+    if not is_admin_like(request.user):
+        jobs = jobs.filter(created_by=request.user)
+    job = jobs.filter(pk=job_id).first()
+    if job is None:
+        return Response({"detail": "Bulk enrollment not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(job_payload(job))
+
+
+def _targets(job):
+    """Return ``(total, user id iterator)`` for the job's target."""
+    if job.user_ids:
+        return len(job.user_ids), iter(job.user_ids)
+    members = Membership.objects.filter(
+        organization_id=job.organization_id, is_active=True, user__is_active=True
+    )
+    if job.department:
+        members = members.filter(department__iexact=job.department)
+    user_ids = (
+        members.order_by("user_id")
+        .values_list("user_id", flat=True)
+        .iterator(chunk_size=settings.BULK_ENROLLMENT_BATCH_SIZE)
+    )
+    return members.count(), user_ids
+
+
+def _eligible(job, user_ids):
+    """The ids in ``user_ids`` that may be enrolled by ``job``."""
+    if not job.user_ids:
+        # Already drawn from the organization's active members
+        return set(user_ids)
+    if job.organization_id:
+        return set(
+            Membership.objects.filter(
+                organization_id=job.organization_id,
+                is_active=True,
+                user__is_active=True,
+                user_id__in=user_ids,
+            ).values_list("user_id", flat=True)
+        )
+    return set(User.objects.filter(pk__in=user_ids, is_active=True).values_list("pk", flat=True))
+
+
+def _enrolled_user_ids(job, user_ids):
+    return set(
+        Enrollment.objects.filter(course_id=job.course_id, user_id__in=user_ids).values_list(
+            "user_id", flat=True
+        )
+    )
+
+
+def _enroll_batch(job, user_ids):
+    """Enroll one batch. Returns (created user ids, already enrolled count, errors)."""
+    eligible = _eligible(job, user_ids)
+    error = (
+        "User not found or not an active member of the organization"
+        if job.organization_id
+        else "User not found or inactive"
+    )
+    errors = [{"user_id": user_id, "error": error} for user_id in user_ids if user_id not in eligible]
+
+    with transaction.atomic():
+        existing, conflict = None, None
+        while True:
+            already = _enrolled_user_ids(job, eligible)
+            if conflict is not None and already == existing:
+                # Nothing new was enrolled, so the conflict wasn't a concurrent enrollment
+                raise conflict
+            existing = already
+            created = [user_id for user_id in user_ids if user_id in eligible and user_id not in existing]
+            try:
+                with transaction.atomic():
+                    Enrollment.objects.bulk_create(
+                        [
+                            Enrollment(
+                                user_id=user_id,
+                                course_id=job.course_id,
+                                organization_id=job.organization_id,
+                                paid_amount=0,
+                                currency="USD",
+                            )
+                            for user_id in created
+                        ],
+                        batch_size=settings.BULK_ENROLLMENT_BATCH_SIZE,
+                    )
+            except IntegrityError as e:
+                # Someone enrolled part of this batch meanwhile: recheck and insert the rest
+                conflict = e
+                continue
+            break
+    return created, len(existing), errors
+
+
+def run_enrollment(job):
+    """Enroll the job's target batch by batch, recording progress, then queue the side effects."""
+    started_at = timezone.now()
+    BulkEnrollmentJob.objects.filter(pk=job.pk).update(
+        status=BulkEnrollmentJob.Status.RUNNING, started_at=started_at
+    )
+    counts = {"processed": 0, "enrolled": 0, "already_enrolled": 0, "failed": 0}
+    errors = []
+    created_ids = []
+
+    try:
+        total, user_ids = _targets(job)
+        BulkEnrollmentJob.objects.filter(pk=job.pk).update(total=total)
+        while batch := list(islice(user_ids, settings.BULK_ENROLLMENT_BATCH_SIZE)):
+            created, already_enrolled, batch_errors = _enroll_batch(job, batch)
+            created_ids.extend(created)
+            counts["processed"] += len(batch)
+            counts["enrolled"] += len(created)
+            counts["already_enrolled"] += already_enrolled
+            counts["failed"] += len(batch_errors)
+            errors.extend(batch_errors[: MAX_STORED_ERRORS - len(errors)])
+            BulkEnrollmentJob.objects.filter(pk=job.pk).update(errors=errors, **counts)
+    except Exception as e:
+        logger.exception("Bulk enrollment %s failed", job.pk)
+        errors.append({"user_id": None, "error": f"Bulk enrollment failed: {str(e)}"})
+        final_status = BulkEnrollmentJob.Status.FAILED
+    else:
+        final_status = BulkEnrollmentJob.Status.COMPLETED
+
+    if created_ids:
+        from .tasks import apply_bulk_enrollment_side_effects
+
+        enqueue_task(
+            apply_bulk_enrollment_side_effects,
+            job.course_id,
+            job.organization_id,
+            created_ids,
+            started_at.isoformat(),
+        )
+
+    BulkEnrollmentJob.objects.filter(pk=job.pk).update(
+        status=final_status, finished_at=timezone.now(), errors=errors, **counts
+    )
+    logger.info(
+        "Bulk enrollment %s: %s processed, %s enrolled, %s already enrolled, %s failed",
+        job.pk, counts["processed"], counts["enrolled"], counts["already_enrolled"], counts["failed"],
+    )
+    return counts
+
+
+def enrollments_created(course_id, organization_id, user_ids, enrolled_at):
+    """
+    What the Enrollment post_save signals do for one insert, for a batch of
+    enrollments of ``user_ids`` in one course created by ``bulk_create``.
+    """
+    from apps.learning import analytics_rollups, badge_engine
+    from apps.notifications.fanout import fan_out
+    from apps.notifications.models import Notification
+
+    course = Course.objects.filter(pk=course_id).only("id", "title").first()
+    if course is None:
+        return
+
+    try:
+        with transaction.atomic():
+            badge_engine.increment_stats_many(user_ids, enrollments_count=1)
+            # Every user queued here goes out in one evaluate_badges task
+            for user_id in user_ids:
+                badge_engine.queue_badge_evaluation(user_id, ["enrollments_count"])
+    except Exception as e:
+        logger.warning(f"Badge bookkeeping error: {e}")
+
+    try:
+        with transaction.atomic():
+            analytics_rollups.record_enrollments_created(
+                course_id, organization_id, len(user_ids), parse_datetime(enrolled_at)
+            )
+    except Exception as e:
+        logger.warning(f"Failed to update analytics rollups for bulk enrollment: {e}")
+
+    try:
+        fan_out(
+            user_ids,
+            type=Notification.Type.SYSTEM,
+            title="Enrolled in course",
+            description=f"You have been enrolled in \"{course.title}\".",
+            link=f"/learner/courses/{course_id}",
+        )
+    except Exception as e:
+        logger.warning(f"Failed to create bulk enrollment notifications: {e}")
@@ -0,0 +1,135 @@
+"""
+Public certificate verification.
+
+Every verification link carries an HMAC of the certificate number
+(``sig``, see `verification_url`), so a forged or mistyped link is
+rejected by `signature_matches` without touching the cache or database.
+Genuine numbers are answered from a read-through cache of compact
+payloads (`lookup`): misses for any number of certificates are filled with
+one query on the unique ``certificate_number`` index, unknown numbers are
+cached too, and `apps.learning.signals` drops a certificate's entry
+whenever it is saved or deleted (e.g. ``is_valid``, status, regenerate or
+expiry changes). Code that changes certificates with ``update()`` must
+call `invalidate` itself.
+
+Expiry is worked out from ``expiry_date`` when a payload is read, so a
+cached entry never outlives the certificate's validity.
+"""
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+CACHE_PREFIX = "certificate_verify"
+SIGNING_SALT = "apps.learning.certificate_verification"
+
+# Cached for numbers that match no certificate
+NOT_FOUND = {}
+
+
+def _key(certificate_number):
+    return f"{CACHE_PREFIX}:{certificate_number}"
+
+
+def _signer():
+    return signing.Signer(key=settings.CERTIFICATE_SIGNING_KEY or None, salt=SIGNING_SALT)
+
+
+def sign(certificate_number):
+    """The verification token (``sig``) for a certificate number."""
+    return _signer().signature(certificate_number)
+
+
+def signature_matches(certificate_number, sig):
+    return constant_time_compare(sign(certificate_number), sig or "")
+
+
+def verification_url(certificate_number):
+    return (
+        f"{settings.FRONTEND_URL}/verify-certificate"
+        f"?number={certificate_number}&sig={sign(certificate_number)}"
+    )
+
+
+def _fetch(numbers):
+    """Return ``{certificate_number: payload}`` from the database for ``numbers``."""
+    from .models import Certificate
+
+    rows = Certificate.objects.filter(certificate_number__in=numbers).values(
+        "certificate_number",
+        "issued_at",
+        "expiry_date",
+        "is_valid",
+        "status",
+        "pdf_url",
+        "verification_url",
+        "enrollment__user__first_name",
+        "enrollment__user__last_name",
+        "enrollment__user__email",
+        "enrollment__course__title",
+    )
+    payloads = {}
+    for row in rows:
+        full_name = f"{row['enrollment__user__first_name']} {row['enrollment__user__last_name']}".strip()
+        payloads[row["certificate_number"]] = {
+            "certificate_number": row["certificate_number"],
+            "user_name": full_name or row["enrollment__user__email"],
+            "course_title": row["enrollment__course__title"],
+            "issued_at": row["issued_at"],
+            "expiry_date": row["expiry_date"],
+            "is_valid": row["is_valid"],
+            "status": row["status"],
+            "pdf_url": row["pdf_url"],
+            "verification_url": row["verification_url"],
+        }
+    return payloads
+
+
+def _with_expiry(payload):
+    from .models import Certificate
+
+    expiry_date = payload["expiry_date"]
+    is_expired = bool(expiry_date and timezone.now() > expiry_date)
+    return {
+        **payload,
+        "is_expired": is_expired,
+        "verified": (
+            payload["is_valid"]
+            and payload["status"] == Certificate.Status.APPROVED
+            and not is_expired
+        ),
+    }
+
+
+def lookup(numbers):
+    """
+    Return ``{certificate_number: payload}`` for the certificates among
+    ``numbers`` that exist, reading through the cache.
+    """
+    numbers = list(dict.fromkeys(numbers))
+    keys = {number: _key(number) for number in numbers}
+    found = cache.get_many(keys.values())
+    payloads = {number: found[key] for number, key in keys.items() if key in found}
+
+    missing = [number for number in numbers if number not in payloads]
+    if missing:
+        fetched = _fetch(missing)
+        cache.set_many(
+            {keys[number]: fetched.get(number, NOT_FOUND) for number in missing},
+            settings.CERTIFICATE_VERIFY_CACHE_TTL,
+        )
+        payloads.update({number: fetched.get(number, NOT_FOUND) for number in missing})
+
+    return {number: _with_expiry(payload) for number, payload in payloads.items() if payload}
+
+
+def invalidate(certificate_numbers):
+    """Drop cached payloads now and again once the transaction commits."""
+    keys = [_key(number) for number in certificate_numbers]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,144 @@
+"""
+Bulk grading.
+
+`bulk_grade` loads every targeted submission in one locked query, checks
+each item in memory (in request order, so a repeated submission_id fails
+as already graded), writes the grades with one ``bulk_update`` and then
+runs `submissions_graded` once for the whole batch. ``bulk_update`` sends
+no post_save, so the per-row badge signal is replaced by that batched
+step: one full-marks UPDATE, one badge evaluation task, and one bulk
+insert of "graded" notifications.
+"""
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import Submission
+from .serializers import GradeSubmissionSerializer
+
+logger = logging.getLogger(__name__)
+
+GRADED_FIELDS = ["grade", "feedback", "status", "graded_at", "graded_by"]
+
+# The single-grade endpoint's grade field, so both paths accept the same values
+GRADE_FIELD = GradeSubmissionSerializer().fields["grade"]
+
+
+def _error(submission_id, message):
+    return {"submission_id": submission_id, "status": "error", "error": message}
+
+
+def _submission_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_grade(grade, max_points):
+    """Return ``(grade, error)`` for a submitted grade value."""
+    try:
+        grade = GRADE_FIELD.run_validation(grade)
+    except serializers.ValidationError:
+        grade = None
+    if grade is None or grade > max_points:
+        return None, f"Grade must be between 0 and {max_points}."
+    return grade, None
+
+
+def bulk_grade(queryset, items, grader):
+    """
+    Grade ``items`` (dicts with submission_id, grade and optional feedback)
+    among the submissions in ``queryset``. Returns ``(graded_count, results)``
+    with one result per item, in order.
+    """
+    pks = {pk for pk in (_submission_pk(item.get("submission_id")) for item in items) if pk}
+    results = []
+    graded = {}
+    now = timezone.now()
+
+    with transaction.atomic():
+        submissions = (
+            queryset.select_related("enrollment", "assignment", "assignment__session")
+            .select_for_update(of=("self",))
+            .in_bulk(pks)
+        )
+        for item in items:
+            submission_id = item.get("submission_id")
+            grade = item.get("grade")
+            if not submission_id or grade is None:
+                results.append(_error(submission_id, "submission_id and grade are required"))
+                continue
+
+            submission = submissions.get(_submission_pk(submission_id))
+            if submission is None:
+                results.append(_error(submission_id, "Submission not found"))
+                continue
+            if submission.status != Submission.Status.SUBMITTED:
+                results.append(_error(submission_id, "Only submitted submissions can be graded"))
+                continue
+            grade, message = _parse_grade(grade, submission.assignment.max_points)
+            if message:
+                results.append(_error(submission_id, message))
+                continue
+
+            submission.grade = grade
+            submission.feedback = item.get("feedback", "")
+            submission.status = Submission.Status.GRADED
+            submission.graded_at = now
+            submission.graded_by = grader
+            graded[submission.pk] = submission
+            results.append({"submission_id": submission_id, "status": "success"})
+
+        if graded:
+            Submission.objects.bulk_update(graded.values(), GRADED_FIELDS, batch_size=500)
+            submissions_graded(list(graded.values()))
+
+    return len(graded), results
+
+
+def submissions_graded(submissions):
+    """Post-grade bookkeeping for a batch of just-graded submissions."""
+    from apps.learning import badge_engine
+
+    full_marks = {
+        submission.enrollment.user_id
+        for submission in submissions
+        if submission.grade >= submission.assignment.max_points
+    }
+    if full_marks:
+        try:
+            with transaction.atomic():
+                badge_engine.record_full_marks_many(full_marks)
+            for user_id in full_marks:
+                badge_engine.queue_badge_evaluation(user_id, ["assignment_full_marks"])
+        except Exception as e:
+            logger.warning(f"Badge bookkeeping error: {e}")
+
+    notify_graded(submissions)
+
+
+def notify_graded(submissions):
+    """Tell each learner their submission was graded (one bulk insert)."""
+    from apps.notifications.fanout import create_notifications
+    from apps.notifications.models import Notification
+
+    try:
+        with transaction.atomic():
+            create_notifications(
+                Notification(
+                    user_id=submission.enrollment.user_id,
+                    type=Notification.Type.SYSTEM,
+                    title="Assignment graded",
+                    description=(
+                        f"Your submission for \"{submission.assignment.session.title}\" was graded: "
+                        f"{submission.grade}/{submission.assignment.max_points}."
+                    ),
+                    link=f"/learner/courses/{submission.assignment.session.course_id}",
+                )
+                for submission in submissions
+            )
+    except Exception as e:
+        logger.warning(f"Failed to create grading notifications: {e}")
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-16 18:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0013_certificate_status"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserBadgeStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("enrollments_count", models.PositiveIntegerField(default=0)),
+                ("certificates_count", models.PositiveIntegerField(default=0)),
+                ("quiz_submissions_count", models.PositiveIntegerField(default=0)),
+                ("quiz_perfect_score", models.PositiveSmallIntegerField(default=0)),
+                ("quiz_pass_streak", models.PositiveIntegerField(default=0)),
+                ("assignment_full_marks", models.PositiveSmallIntegerField(default=0)),
+                ("discussions_count", models.PositiveIntegerField(default=0)),
+                ("reviews_count", models.PositiveIntegerField(default=0)),
+                ("subscriptions_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="badge_stats",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "user badge stats",
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-16 18:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_completed_sessions_count(apps, schema_editor):
+    Enrollment = apps.get_model("learning", "Enrollment")
+    SessionProgress = apps.get_model("learning", "SessionProgress")
+    counts = (
+        SessionProgress.objects.filter(
+            enrollment=OuterRef("pk"),
+            is_completed=True,
+            session__course=OuterRef("course"),
+        )
+        .order_by()
+        .values("enrollment")
+        .annotate(n=Count("session", distinct=True))
+        .values("n")
+    )
+    Enrollment.objects.update(
+        completed_sessions_count=Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0014_user_badge_stats"),
+        ("catalogue", "0026_course_sessions_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="enrollment",
+            name="completed_sessions_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            backfill_completed_sessions_count, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.5 on 2026-10-16 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("learning", "0015_enrollment_completed_sessions_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="report",
+            name="error_message",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="report",
+            name="rows_written",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="report",
+            name="total_rows",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,163 @@
+# Generated by Django 5.1.5 on 2026-10-16 19:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_user_session"),
+        ("catalogue", "0026_course_sessions_count"),
+        ("learning", "0016_report_progress"),
+        ("payments", "0007_add_cancellation_reason"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CourseAnalyticsRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("enrollments_total", models.IntegerField(default=0)),
+                ("active_count", models.IntegerField(default=0)),
+                ("completed_count", models.IntegerField(default=0)),
+                (
+                    "progress_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("quiz_scored_count", models.IntegerField(default=0)),
+                (
+                    "quiz_score_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="EnrollmentDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("enrollments", models.IntegerField(default=0)),
+                ("completions", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="LearnerActivityRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_learners", models.PositiveIntegerField(default=0)),
+                ("active_learners", models.PositiveIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="enrollment",
+            index=models.Index(
+                fields=["status", "last_accessed_at"],
+                name="learning_en_status_e95bdc_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseanalyticsrollup",
+            name="course",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="analytics_rollups",
+                to="catalogue.course",
+            ),
+        ),
+        migrations.AddField(
+            model_name="courseanalyticsrollup",
+            name="organization",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="course_analytics_rollups",
+                to="accounts.organization",
+            ),
+        ),
+        migrations.AddField(
+            model_name="enrollmentdailyrollup",
+            name="course",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_enrollment_rollups",
+                to="catalogue.course",
+            ),
+        ),
+        migrations.AddField(
+            model_name="enrollmentdailyrollup",
+            name="organization",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_enrollment_rollups",
+                to="accounts.organization",
+            ),
+        ),
+        migrations.AddField(
+            model_name="learneractivityrollup",
+            name="organization",
+            field=models.OneToOneField(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="learner_activity_rollup",
+                to="accounts.organization",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="courseanalyticsrollup",
+            index=models.Index(
+                fields=["course", "organization"], name="learning_co_course__fcd25b_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="courseanalyticsrollup",
+            index=models.Index(
+                fields=["organization"], name="learning_co_organiz_858418_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="enrollmentdailyrollup",
+            index=models.Index(
+                fields=["date", "course", "organization"],
+                name="learning_en_date_939cf2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="enrollmentdailyrollup",
+            index=models.Index(
+                fields=["organization", "date"], name="learning_en_organiz_fa41a5_idx"
+            ),
+        ),
+    ]
@@ -1,4 +1,8 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Value
+from django.db.models.functions import Least
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -40,6 +44,7 @@ class Enrollment(models.Model):
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
+    completed_sessions_count = models.PositiveIntegerField(default=0, editable=False)
     last_accessed_at = models.DateTimeField(auto_now=True)
     last_accessed_session = models.ForeignKey(
         "catalogue.Session",
@@ -80,13 +85,47 @@ class Enrollment(models.Model):
             models.Index(fields=["user", "status"]),
             models.Index(fields=["course", "status"]),
             models.Index(fields=["-enrolled_at"]),
+            models.Index(fields=["status", "last_accessed_at"]),
         ]
 
+    # Fields whose saved values feed the analytics rollups (see
+    # apps.learning.analytics_rollups); snapshotted on load so the post_save
+    # signal can apply just the change.
+    ANALYTICS_FIELDS = ("status", "progress_percentage", "completed_at")
+
     def __str__(self):
         return f"{self.user.email} - {self.course.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_analytics_state()
+        return instance
+
+    def snapshot_analytics_state(self):
+        """Remember the persisted analytics fields, unless some were deferred."""
+        if all(name in self.__dict__ for name in self.ANALYTICS_FIELDS):
+            self._analytics_state = {name: getattr(self, name) for name in self.ANALYTICS_FIELDS}
+        else:
+            self._analytics_state = None
+
+    @staticmethod
+    def _progress_for(completed_sessions, total_sessions):
+        if total_sessions <= 0:
+            return 0
+        return min((completed_sessions / total_sessions) * 100, 100)
+
+    def _mark_completed_if_done(self):
+        """Check if course is completed — all sessions done AND all graded assignments passed."""
+        if self.progress_percentage >= 100 and self.status != self.Status.COMPLETED:
+            if self._all_graded_assignments_passed():
+                self.status = self.Status.COMPLETED
+                self.completed_at = timezone.now()
+                return True
+        return False
+
     def update_progress(self):
-        """Update progress based on completed sessions"""
+        """Recompute progress from scratch based on completed sessions"""
         completed_sessions = (
             SessionProgress.objects.filter(
                 enrollment=self,
@@ -99,22 +138,59 @@ class Enrollment(models.Model):
         )
         total_sessions = self.course.sessions.count()
 
-        if total_sessions <= 0:
-            self.progress_percentage = 0
-        else:
-            progress = (completed_sessions / total_sessions) * 100
-            self.progress_percentage = min(progress, 100)
-
-        # Check if course is completed — all sessions done AND all graded assignments passed
-        if self.progress_percentage >= 100 and self.status != self.Status.COMPLETED:
-            all_passed = self._all_graded_assignments_passed()
-            if all_passed:
-                self.status = self.Status.COMPLETED
-                self.completed_at = timezone.now()
+        self.completed_sessions_count = completed_sessions
+        self.progress_percentage = self._progress_for(completed_sessions, total_sessions)
+        self._mark_completed_if_done()
 
         self.save()
         return self.progress_percentage
 
+    def record_session_completion(self, completed, session=None):
+        """
+        Roll up a single SessionProgress completion flip incrementally.
+
+        Moves completed_sessions_count by one under a row lock and derives the
+        percentage from the course's denormalized sessions_count, instead of
+        the full recount done by update_progress().
+        """
+        delta = 1 if completed else -1
+        with transaction.atomic():
+            completed_sessions, total_sessions, self.status = (
+                Enrollment.objects.select_for_update(of=("self",))
+                .filter(pk=self.pk)
+                .values_list("completed_sessions_count", "course__sessions_count", "status")
+                .get()
+            )
+            self.completed_sessions_count = max(completed_sessions + delta, 0)
+            self.progress_percentage = self._progress_for(
+                self.completed_sessions_count, total_sessions
+            )
+            update_fields = [
+                "completed_sessions_count", "progress_percentage", "last_accessed_at",
+            ]
+            if session is not None:
+                self.last_accessed_session = session
+                update_fields.append("last_accessed_session")
+            if self._mark_completed_if_done():
+                update_fields += ["status", "completed_at"]
+            self.save(update_fields=update_fields)
+        return self.progress_percentage
+
+    @classmethod
+    def refresh_course_progress(cls, course_id, total_sessions):
+        """Re-derive progress_percentage for every enrollment after a course's session count changes."""
+        if total_sessions <= 0:
+            progress = Value(0, output_field=models.DecimalField())
+        else:
+            progress = Least(
+                ExpressionWrapper(
+                    F("completed_sessions_count") * Value(Decimal("100")) / Value(total_sessions),
+                    output_field=models.DecimalField(max_digits=5, decimal_places=2),
+                ),
+                Value(Decimal("100")),
+            )
+        return cls.objects.filter(course_id=course_id).update(progress_percentage=progress)
+
     def _all_graded_assignments_passed(self):
         """Return True if every assignment session with a passing_score set has a passing submission."""
         from apps.catalogue.models import Session as CourseSession
@@ -527,6 +603,11 @@ class Report(models.Model):
     file = models.FileField(upload_to="reports/", blank=True, null=True)
     file_size = models.CharField(max_length=50, blank=True, null=True)
 
+    # Progress (updated while the report is being written)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    error_message = models.TextField(blank=True, default="")
+
     # Filter parameters (stored as JSON)
     parameters = models.JSONField(default=dict, blank=True)
 
@@ -537,6 +618,61 @@ class Report(models.Model):
         return f"{self.name} - {self.status}"
 
 
+class BulkEnrollmentJob(models.Model):
+    """
+    A bulk enrollment run off the request path (apps.learning.bulk_enrollment).
+    Counters are updated after every batch so clients can poll progress.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+        FAILED = "failed", "Failed"
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="bulk_enrollment_jobs",
+    )
+    course = models.ForeignKey(
+        "catalogue.Course", on_delete=models.CASCADE, related_name="bulk_enrollment_jobs"
+    )
+    # Users must be active members of this organization, and their
+    # enrollments are attributed to it
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="bulk_enrollment_jobs",
+    )
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+
+    # Target: these users, or (when empty) every active member of the
+    # organization, optionally only one department
+    user_ids = models.JSONField(default=list, blank=True)
+    department = models.CharField(max_length=100, blank=True, default="")
+
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    enrolled = models.PositiveIntegerField(default=0)
+    already_enrolled = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Bulk enrollment #{self.pk} ({self.status})"
+
+
 class Badge(models.Model):
     """
     Badge represents an achievable badge/award for learners.
@@ -594,6 +730,38 @@ class UserBadge(models.Model):
         return f"{self.user} → {self.badge.name}"
 
 
+class UserBadgeStats(models.Model):
+    """
+    Materialized per-user counters read by the badge engine.
+
+    Field names match Badge.criteria_type values. Rows are created lazily
+    from the user's history the first time they are needed and then kept
+    current with deltas from the learning signals.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="badge_stats",
+    )
+    enrollments_count = models.PositiveIntegerField(default=0)
+    certificates_count = models.PositiveIntegerField(default=0)
+    quiz_submissions_count = models.PositiveIntegerField(default=0)
+    quiz_perfect_score = models.PositiveSmallIntegerField(default=0)
+    quiz_pass_streak = models.PositiveIntegerField(default=0)
+    assignment_full_marks = models.PositiveSmallIntegerField(default=0)
+    discussions_count = models.PositiveIntegerField(default=0)
+    reviews_count = models.PositiveIntegerField(default=0)
+    subscriptions_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "user badge stats"
+
+    def __str__(self):
+        return f"Badge stats for {self.user}"
+
+
 class SavedCourse(models.Model):
     """
     SavedCourse represents a user's bookmarked/favorited course.
@@ -699,3 +867,92 @@ class WorkshopAttendance(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.workshop.title} ({self.status})"
+
+
+# ── Analytics rollups ─────────────────────────────────────────
+#
+# Pre-aggregated numbers for LearningAnalyticsViewSet. Counter rows are
+# additive: readers Sum() over them, so a duplicate row created by two
+# concurrent first writes is harmless and is folded away by the next
+# rebuild (apps.learning.analytics_rollups.rebuild_rollups).
+
+
+class CourseAnalyticsRollup(models.Model):
+    """Enrollment and quiz totals for one course within one organization."""
+
+    course = models.ForeignKey(
+        "catalogue.Course", on_delete=models.CASCADE, related_name="analytics_rollups"
+    )
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="course_analytics_rollups",
+    )
+    enrollments_total = models.IntegerField(default=0)
+    active_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    progress_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    quiz_scored_count = models.IntegerField(default=0)
+    quiz_score_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["course", "organization"]),
+            models.Index(fields=["organization"]),
+        ]
+
+    def __str__(self):
+        return f"Rollup for course {self.course_id} / org {self.organization_id}"
+
+
+class EnrollmentDailyRollup(models.Model):
+    """Enrollments started and completed per day, course and organization."""
+
+    date = models.DateField()
+    course = models.ForeignKey(
+        "catalogue.Course", on_delete=models.CASCADE, related_name="daily_enrollment_rollups"
+    )
+    organization = models.ForeignKey(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="daily_enrollment_rollups",
+    )
+    enrollments = models.IntegerField(default=0)
+    completions = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "course", "organization"]),
+            models.Index(fields=["organization", "date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.date} course {self.course_id} / org {self.organization_id}"
+
+
+class LearnerActivityRollup(models.Model):
+    """
+    Distinct learner counts per organization (``organization=None`` is the
+    whole platform). Distinct counts can't be kept by deltas, so these rows
+    are only written by the periodic rebuild; the platform row's
+    ``refreshed_at`` marks when that last ran.
+    """
+
+    organization = models.OneToOneField(
+        "accounts.Organization",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="learner_activity_rollup",
+    )
+    total_learners = models.PositiveIntegerField(default=0)
+    active_learners = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"Learner activity for org {self.organization_id}"
@@ -0,0 +1,125 @@
+"""
+Quiz grading.
+
+Each quiz's answer keys are compiled once into a grading table - plain
+tuples, normalised for comparison - and cached under the quiz id and its
+``questions_version`` (bumped by `apps.catalogue.signals` whenever a
+question changes), so a burst of submissions grades entirely in memory.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.catalogue.models import QuizQuestion
+
+QuestionType = QuizQuestion.QuestionType
+
+
+def _normalize(text):
+    return (text or "").lower().strip()
+
+
+def compile_answer_key(question_type, answer_payload):
+    """Reduce a question's answer_payload to what grading compares against."""
+    payload = answer_payload or {}
+    if question_type == QuestionType.MULTIPLE_CHOICE:
+        return tuple(bool(option.get("is_correct", False)) for option in payload.get("options", []))
+    if question_type == QuestionType.TRUE_FALSE:
+        return payload.get("correct_answer")
+    if question_type == QuestionType.SHORT_ANSWER:
+        return _normalize(payload.get("sample_answer", ""))
+    if question_type == QuestionType.FILL_BLANK:
+        return tuple(_normalize(blank.get("answer", "")) for blank in payload.get("blanks", []))
+    if question_type == QuestionType.MATCHING:
+        return tuple((pair.get("key"), pair.get("value")) for pair in payload.get("pairs", []))
+    return None
+
+
+def _cache_key(quiz):
+    return f"quiz_grading:{quiz.pk}:{quiz.questions_version}"
+
+
+def get_grading_table(quiz):
+    """
+    Return ``{question_id: (question_type, points, answer_key)}`` for ``quiz``.
+    """
+    key = _cache_key(quiz)
+    table = cache.get(key)
+    if table is None:
+        table = {
+            question_id: (question_type, points, compile_answer_key(question_type, payload))
+            for question_id, question_type, points, payload in quiz.questions.values_list(
+                "id", "question_type", "points", "answer_payload"
+            )
+        }
+        cache.set(key, table, settings.QUIZ_GRADING_TABLE_TTL)
+    return table
+
+
+def _partial(points, correct_count, total):
+    if total > 0:
+        return correct_count == total, (points * correct_count) // total
+    return False, 0
+
+
+def grade_answer(entry, selected_answer):
+    """
+    Grade one answer against a grading table entry.
+    Returns (is_correct, points_awarded); essays return (None, 0) for manual marking.
+    """
+    question_type, points, key = entry
+
+    if question_type == QuestionType.MULTIPLE_CHOICE:
+        selected_option = selected_answer.get("selected_option")
+        if selected_option is not None and selected_option < len(key):
+            is_correct = key[selected_option]
+            return is_correct, points if is_correct else 0
+        return False, 0
+
+    if question_type == QuestionType.TRUE_FALSE:
+        is_correct = selected_answer.get("value") == key
+        return is_correct, points if is_correct else 0
+
+    if question_type == QuestionType.SHORT_ANSWER:
+        user_answer = _normalize(selected_answer.get("text", ""))
+        is_correct = user_answer == key or key in user_answer
+        return is_correct, points if is_correct else 0
+
+    if question_type == QuestionType.FILL_BLANK:
+        user_blanks = selected_answer.get("blanks", [])
+        if len(user_blanks) != len(key):
+            return False, 0
+        correct_count = sum(
+            1 for expected, given in zip(key, user_blanks) if _normalize(given) == expected
+        )
+        return _partial(points, correct_count, len(key))
+
+    if question_type == QuestionType.MATCHING:
+        user_pairs = [(pair.get("key"), pair.get("value")) for pair in selected_answer.get("pairs", [])]
+        correct_count = sum(1 for pair in key for user_pair in user_pairs if pair == user_pair)
+        return _partial(points, correct_count, len(key))
+
+    if question_type == QuestionType.ESSAY:
+        return None, 0
+
+    return False, 0
+
+
+def grade_submission(table, answers):
+    """
+    Grade ``answers`` (``{"question", "selected_answer"}`` dicts) in memory.
+
+    Returns ``(graded, total_score, total_points)`` where ``graded`` holds
+    ``(question_id, selected_answer, is_correct, points_awarded)`` for each
+    answer to a question in the table; others are ignored.
+    """
+    graded = []
+    total_score = 0
+    for answer in answers:
+        entry = table.get(answer["question"])
+        if entry is None:
+            continue
+        is_correct, points_awarded = grade_answer(entry, answer["selected_answer"])
+        graded.append((answer["question"], answer["selected_answer"], is_correct, points_awarded))
+        total_score += points_awarded
+    total_points = sum(points for _, points, _ in table.values())
+    return graded, total_score, total_points
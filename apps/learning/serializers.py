@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from rest_framework.exceptions import PermissionDenied
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
 from drf_spectacular.utils import extend_schema_field
@@ -17,10 +19,12 @@ from .models import (
     Workshop,
     WorkshopAttendance,
 )
-from apps.catalogue.models import Quiz, QuizQuestion
+from apps.catalogue.models import Quiz
 from apps.catalogue.models import Course, Session
+from apps.accounts.models import Organization
 from apps.accounts.rbac import is_admin_like, is_instructor
 from apps.payments.permissions import user_has_active_subscription
+from .quiz_grading import get_grading_table, grade_submission
 
 
 class EnrollmentSerializer(serializers.ModelSerializer):
@@ -130,12 +134,26 @@ class EnrollmentCreateSerializer(serializers.ModelSerializer):
 
 
 class BulkEnrollmentSerializer(serializers.Serializer):
-    """Serializer for bulk enrolling users."""
+    """
+    Serializer for bulk enrolling users: either ``user_ids``, or every active
+    member of ``organization`` (optionally one ``department``).
+    """
 
     course = serializers.PrimaryKeyRelatedField(queryset=Course.objects.all())
     user_ids = serializers.ListField(
-        child=serializers.IntegerField(), allow_empty=False
+        child=serializers.IntegerField(), required=False, allow_empty=True
     )
+    organization = serializers.PrimaryKeyRelatedField(
+        queryset=Organization.objects.all(), required=False, allow_null=True
+    )
+    department = serializers.CharField(max_length=100, required=False, allow_blank=True)
+
+    def validate_user_ids(self, value):
+        if len(value) > settings.BULK_ENROLLMENT_MAX_USERS:
+            raise serializers.ValidationError(
+                f"At most {settings.BULK_ENROLLMENT_MAX_USERS} users per request."
+            )
+        return value
 
 
 class SessionProgressSerializer(serializers.ModelSerializer):
@@ -393,8 +411,14 @@ class ReportSerializer(serializers.ModelSerializer):
             "file",
             "file_size",
             "parameters",
+            "total_rows",
+            "rows_written",
+            "error_message",
+        ]
+        read_only_fields = [
+            "id", "generated_by", "generated_at", "status",
+            "total_rows", "rows_written", "error_message",
         ]
-        read_only_fields = ["id", "generated_by", "generated_at", "status"]
 
 
 class ReportGenerateSerializer(serializers.Serializer):
@@ -771,7 +795,7 @@ class QuizSubmissionCreateSerializer(serializers.Serializer):
 
     def validate_quiz(self, value):
         try:
-            return Quiz.objects.get(id=value)
+            return Quiz.objects.select_related("session").get(id=value)
         except Quiz.DoesNotExist:
             raise serializers.ValidationError("Quiz not found.")
 
@@ -822,124 +846,41 @@ class QuizSubmissionCreateSerializer(serializers.Serializer):
 
         return attrs
 
-    def _grade_answer(self, question, selected_answer):
-        """
-        Grade a single answer based on question type.
-        Returns (is_correct, points_awarded).
-        """
-        answer_payload = question.answer_payload or {}
-        question_type = question.question_type
-        points = question.points
-
-        if question_type == QuizQuestion.QuestionType.MULTIPLE_CHOICE:
-            selected_option = selected_answer.get("selected_option")
-            options = answer_payload.get("options", [])
-            if selected_option is not None and selected_option < len(options):
-                is_correct = options[selected_option].get("is_correct", False)
-                return is_correct, points if is_correct else 0
-            return False, 0
-
-        elif question_type == QuizQuestion.QuestionType.TRUE_FALSE:
-            correct_answer = answer_payload.get("correct_answer")
-            is_correct = selected_answer.get("value") == correct_answer
-            return is_correct, points if is_correct else 0
-
-        elif question_type == QuizQuestion.QuestionType.SHORT_ANSWER:
-            sample_answer = answer_payload.get("sample_answer", "").lower().strip()
-            user_answer = selected_answer.get("text", "").lower().strip()
-            is_correct = user_answer == sample_answer or sample_answer in user_answer
-            return is_correct, points if is_correct else 0
-
-        elif question_type == QuizQuestion.QuestionType.FILL_BLANK:
-            blanks = answer_payload.get("blanks", [])
-            user_blanks = selected_answer.get("blanks", [])
-            if len(user_blanks) != len(blanks):
-                return False, 0
-            correct_count = 0
-            for i, blank in enumerate(blanks):
-                if i < len(user_blanks):
-                    if (
-                        user_blanks[i].lower().strip()
-                        == blank.get("answer", "").lower().strip()
-                    ):
-                        correct_count += 1
-            total_blanks = len(blanks)
-            if total_blanks > 0:
-                is_correct = correct_count == total_blanks
-                points_awarded = (points * correct_count) // total_blanks
-                return is_correct, points_awarded
-            return False, 0
-
-        elif question_type == QuizQuestion.QuestionType.MATCHING:
-            correct_pairs = answer_payload.get("pairs", [])
-            user_pairs = selected_answer.get("pairs", [])
-            correct_count = 0
-            for pair in correct_pairs:
-                for user_pair in user_pairs:
-                    if pair.get("key") == user_pair.get("key"):
-                        if pair.get("value") == user_pair.get("value"):
-                            correct_count += 1
-            total_pairs = len(correct_pairs)
-            if total_pairs > 0:
-                is_correct = correct_count == total_pairs
-                points_awarded = (points * correct_count) // total_pairs
-                return is_correct, points_awarded
-            return False, 0
-
-        elif question_type == QuizQuestion.QuestionType.ESSAY:
-            return None, 0
-
-        return False, 0
-
     def create(self, validated_data):
         enrollment = validated_data["enrollment"]
         quiz = validated_data["quiz"]
-        time_spent_seconds = validated_data.get("time_spent_seconds", 0)
-        answers_data = validated_data["answers"]
-        attempt_number = validated_data["attempt_number"]
-
-        questions = {q.id: q for q in quiz.questions.all()}
-        total_points = sum(q.points for q in questions.values())
-        total_score = 0
-
-        submission = QuizSubmission.objects.create(
-            enrollment=enrollment,
-            quiz=quiz,
-            attempt_number=attempt_number,
-            max_score=total_points,
-            time_spent_seconds=time_spent_seconds,
-        )
-
-        settings = quiz.settings or {}
-        passing_score_percent = settings.get("passing_score_percent", 70)
-
-        for answer_data in answers_data:
-            question_id = answer_data["question"]
-            selected_answer = answer_data["selected_answer"]
 
-            question = questions.get(question_id)
-            if not question:
-                continue
-
-            is_correct, points_awarded = self._grade_answer(question, selected_answer)
-
-            QuizAnswer.objects.create(
-                submission=submission,
-                question=question,
-                selected_answer=selected_answer,
-                is_correct=is_correct,
-                points_awarded=points_awarded,
-            )
-
-            total_score += points_awarded
-
-        submission.score = total_score
-        submission.passed = (
-            (total_score / total_points * 100) >= passing_score_percent
-            if total_points > 0
-            else False
+        graded, total_score, total_points = grade_submission(
+            get_grading_table(quiz), validated_data["answers"]
         )
-        submission.save()
+        passing_score_percent = (quiz.settings or {}).get("passing_score_percent", 70)
+
+        with transaction.atomic():
+            submission = QuizSubmission.objects.create(
+                enrollment=enrollment,
+                quiz=quiz,
+                attempt_number=validated_data["attempt_number"],
+                score=total_score,
+                max_score=total_points,
+                passed=(
+                    (total_score / total_points * 100) >= passing_score_percent
+                    if total_points > 0
+                    else False
+                ),
+                time_spent_seconds=validated_data.get("time_spent_seconds", 0),
+            )
+            QuizAnswer.objects.bulk_create(
+                [
+                    QuizAnswer(
+                        submission=submission,
+                        question_id=question_id,
+                        selected_answer=selected_answer,
+                        is_correct=is_correct,
+                        points_awarded=points_awarded,
+                    )
+                    for question_id, selected_answer, is_correct, points_awarded in graded
+                ]
+            )
 
         return submission
 
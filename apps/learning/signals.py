@@ -1,11 +1,11 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
-from django.conf import settings
 from django.contrib.auth import get_user_model
 from datetime import timedelta
 
-from apps.learning.models import Enrollment, Certificate, QuizSubmission, Discussion, Submission
+from apps.learning import certificate_verification
+from apps.learning.models import Badge, Enrollment, Certificate, QuizSubmission, Discussion, SessionProgress, Submission
 
 User = get_user_model()
 
@@ -26,7 +26,9 @@ def auto_create_certificate(sender, instance, **kwargs):
             )
 
             # Set the verification URL based on the generated certificate number
-            certificate.verification_url = f"{settings.FRONTEND_URL}/verify-certificate?number={certificate.certificate_number}"
+            certificate.verification_url = certificate_verification.verification_url(
+                certificate.certificate_number
+            )
             certificate.save(update_fields=['verification_url'])
 
         # Mark enrollment as certificate issued
@@ -37,74 +39,214 @@ def auto_create_certificate(sender, instance, **kwargs):
             )
 
 
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_certificate_verification(sender, instance, **kwargs):
+    """Drop the cached public verification payload when a certificate changes."""
+    certificate_verification.invalidate([instance.certificate_number])
+
+
 # ── Badge auto-award signals ──────────────────────────────────
+#
+# These only apply counter deltas (a single UPDATE) and queue evaluation for
+# after commit; thresholds are checked off the request path by the
+# `evaluate_badges` task.
 
-def _award_badges_safe(user, criteria_types):
-    """Safely run badge evaluation, catching any errors to avoid breaking the main flow."""
+def _badge_safe(func, *args, **kwargs):
+    """Run a badge bookkeeping call, catching any errors to avoid breaking the main flow."""
     try:
-        from apps.learning.badge_engine import check_and_award_badges
-        check_and_award_badges(user, criteria_types=criteria_types)
+        return func(*args, **kwargs)
     except Exception as e:
         import logging
-        logging.getLogger(__name__).warning(f"Badge evaluation error for user {user.id}: {e}")
+        logging.getLogger(__name__).warning(f"Badge bookkeeping error: {e}")
+
+
+def _record_badge_event(user_id, criteria_types, **deltas):
+    from apps.learning import badge_engine
+
+    if deltas:
+        _badge_safe(badge_engine.increment_stats, user_id, **deltas)
+    _badge_safe(badge_engine.queue_badge_evaluation, user_id, criteria_types)
 
 
 @receiver(post_save, sender=Certificate)
 def award_badges_on_certificate(sender, instance, created, **kwargs):
     """Award course completion and certificate badges when a certificate is created."""
     if created:
-        user = instance.enrollment.user
-        _award_badges_safe(user, ['certificates_count', 'first_certificate'])
+        user_id = instance.enrollment.user_id
+        _record_badge_event(
+            user_id, ['certificates_count', 'first_certificate'], certificates_count=1
+        )
+
+
+@receiver(post_delete, sender=Certificate)
+def update_badge_stats_on_certificate_delete(sender, instance, **kwargs):
+    from apps.learning import badge_engine
+
+    _badge_safe(badge_engine.increment_stats, instance.enrollment.user_id, certificates_count=-1)
 
 
 @receiver(post_save, sender=Enrollment)
 def award_badges_on_enrollment(sender, instance, created, **kwargs):
     """Award enrollment milestone badges when a new enrollment is created."""
     if created:
-        _award_badges_safe(instance.user, ['enrollments_count'])
+        _record_badge_event(instance.user_id, ['enrollments_count'], enrollments_count=1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_badge_stats_on_enrollment_delete(sender, instance, **kwargs):
+    from apps.learning import badge_engine
+
+    _badge_safe(badge_engine.increment_stats, instance.user_id, enrollments_count=-1)
 
 
 @receiver(post_save, sender=QuizSubmission)
-def award_badges_on_quiz(sender, instance, created, **kwargs):
-    """Award assessment badges when a quiz is submitted."""
+def award_badges_on_quiz(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Award assessment badges when a quiz is submitted.
+
+    Submissions may be inserted before grading, so the pass/perfect result is
+    recorded when the score is written (on insert, or by a save that lists
+    ``score`` in update_fields).
+    """
+    from apps.learning import badge_engine
+
+    scored = instance.score is not None and (
+        created or (update_fields is not None and 'score' in update_fields)
+    )
+    if not created and not scored:
+        return
+
+    user_id = instance.enrollment.user_id
+    seeded = False
     if created:
-        _award_badges_safe(
-            instance.enrollment.user,
-            ['quiz_submissions_count', 'quiz_perfect_score', 'quiz_pass_streak'],
-        )
+        seeded = _badge_safe(badge_engine.increment_stats, user_id, quiz_submissions_count=1)
+    # A freshly seeded row already counts this result from history
+    if scored and not seeded:
+        perfect = instance.max_score > 0 and instance.score == instance.max_score
+        _badge_safe(badge_engine.record_quiz_result, user_id, instance.passed, perfect)
+    _badge_safe(
+        badge_engine.queue_badge_evaluation,
+        user_id,
+        ['quiz_submissions_count', 'quiz_perfect_score', 'quiz_pass_streak'],
+    )
 
 
 @receiver(post_save, sender=Discussion)
 def award_badges_on_discussion(sender, instance, created, **kwargs):
     """Award engagement badges when a discussion is created."""
     if created:
-        _award_badges_safe(instance.user, ['discussions_count'])
+        _record_badge_event(instance.user_id, ['discussions_count'], discussions_count=1)
+
+
+@receiver(post_delete, sender=Discussion)
+def update_badge_stats_on_discussion_delete(sender, instance, **kwargs):
+    from apps.learning import badge_engine
+
+    _badge_safe(badge_engine.increment_stats, instance.user_id, discussions_count=-1)
 
 
 @receiver(post_save, sender=Submission)
 def award_badges_on_submission_graded(sender, instance, **kwargs):
     """Award assignment badges when a submission is graded with full marks."""
     if instance.status == 'graded' and instance.grade is not None:
-        user = instance.enrollment.user
-        _award_badges_safe(user, ['assignment_full_marks'])
+        from apps.learning import badge_engine
+
+        if instance.grade >= instance.assignment.max_points:
+            user_id = instance.enrollment.user_id
+            _badge_safe(badge_engine.record_full_marks, user_id)
+            _badge_safe(badge_engine.queue_badge_evaluation, user_id, ['assignment_full_marks'])
 
 
 @receiver(post_save, sender=User)
 def award_badges_on_profile_update(sender, instance, **kwargs): # noqa: ARG001
-    """Award profile_complete badge when user saves their profile."""
-    _award_badges_safe(instance, ['profile_complete'])
+    """Award profile_complete badge when user saves a complete profile."""
+    from apps.learning import badge_engine
+
+    # Profile completeness is read off the instance, so incomplete profiles
+    # cost nothing here
+    if badge_engine._get_user_stat(instance, 'profile_complete'):
+        _badge_safe(badge_engine.queue_badge_evaluation, instance.pk, ['profile_complete'])
 
 
 @receiver(post_save, sender='catalogue.CourseReview')
 def award_badges_on_review(sender, instance, created, **kwargs):
     """Award review badges when a course review is created."""
     if created:
-        _award_badges_safe(instance.user, ['reviews_count'])
+        _record_badge_event(instance.user_id, ['reviews_count'], reviews_count=1)
+
+
+@receiver(post_delete, sender='catalogue.CourseReview')
+def update_badge_stats_on_review_delete(sender, instance, **kwargs):
+    from apps.learning import badge_engine
+
+    _badge_safe(badge_engine.increment_stats, instance.user_id, reviews_count=-1)
 
 
 @receiver(post_save, sender='payments.UserSubscription')
 def award_badges_on_subscription(sender, instance, created, **kwargs):
     """Award subscription badges when a user subscription is created."""
     if created:
-        user = instance.user
-        _award_badges_safe(user, ['subscriptions_count'])
+        _record_badge_event(
+            instance.user_id, ['subscriptions_count'], subscriptions_count=1
+        )
+
+
+@receiver(post_save, sender=Badge)
+@receiver(post_delete, sender=Badge)
+def invalidate_badge_index(sender, **kwargs):
+    """Drop the cached badge threshold index when a badge definition changes."""
+    from apps.learning.badge_engine import invalidate_badge_index
+
+    invalidate_badge_index()
+
+
+@receiver(post_delete, sender=SessionProgress)
+def update_completed_sessions_on_progress_delete(sender, instance, **kwargs):
+    """Keep Enrollment.completed_sessions_count in step when completed progress disappears."""
+    if instance.is_completed:
+        from django.db.models import F
+        from django.db.models.functions import Greatest
+
+        Enrollment.objects.filter(pk=instance.enrollment_id).update(
+            completed_sessions_count=Greatest(F('completed_sessions_count') - 1, 0)
+        )
+
+
+# ── Analytics rollup deltas ───────────────────────────────────
+#
+# Keep the dashboard rollups in step with enrollment and quiz writes; the
+# `refresh_learning_rollups` beat task rebuilds them from scratch.
+
+@receiver(post_save, sender=Enrollment)
+def update_analytics_rollups_on_enrollment(sender, instance, created, update_fields=None, **kwargs):
+    from apps.learning import analytics_rollups
+
+    analytics_rollups.record_enrollment_saved(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_analytics_rollups_on_enrollment_delete(sender, instance, **kwargs):
+    from apps.learning import analytics_rollups
+
+    analytics_rollups.record_enrollment_deleted(instance)
+
+
+@receiver(post_save, sender=QuizSubmission)
+def update_analytics_rollups_on_quiz(sender, instance, created, update_fields=None, **kwargs):
+    """Count a submission once its score is written (see award_badges_on_quiz)."""
+    from apps.learning import analytics_rollups
+
+    scored = instance.score is not None and (
+        created or (update_fields is not None and 'score' in update_fields)
+    )
+    if scored:
+        analytics_rollups.record_quiz_score(instance.enrollment, instance.score)
+
+
+@receiver(post_delete, sender=QuizSubmission)
+def update_analytics_rollups_on_quiz_delete(sender, instance, **kwargs):
+    from apps.learning import analytics_rollups
+
+    if instance.score is not None:
+        analytics_rollups.record_quiz_score(instance.enrollment, instance.score, sign=-1)
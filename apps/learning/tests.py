@@ -2,6 +2,7 @@
 
 from datetime import timedelta
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
@@ -197,6 +198,88 @@ class SessionProgressSubscriptionGateTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+class SessionProgressRollupTest(APITestCase):
+    """Progress PATCHes roll up incrementally and heartbeats are coalesced."""
+
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            username='rollup_learner',
+            email='rollup_learner@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        _grant_subscription(self.learner)
+        self.course = Course.objects.create(
+            title='Rollup Course',
+            description='desc',
+            slug='rollup-course',
+            status='published',
+        )
+        self.s1 = Session.objects.create(course=self.course, title='S1', order=1, session_type='video')
+        self.s2 = Session.objects.create(course=self.course, title='S2', order=2, session_type='video')
+        self.enrollment = Enrollment.objects.create(user=self.learner, course=self.course)
+        self.progress = SessionProgress.objects.create(enrollment=self.enrollment, session=self.s1)
+
+    def _patch(self, data):
+        return self.client.patch(
+            f'{SESSION_PROGRESS_URL}{self.progress.id}/', data, format='json', **_auth(self.learner)
+        )
+
+    def test_course_sessions_count_is_maintained(self):
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.sessions_count, 2)
+        self.s2.delete()
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.sessions_count, 1)
+
+    def test_completion_flip_updates_progress(self):
+        response = self._patch({'is_completed': True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_sessions_count, 1)
+        self.assertEqual(self.enrollment.progress_percentage, Decimal('50.00'))
+        self.assertEqual(self.enrollment.last_accessed_session_id, self.s1.id)
+
+        self._patch({'is_completed': False})
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_sessions_count, 0)
+        self.assertEqual(self.enrollment.progress_percentage, Decimal('0.00'))
+
+    def test_repeated_completion_flip_counts_once(self):
+        # Both requests loaded the row before either saved it (double-click, retry).
+        stale = SessionProgress.objects.get(pk=self.progress.pk)
+        self._patch({'is_completed': True})
+        with patch('apps.learning.views.SessionProgressViewSet.get_object', return_value=stale):
+            response = self._patch({'is_completed': True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.completed_sessions_count, 1)
+        self.assertEqual(self.enrollment.progress_percentage, Decimal('50.00'))
+
+    def test_adding_session_rescales_progress(self):
+        self._patch({'is_completed': True})
+        Session.objects.create(course=self.course, title='S3', order=3, session_type='video')
+        Session.objects.create(course=self.course, title='S4', order=4, session_type='video')
+        self.enrollment.refresh_from_db()
+        self.assertEqual(self.enrollment.progress_percentage, Decimal('25.00'))
+
+    def test_heartbeat_within_window_is_not_persisted(self):
+        self._patch({'time_spent_seconds': 10})
+        with self.settings(SESSION_PROGRESS_HEARTBEAT_SECONDS=60):
+            response = self._patch({'time_spent_seconds': 20})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['time_spent_seconds'], 20)
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.time_spent_seconds, 10)
+
+        with self.settings(SESSION_PROGRESS_HEARTBEAT_SECONDS=0):
+            self._patch({'time_spent_seconds': 30})
+        self.progress.refresh_from_db()
+        self.assertEqual(self.progress.time_spent_seconds, 30)
+
+
 # -----------------------------------------------------------------------------
 # Submission V1 tests
 # -----------------------------------------------------------------------------
@@ -520,6 +603,84 @@ class SubmissionApiTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_bulk_grade_validates_each_item_and_writes_in_bulk(self):
+        from apps.learning.models import UserBadgeStats
+        from apps.notifications.models import Notification
+
+        learners = [
+            User.objects.create_user(
+                username=f'bulk_learner{i}', email=f'bulk_learner{i}@example.com', password='pass1234'
+            )
+            for i in range(3)
+        ]
+        subs = [
+            Submission.objects.create(
+                enrollment=Enrollment.objects.create(user=learner, course=self.enrollment.course),
+                assignment=self.assignment,
+                status=Submission.Status.SUBMITTED,
+                submitted_text='x',
+                submitted_at=timezone.now(),
+            )
+            for learner in learners
+        ]
+        draft = Submission.objects.create(
+            enrollment=self.enrollment, assignment=self.assignment, status=Submission.Status.DRAFT
+        )
+        grades = [
+            {'submission_id': subs[0].id, 'grade': 100, 'feedback': 'Perfect'},
+            {'submission_id': subs[1].id, 'grade': 70},
+            {'submission_id': subs[0].id, 'grade': 90},
+            {'submission_id': subs[2].id, 'grade': 150},
+            {'submission_id': subs[2].id, 'grade': 85.7},
+            {'submission_id': draft.id, 'grade': 50},
+            {'submission_id': 999999, 'grade': 50},
+            {'submission_id': subs[2].id},
+        ]
+
+        response = self.client.post(
+            f'{SUBMISSIONS_URL}bulk_grade/', {'grades': grades}, format='json', **_auth(self.instructor)
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['graded'], 2)
+        self.assertEqual(
+            [(r['status'], r.get('error')) for r in response.data['results']],
+            [
+                ('success', None),
+                ('success', None),
+                ('error', 'Only submitted submissions can be graded'),
+                ('error', 'Grade must be between 0 and 100.'),
+                ('error', 'Grade must be between 0 and 100.'),
+                ('error', 'Only submitted submissions can be graded'),
+                ('error', 'Submission not found'),
+                ('error', 'submission_id and grade are required'),
+            ],
+        )
+        for sub in subs:
+            sub.refresh_from_db()
+        self.assertEqual((subs[0].status, subs[0].grade, subs[0].feedback), ('graded', 100, 'Perfect'))
+        self.assertEqual(subs[0].graded_by, self.instructor)
+        self.assertEqual((subs[1].status, subs[1].grade), ('graded', 70))
+        self.assertEqual(subs[2].status, 'submitted')
+
+        self.assertEqual(UserBadgeStats.objects.get(user=learners[0]).assignment_full_marks, 1)
+        self.assertFalse(
+            UserBadgeStats.objects.filter(user=learners[1], assignment_full_marks__gt=0).exists()
+        )
+        self.assertEqual(
+            set(Notification.objects.filter(title='Assignment graded').values_list('user_id', flat=True)),
+            {learners[0].id, learners[1].id},
+        )
+
+    def test_bulk_grade_learner_403(self):
+        response = self.client.post(
+            f'{SUBMISSIONS_URL}bulk_grade/',
+            {'grades': [{'submission_id': 1, 'grade': 10}]},
+            format='json',
+            **_auth(self.learner),
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_learner_delete_draft_204(self):
         sub = Submission.objects.create(
             enrollment=self.enrollment,
@@ -725,6 +886,33 @@ class OrgAdminSubmissionScopingTests(APITestCase):
         self.assertEqual(response.data['total_assignments'], 2)
         self.assertEqual(response.data['total_quizzes'], 2)
 
+    def test_statistics_and_stats_count_buckets_in_one_query_per_table(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        def counting_queries(ctx, table):
+            return [
+                q['sql'] for q in ctx.captured_queries
+                if f'FROM "{table}"' in q['sql'] and 'COUNT(' in q['sql']
+            ]
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                f'{SUBMISSIONS_URL}statistics/', {'course': self.course.id}, **_auth(self.instructor)
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(counting_queries(ctx, 'learning_submission')), 1)
+        counts = {d['label']: d['count'] for d in response.data['distribution']}
+        self.assertEqual(counts, {'A': 0, 'B': 1, 'C': 0, 'D': 0, 'F': 1})
+        self.assertEqual(response.data['average_grade'], 71.5)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f'{SUBMISSIONS_URL}stats/', **_auth(self.instructor))
+        self.assertEqual(len(counting_queries(ctx, 'learning_submission')), 1)
+        self.assertEqual(len(counting_queries(ctx, 'learning_quizsubmission')), 1)
+        self.assertEqual(response.data['graded'], 2)
+        self.assertEqual(response.data['quiz_pass_rate'], 50.0)
+
     def test_learner_still_sees_own_data_only(self):
         response = self.client.get(SUBMISSIONS_URL, **_auth(self.learner_a))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1127,6 +1315,113 @@ class AnalyticsProductScopeRecoveryTest(APITestCase):
         self.assertEqual(rows[0]['enrollments'], 1)
 
 
+class AnalyticsRollupTest(APITestCase):
+    """Dashboards read the rollup tables while they are fresh."""
+
+    def setUp(self):
+        from apps.learning.analytics_rollups import rebuild_rollups
+
+        self.client = APIClient()
+        self.org = Organization.objects.create(name='Rollup Org', slug='rollup-org')
+        self.instructor = User.objects.create_user(
+            username='rollup_inst',
+            email='rollup_inst@example.com',
+            password='pass1234',
+            role=User.Role.INSTRUCTOR,
+            email_verified=True,
+            is_active=True,
+        )
+        self.manager = User.objects.create_user(
+            username='rollup_mgr',
+            email='rollup_mgr@example.com',
+            password='pass1234',
+            role=User.Role.LMS_MANAGER,
+            email_verified=True,
+            is_active=True,
+        )
+        cat = Category.objects.create(name='Rollup Cat', slug='rollup-cat')
+        self.course = Course.objects.create(
+            title='Rollup Course',
+            slug='rollup-course',
+            instructor=self.instructor,
+            category=cat,
+            status='published',
+        )
+        quiz_session = Session.objects.create(
+            course=self.course,
+            title='Rollup Quiz',
+            order=1,
+            session_type=Session.SessionType.QUIZ,
+        )
+        self.quiz = Quiz.objects.create(session=quiz_session)
+        self.enrollments = []
+        for i in range(3):
+            learner = User.objects.create_user(
+                username=f'rollup_learner_{i}',
+                email=f'rollup_learner_{i}@example.com',
+                password='pass1234',
+                role=User.Role.LEARNER,
+                email_verified=True,
+                is_active=True,
+            )
+            self.enrollments.append(Enrollment.objects.create(
+                user=learner,
+                course=self.course,
+                organization=self.org,
+                progress_percentage=Decimal('30'),
+            ))
+        QuizSubmission.objects.create(
+            enrollment=self.enrollments[0], quiz=self.quiz, score=Decimal('8'), max_score=Decimal('10'),
+        )
+        rebuild_rollups()
+
+    def _stats(self, query=''):
+        return self.client.get(f'{LEARNING_STATS_URL}{query}', **_auth(self.manager)).json()
+
+    def test_rebuild_matches_live_aggregation(self):
+        self.assertEqual(self._stats(), self._stats('?max_age=0'))
+        self.assertEqual(self._stats()['total_learners'], 3)
+        self.assertEqual(self._stats()['avg_quiz_score'], 8.0)
+
+    def test_dashboards_read_rollups_until_max_age_forces_live(self):
+        from apps.learning.models import CourseAnalyticsRollup
+
+        CourseAnalyticsRollup.objects.update(enrollments_total=100)
+        rows = self.client.get(TOP_COURSE_PERFORMANCE_URL, **_auth(self.manager)).json()
+        self.assertEqual(rows[0]['enrollments'], 100)
+        rows = self.client.get(
+            f'{TOP_COURSE_PERFORMANCE_URL}?max_age=0', **_auth(self.manager),
+        ).json()
+        self.assertEqual(rows[0]['enrollments'], 3)
+
+    def test_signal_deltas_keep_rollups_current(self):
+        from apps.learning.analytics_rollups import rebuild_rollups
+
+        enrollment = Enrollment.objects.get(pk=self.enrollments[1].pk)
+        enrollment.status = Enrollment.Status.COMPLETED
+        enrollment.completed_at = timezone.now()
+        enrollment.progress_percentage = Decimal('100')
+        enrollment.save()
+        self.enrollments[2].delete()
+        submission = QuizSubmission.objects.create(
+            enrollment=self.enrollments[1], quiz=self.quiz, max_score=Decimal('10'),
+        )
+        submission.score = Decimal('4')
+        submission.save(update_fields=['score'])
+
+        stats = self._stats()
+        self.assertEqual(stats['total_courses_in_progress'], 1)
+        self.assertEqual(stats['total_completed_courses'], 1)
+        self.assertEqual(stats['avg_completion_rate'], 65.0)
+        self.assertEqual(stats['avg_quiz_score'], 6.0)
+        trends = self.client.get(ENROLLMENT_TRENDS_URL, **_auth(self.manager)).json()
+        self.assertEqual((sum(trends['enrollments']), sum(trends['completions'])), (2, 1))
+
+        live = self._stats('?max_age=0')
+        rebuild_rollups()
+        self.assertEqual(self._stats(), live)
+
+
 class EnrollmentListScopeAndFiltersTest(APITestCase):
     """GET /api/v1/learning/enrollments/ role-scoped queryset, status filter, pagination."""
 
@@ -1325,6 +1620,157 @@ CERTIFICATES_URL = '/api/v1/learning/certificates/'
 CERTIFICATES_STATS_URL = '/api/v1/learning/certificates/stats/'
 
 
+class BulkEnrollmentTest(APITestCase):
+    """POST /enrollments/bulk/ queues a batched enrollment job; side effects run once per job."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        from apps.learning.badge_engine import invalidate_badge_index
+
+        # Seat usage and badge criteria are cached across tests
+        cache.clear()
+        invalidate_badge_index()
+        self.org = Organization.objects.create(name='Bulk Org', slug='bulk-org', max_seats=10)
+        self.other_org = Organization.objects.create(name='Bulk Other', slug='bulk-other')
+        self.manager = User.objects.create_user(
+            username='bulk_mgr', email='bulk_mgr@example.com', password='pass1234', role=User.Role.LMS_MANAGER
+        )
+        self.org_admin = User.objects.create_user(
+            username='bulk_oa', email='bulk_oa@example.com', password='pass1234', role=User.Role.ORG_ADMIN
+        )
+        Membership.objects.create(user=self.org_admin, organization=self.org, role=Membership.Role.ORG_ADMIN)
+        self.sales = [self._member(f'sales{i}', 'Sales') for i in range(3)]
+        self.ops = self._member('ops0', 'Ops')
+        self.former = self._member('former0', 'Sales', is_active=False)
+        self.outsider = User.objects.create_user(
+            username='bulk_out', email='bulk_out@example.com', password='pass1234'
+        )
+        cat = Category.objects.create(name='Bulk Cat', slug='bulk-cat')
+        self.course = Course.objects.create(
+            title='Bulk Course', description='d', slug='bulk-course', status='published', category=cat
+        )
+        Enrollment.objects.create(user=self.sales[0], course=self.course, organization=self.org)
+
+    def _member(self, username, department, is_active=True):
+        user = User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='pass1234'
+        )
+        Membership.objects.create(
+            user=user, organization=self.org, department=department, is_active=is_active
+        )
+        return user
+
+    def _bulk(self, user, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'{ENROLLMENTS_URL}bulk/', payload, format='json', **_auth(user))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED, response.content)
+        response = self.client.get(f"{ENROLLMENTS_URL}bulk/{response.data['job_id']}/", **_auth(user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_manager_enrolls_department_in_batches_with_one_side_effects_pass(self):
+        from django.test import override_settings
+
+        from apps.learning.models import CourseAnalyticsRollup, UserBadgeStats
+        from apps.notifications.models import Notification
+
+        with override_settings(BULK_ENROLLMENT_BATCH_SIZE=2):
+            data = self._bulk(
+                self.manager,
+                {'course': self.course.pk, 'organization': self.org.pk, 'department': 'sales'},
+            )
+
+        self.assertEqual(data['status'], 'completed')
+        self.assertEqual(
+            (data['total'], data['processed'], data['enrolled'], data['already_enrolled'], data['failed']),
+            (3, 3, 2, 1, 0),
+        )
+        new_users = {self.sales[1].pk, self.sales[2].pk}
+        self.assertEqual(
+            set(
+                Enrollment.objects.filter(course=self.course, organization=self.org)
+                .exclude(user=self.sales[0])
+                .values_list('user_id', flat=True)
+            ),
+            new_users,
+        )
+        self.assertEqual(
+            set(UserBadgeStats.objects.filter(enrollments_count=1).values_list('user_id', flat=True)),
+            new_users | {self.sales[0].pk},
+        )
+        self.assertEqual(
+            set(Notification.objects.filter(title='Enrolled in course').values_list('user_id', flat=True)),
+            new_users,
+        )
+        rollup = CourseAnalyticsRollup.objects.get(course=self.course, organization=self.org)
+        self.assertEqual((rollup.enrollments_total, rollup.active_count), (3, 3))
+
+    def test_org_admin_is_limited_to_own_members(self):
+        data = self._bulk(
+            self.org_admin,
+            {
+                'course': self.course.pk,
+                'organization': self.other_org.pk,
+                'user_ids': [self.ops.pk, self.outsider.pk, self.former.pk, self.ops.pk],
+            },
+        )
+        self.assertEqual((data['organization'], data['enrolled'], data['failed']), (self.org.pk, 1, 2))
+        self.assertEqual(
+            [error['user_id'] for error in data['errors']], [self.outsider.pk, self.former.pk]
+        )
+        self.assertTrue(Enrollment.objects.filter(user=self.ops, course=self.course).exists())
+
+        # Jobs are only visible to their creator and platform admins
+        response = self.client.get(f"{ENROLLMENTS_URL}bulk/{data['job_id']}/", **_auth(self.ops))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_concurrent_enrollment_is_not_counted_as_created(self):
+        from apps.learning import bulk_enrollment
+        from apps.notifications.models import Notification
+
+        real_lookup = bulk_enrollment._enrolled_user_ids
+        calls = []
+
+        def enrolled_user_ids(job, user_ids):
+            # The first check misses sales0's enrollment, as if it committed right after
+            calls.append(user_ids)
+            return set() if len(calls) == 1 else real_lookup(job, user_ids)
+
+        with patch('apps.learning.bulk_enrollment._enrolled_user_ids', side_effect=enrolled_user_ids):
+            data = self._bulk(
+                self.manager,
+                {'course': self.course.pk, 'user_ids': [self.sales[0].pk, self.sales[1].pk]},
+            )
+
+        self.assertEqual(data['status'], 'completed')
+        self.assertEqual((data['enrolled'], data['already_enrolled']), (1, 1))
+        self.assertEqual(
+            set(Notification.objects.filter(title='Enrolled in course').values_list('user_id', flat=True)),
+            {self.sales[1].pk},
+        )
+
+    def test_organization_over_seat_limit_is_refused(self):
+        self.org.max_seats = 3
+        self.org.save()
+        response = self.client.post(
+            f'{ENROLLMENTS_URL}bulk/',
+            {'course': self.course.pk, 'organization': self.org.pk},
+            format='json',
+            **_auth(self.manager),
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_learner_forbidden(self):
+        response = self.client.post(
+            f'{ENROLLMENTS_URL}bulk/',
+            {'course': self.course.pk, 'user_ids': [self.ops.pk]},
+            format='json',
+            **_auth(self.ops),
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class CertificateViewSetScopeTest(APITestCase):
     """GET certificates list/retrieve/latest/stats: role scope, search, course filter, pagination."""
 
@@ -1572,7 +2018,418 @@ class CertificateViewSetScopeTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total'], 3)
 
+    def test_stats_single_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(CERTIFICATES_STATS_URL, **_auth(self.lms_manager))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        queries = [q['sql'] for q in ctx.captured_queries if 'FROM "learning_certificate"' in q['sql']]
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['total'], 3)
+
     def test_stats_org_admin_no_membership_zero(self):
         response = self.client.get(CERTIFICATES_STATS_URL, **_auth(self.org_admin_no_membership))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total'], 0)
+
+
+class CertificateVerificationTest(APITestCase):
+    """Public verification reads through a cache and rejects forged links without a lookup."""
+
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.learner = User.objects.create_user(
+            username='verify_learner', email='verify_learner@example.com', password='pass1234',
+            first_name='Vera', last_name='Fied',
+        )
+        cat = Category.objects.create(name='Verify Cat', slug='verify-cat')
+        self.course = Course.objects.create(
+            title='Verify Course', description='d', slug='verify-course', status='published', category=cat
+        )
+        self.certificate = Certificate.objects.create(
+            enrollment=Enrollment.objects.create(user=self.learner, course=self.course),
+            expiry_date=timezone.now() + timedelta(days=365),
+        )
+
+    def _verify(self, number, sig=None):
+        params = {'number': number}
+        if sig is not None:
+            params['sig'] = sig
+        return self.client.get(f'{CERTIFICATES_URL}verify/', params)
+
+    def test_verify_is_cached_signed_and_invalidated_on_change(self):
+        from urllib.parse import parse_qs, urlsplit
+
+        from apps.learning import certificate_verification
+
+        url = certificate_verification.verification_url(self.certificate.certificate_number)
+        query = parse_qs(urlsplit(url).query)
+        number, sig = query['number'][0], query['sig'][0]
+
+        response = self._verify(number, sig)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            (response.data['user_name'], response.data['course_title'], response.data['verified']),
+            ('Vera Fied', 'Verify Course', True),
+        )
+        self.assertNotIn('user_email', response.data)
+        self.assertIn('public', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self._verify(number, sig).status_code, status.HTTP_200_OK)
+            self.assertEqual(self._verify(number, 'forged').status_code, status.HTTP_404_NOT_FOUND)
+
+        self.certificate.is_valid = False
+        self.certificate.save(update_fields=['is_valid'])
+        response = self._verify(number)
+        self.assertEqual((response.data['is_valid'], response.data['verified']), (False, False))
+
+    def test_verify_batch_fills_cache_misses_in_one_query(self):
+        from apps.learning import certificate_verification
+
+        number = self.certificate.certificate_number
+        other = Certificate.objects.create(
+            enrollment=Enrollment.objects.create(
+                user=User.objects.create_user(
+                    username='verify_other', email='verify_other@example.com', password='pass1234'
+                ),
+                course=self.course,
+            ),
+            expiry_date=timezone.now() - timedelta(days=1),
+        )
+        payload = {
+            'certificates': [
+                {'number': number, 'sig': certificate_verification.sign(number)},
+                'TASC-UNKNOWN',
+                {'number': other.certificate_number, 'sig': 'forged'},
+                other.certificate_number,
+            ]
+        }
+        with self.assertNumQueries(1):
+            response = self.client.post(f'{CERTIFICATES_URL}verify/batch/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([result['found'] for result in results], [True, False, False, True])
+        self.assertEqual(
+            (results[3]['user_name'], results[3]['is_expired'], results[3]['verified']),
+            ('verify_other@example.com', True, False),
+        )
+
+        with self.assertNumQueries(0):
+            self.client.post(f'{CERTIFICATES_URL}verify/batch/', payload, format='json')
+
+
+class QuizSubmissionGradingTest(APITestCase):
+    """POST /quiz-submissions/ grades from the cached answer keys and bulk-inserts answers."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from apps.catalogue.models import QuizQuestion
+
+        cache.clear()
+        self.client = APIClient()
+        self.course, _, _, _ = _make_assignment_course()
+        quiz_session = Session.objects.create(
+            course=self.course,
+            title='Graded Quiz',
+            order=2,
+            session_type=Session.SessionType.QUIZ,
+        )
+        self.quiz = Quiz.objects.create(session=quiz_session, settings={'passing_score_percent': 50})
+        self.mc = QuizQuestion.objects.create(
+            quiz=self.quiz,
+            order=1,
+            question_type=QuizQuestion.QuestionType.MULTIPLE_CHOICE,
+            question_text='Pick one',
+            points=10,
+            answer_payload={'options': [{'text': 'a'}, {'text': 'b', 'is_correct': True}]},
+        )
+        self.blanks = QuizQuestion.objects.create(
+            quiz=self.quiz,
+            order=2,
+            question_type=QuizQuestion.QuestionType.FILL_BLANK,
+            question_text='Fill',
+            points=10,
+            answer_payload={'blanks': [{'answer': 'Red'}, {'answer': 'Blue'}]},
+        )
+        self.learner = User.objects.create_user(
+            username='quiz_grader',
+            email='quiz_grader@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        _grant_subscription(self.learner)
+        self.enrollment = Enrollment.objects.create(user=self.learner, course=self.course)
+
+    def tearDown(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _submit(self, mc_option, blanks):
+        return self.client.post(
+            QUIZ_SUBMISSIONS_URL,
+            {
+                'enrollment': self.enrollment.id,
+                'quiz': self.quiz.id,
+                'answers': [
+                    {'question': self.mc.id, 'selected_answer': {'selected_option': mc_option}},
+                    {'question': self.blanks.id, 'selected_answer': {'blanks': blanks}},
+                    {'question': 999999, 'selected_answer': {}},
+                ],
+            },
+            format='json',
+            **_auth(self.learner),
+        )
+
+    def test_submission_graded_and_answers_bulk_inserted(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self._submit(1, [' red ', 'green'])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        submission = QuizSubmission.objects.get(pk=response.json()['id'])
+        self.assertEqual(submission.score, Decimal('15'))
+        self.assertEqual(submission.max_score, Decimal('20'))
+        self.assertTrue(submission.passed)
+        answers = {a.question_id: a for a in submission.answers.all()}
+        self.assertEqual(set(answers), {self.mc.id, self.blanks.id})
+        self.assertTrue(answers[self.mc.id].is_correct)
+        self.assertFalse(answers[self.blanks.id].is_correct)
+        self.assertEqual(answers[self.blanks.id].points_awarded, Decimal('5'))
+
+        answer_inserts = [
+            q for q in ctx.captured_queries
+            if q['sql'].startswith('INSERT INTO "learning_quizanswer"')
+        ]
+        self.assertEqual(len(answer_inserts), 1)
+
+    def test_question_edit_retires_cached_answer_keys(self):
+        self.assertEqual(self._submit(1, []).json()['score'], '10.00')
+
+        self.mc.answer_payload = {'options': [{'text': 'a', 'is_correct': True}, {'text': 'b'}]}
+        self.mc.save()
+        self.assertEqual(self._submit(1, []).json()['score'], '0.00')
+
+
+class BadgeEngineTest(TestCase):
+    """Badge counters are maintained by deltas and evaluated after commit."""
+
+    def setUp(self):
+        from apps.learning.badge_engine import invalidate_badge_index
+        from apps.learning.models import Badge
+
+        self.course, _, _, _ = _make_assignment_course()
+        quiz_session = Session.objects.create(
+            course=self.course,
+            title='Quiz Session',
+            order=2,
+            session_type=Session.SessionType.QUIZ,
+        )
+        self.quiz = Quiz.objects.create(session=quiz_session)
+        self.learner = User.objects.create_user(
+            username='badge_learner',
+            email='badge_learner@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        Badge.objects.create(
+            name='Early Bird', slug='first-enrollment', description='d',
+            category='enrollment', criteria_type='enrollments_count', criteria_value=1,
+        )
+        Badge.objects.create(
+            name='Curious Mind', slug='five-enrollments', description='d',
+            category='enrollment', criteria_type='enrollments_count', criteria_value=5,
+        )
+        Badge.objects.create(
+            name='Perfect Score', slug='perfect-score', description='d',
+            category='assessment', criteria_type='quiz_perfect_score', criteria_value=1,
+        )
+        invalidate_badge_index()
+
+    def _earned_slugs(self):
+        from apps.learning.models import UserBadge
+        return set(
+            UserBadge.objects.filter(user=self.learner).values_list('badge__slug', flat=True)
+        )
+
+    def test_enrollment_awards_badge_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Enrollment.objects.create(user=self.learner, course=self.course)
+        self.assertEqual(self._earned_slugs(), set())
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self._earned_slugs(), {'first-enrollment'})
+
+    def test_stats_seeded_from_history_then_updated_by_deltas(self):
+        from apps.learning.models import UserBadgeStats
+
+        Enrollment.objects.create(user=self.learner, course=self.course)
+        stats = UserBadgeStats.objects.get(user=self.learner)
+        self.assertEqual(stats.enrollments_count, 1)
+
+        other = Course.objects.create(
+            title='Other', description='d', slug='badge-other', status='published',
+        )
+        enrollment = Enrollment.objects.create(user=self.learner, course=other)
+        stats.refresh_from_db()
+        self.assertEqual(stats.enrollments_count, 2)
+
+        enrollment.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.enrollments_count, 1)
+
+    def test_quiz_result_updates_streak_and_perfect_score(self):
+        from apps.learning.models import UserBadgeStats
+
+        enrollment = Enrollment.objects.create(user=self.learner, course=self.course)
+        with self.captureOnCommitCallbacks(execute=True):
+            submission = QuizSubmission.objects.create(
+                enrollment=enrollment, quiz=self.quiz, max_score=Decimal('10'),
+            )
+            submission.score = Decimal('10')
+            submission.passed = True
+            submission.save(update_fields=['score', 'passed'])
+
+        stats = UserBadgeStats.objects.get(user=self.learner)
+        self.assertEqual(stats.quiz_submissions_count, 1)
+        self.assertEqual(stats.quiz_pass_streak, 1)
+        self.assertEqual(stats.quiz_perfect_score, 1)
+        self.assertIn('perfect-score', self._earned_slugs())
+
+        QuizSubmission.objects.create(
+            enrollment=enrollment, quiz=self.quiz, attempt_number=2,
+            max_score=Decimal('10'), score=Decimal('2'), passed=False,
+        )
+        stats.refresh_from_db()
+        self.assertEqual(stats.quiz_submissions_count, 2)
+        self.assertEqual(stats.quiz_pass_streak, 0)
+
+    def test_scored_submission_for_user_without_stats_counts_once(self):
+        from apps.learning.models import UserBadgeStats
+
+        enrollment = Enrollment.objects.create(user=self.learner, course=self.course)
+        QuizSubmission.objects.create(
+            enrollment=enrollment, quiz=self.quiz,
+            max_score=Decimal('10'), score=Decimal('8'), passed=True,
+        )
+        # No stats row yet, as for users predating the counters
+        UserBadgeStats.objects.filter(user=self.learner).delete()
+
+        QuizSubmission.objects.create(
+            enrollment=enrollment, quiz=self.quiz, attempt_number=2,
+            max_score=Decimal('10'), score=Decimal('9'), passed=True,
+        )
+
+        stats = UserBadgeStats.objects.get(user=self.learner)
+        self.assertEqual(stats.quiz_submissions_count, 2)
+        self.assertEqual(stats.quiz_pass_streak, 2)
+
+    def test_incomplete_profile_save_queues_nothing(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.learner.first_name = 'Badge'
+            self.learner.save()
+        self.assertEqual(callbacks, [])
+
+
+class ReportGenerationTest(APITestCase):
+    """Reports stream into storage and record row-count progress."""
+
+    def setUp(self):
+        import tempfile
+
+        from django.test import override_settings
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        media_override = override_settings(MEDIA_ROOT=media.name, REPORT_PROGRESS_ROWS=2)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
+        self.manager = User.objects.create_user(
+            username='report_manager',
+            email='report_manager@example.com',
+            password='pass1234',
+            role=User.Role.LMS_MANAGER,
+            email_verified=True,
+            is_active=True,
+        )
+        instructor = User.objects.create_user(
+            username='report_instructor', email='report_instructor@example.com', password='pass1234',
+        )
+        course = Course.objects.create(title='Report Course', instructor=instructor, status='published')
+        for i in range(3):
+            learner = User.objects.create_user(
+                username=f'report_learner{i}', email=f'report_learner{i}@example.com', password='pass1234',
+            )
+            Enrollment.objects.create(user=learner, course=course)
+
+    def _report(self, report_type, **parameters):
+        from apps.learning.models import Report
+        return Report.objects.create(
+            report_type=report_type, name='r', generated_by=self.manager, parameters=parameters,
+        )
+
+    def _rows(self, report):
+        import csv
+        import io
+        with report.file.open('rb') as f:
+            return list(csv.reader(io.StringIO(f.read().decode())))
+
+    def test_enrollment_report_written_with_progress(self):
+        from apps.learning.models import Report
+        from apps.learning.tasks import generate_report
+
+        report = self._report('enrollment')
+        generate_report(report.id)
+
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.Status.READY)
+        self.assertEqual(report.total_rows, 3)
+        self.assertEqual(report.rows_written, 3)
+        rows = self._rows(report)
+        self.assertEqual(rows[0][:3], ['Learner Name', 'Email', 'Course'])
+        self.assertEqual(
+            sorted(r[1] for r in rows[1:]),
+            [f'report_learner{i}@example.com' for i in range(3)],
+        )
+
+    def test_field_names_select_columns(self):
+        from apps.learning.tasks import generate_report
+        from apps.payments.models import Payment
+
+        Payment.objects.create(
+            user=self.manager, amount=Decimal('10.00'), currency='USD', status='completed',
+        )
+        report = self._report('transactions', field_names=['user_email', 'amount'])
+        generate_report(report.id)
+
+        report.refresh_from_db()
+        self.assertEqual(self._rows(report), [['User Email', 'Amount'], ['report_manager@example.com', '10.00']])
+
+    def test_failed_report_can_be_regenerated(self):
+        from apps.learning.models import Report
+
+        report = self._report('enrollment')
+        Report.objects.filter(pk=report.pk).update(status=Report.Status.FAILED, error_message='boom')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/v1/learning/reports/{report.id}/regenerate/', **_auth(self.manager),
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        report.refresh_from_db()
+        self.assertEqual(report.status, Report.Status.READY)
+        self.assertEqual(report.error_message, '')
+        self.assertEqual(report.rows_written, 3)
@@ -1,6 +1,11 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -17,6 +22,8 @@ from rest_framework.views import APIView
 
 from apps.payments.permissions import HasActiveSubscription
 from apps.accounts.rbac import get_active_membership_organization
+from apps.common.aggregates import bucket_counts
+from apps.common.async_tasks import enqueue_task_on_commit
 
 User = get_user_model()
 
@@ -32,6 +39,16 @@ _ENROLLMENT_ORDERING_WHITELIST = frozenset(
 )
 
 
+# Letter grades reported by SubmissionViewSet.statistics: (label, range, condition)
+GRADE_BANDS = (
+    ("A", "90-100", Q(grade__gte=90)),
+    ("B", "80-89", Q(grade__gte=80, grade__lt=90)),
+    ("C", "70-79", Q(grade__gte=70, grade__lt=80)),
+    ("D", "60-69", Q(grade__gte=60, grade__lt=70)),
+    ("F", "0-59", Q(grade__lt=60)),
+)
+
+
 class EnrollmentPageNumberPagination(PageNumberPagination):
     page_size_query_param = "page_size"
     max_page_size = 100
@@ -42,6 +59,7 @@ class CertificatePageNumberPagination(PageNumberPagination):
     max_page_size = 100
 
 
+from . import bulk_enrollment, certificate_verification, grading
 from .models import (
     Enrollment,
     SessionProgress,
@@ -55,6 +73,9 @@ from .models import (
     QuizAnswer,
     SavedCourse,
     Workshop,
+    CourseAnalyticsRollup,
+    EnrollmentDailyRollup,
+    LearnerActivityRollup,
 )
 
 
@@ -88,6 +109,37 @@ def _analytics_quiz_submission_scope_qs(user):
     return QuizSubmission.objects.filter(enrollment__user=user)
 
 
+def _analytics_rollup_filter(request):
+    """
+    Filter for the analytics rollup rows in the caller's scope, or None when
+    the dashboard should aggregate the raw tables instead: for learners, and
+    when the rollups are older than ``?max_age=`` seconds (``0`` forces live).
+    """
+    from apps.learning import analytics_rollups
+
+    user = request.user
+    role = getattr(user, 'role', None) or ''
+    if role == User.Role.INSTRUCTOR:
+        rollup_filter = {'course__instructor': user}
+    elif role == User.Role.ORG_ADMIN:
+        org = get_active_membership_organization(user)
+        if not org:
+            return None
+        rollup_filter = {'organization': org}
+    elif role in (User.Role.LMS_MANAGER, User.Role.TASC_ADMIN):
+        rollup_filter = {}
+    else:
+        return None
+
+    try:
+        max_age = int(request.query_params.get('max_age', settings.ANALYTICS_ROLLUP_MAX_AGE_SECONDS))
+    except (TypeError, ValueError):
+        max_age = settings.ANALYTICS_ROLLUP_MAX_AGE_SECONDS
+    if not analytics_rollups.is_fresh(max_age):
+        return None
+    return rollup_filter
+
+
 from .serializers import (
     EnrollmentSerializer,
     EnrollmentCreateSerializer,
@@ -297,79 +349,32 @@ class EnrollmentViewSet(
 
     @extend_schema(
         summary="Bulk enroll users",
-        description="Manager only. Enrolls multiple users from the manager's organization into a course.",
+        description=(
+            "LMS managers and org admins. Queues enrollment of a list of users, or of every "
+            "active member of an organization or one of its departments, into a course. "
+            "Org admins are limited to their own organization. Poll bulk/{job_id}/ for progress."
+        ),
         request=BulkEnrollmentSerializer,
         responses={
-            200: OpenApiResponse(description="Bulk enrollment results"),
-            403: OpenApiResponse(description="Not an LMS manager"),
+            202: OpenApiResponse(description="Bulk enrollment queued"),
+            403: OpenApiResponse(description="Not an LMS manager or org admin"),
+            409: OpenApiResponse(description="Organization is over its seat limit"),
         },
     )
     @action(detail=False, methods=["post"])
     def bulk(self, request):
-        from apps.accounts.rbac import is_lms_manager
-        from django.db import transaction
-        from django.contrib.auth import get_user_model
+        return bulk_enrollment.start_bulk_enrollment(request)
 
-        user = request.user
-        role = getattr(user, "role", "")
-        if not is_lms_manager(user) and role != "org_admin":
-            return Response(
-                {"error": "Only LMS Managers and Org Admins can bulk enroll users."},
-                status=status.HTTP_403_FORBIDDEN,
-            )
-
-        serializer = BulkEnrollmentSerializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-
-        course = serializer.validated_data["course"]
-        user_ids = serializer.validated_data["user_ids"]
-
-        User = get_user_model()
-        valid_users = User.objects.filter(
-            id__in=user_ids, organization=user.organization
-        )
-        valid_user_ids = set(valid_users.values_list("id", flat=True))
-
-        existing_enrollments = set(
-            Enrollment.objects.filter(
-                course=course, user_id__in=valid_user_ids
-            ).values_list("user_id", flat=True)
-        )
-
-        new_user_ids = valid_user_ids - existing_enrollments
-
-        enrollments_to_create = [
-            Enrollment(
-                user_id=uid,
-                course=course,
-                organization=user.organization,
-                paid_amount=0,
-                currency="USD",
-            )
-            for uid in new_user_ids
-        ]
-
-        if enrollments_to_create:
-            with transaction.atomic():
-                Enrollment.objects.bulk_create(
-                    enrollments_to_create, ignore_conflicts=True
-                )
-
-        failed = len(user_ids) - len(valid_user_ids)
-
-        return Response(
-            {
-                "enrolled": len(new_user_ids),
-                "already_enrolled": len(existing_enrollments),
-                "failed": failed,
-                "errors": [
-                    "Some users were not found or do not belong to your organization."
-                ]
-                if failed > 0
-                else [],
-            },
-            status=status.HTTP_200_OK,
-        )
+    @extend_schema(
+        summary="Bulk enrollment progress",
+        responses={
+            200: OpenApiResponse(description="Bulk enrollment job progress"),
+            404: OpenApiResponse(description="Job not found"),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path=r"bulk/(?P<job_id>\d+)")
+    def bulk_status(self, request, job_id=None):
+        return bulk_enrollment.job_response(request, job_id)
 
 
 @extend_schema(
@@ -387,8 +392,13 @@ class SessionProgressViewSet(viewsets.ModelViewSet):
             return SessionProgressUpdateSerializer
         return SessionProgressSerializer
 
+    # Fields a video player heartbeat may touch without changing completion.
+    HEARTBEAT_FIELDS = frozenset({"time_spent_seconds", "video_position_seconds"})
+
     def get_queryset(self):
-        qs = SessionProgress.objects.filter(enrollment__user=self.request.user)
+        qs = SessionProgress.objects.filter(
+            enrollment__user=self.request.user
+        ).select_related("enrollment", "session")
 
         enrollment_id = self.request.query_params.get("enrollment")
         if enrollment_id:
@@ -404,19 +414,67 @@ class SessionProgressViewSet(viewsets.ModelViewSet):
 
         return qs
 
-    def _sync_enrollment_rollup(self, instance: SessionProgress) -> None:
-        """Keep enrollment progress and resume fields aligned after SessionProgress writes."""
+    def _sync_enrollment_rollup(self, instance: SessionProgress, was_completed: bool) -> None:
+        """
+        Keep enrollment progress and resume fields aligned after SessionProgress writes.
+
+        Progress only moves when is_completed flips; other writes just touch
+        the resume pointer, and only when it actually changes.
+        """
         enrollment = instance.enrollment
-        enrollment.last_accessed_session = instance.session
-        enrollment.update_progress()
+        counts = instance.session.course_id == enrollment.course_id
+        if counts and instance.is_completed != was_completed:
+            enrollment.record_session_completion(
+                instance.is_completed, session=instance.session
+            )
+        elif enrollment.last_accessed_session_id != instance.session_id:
+            Enrollment.objects.filter(pk=enrollment.pk).update(
+                last_accessed_session=instance.session,
+                last_accessed_at=timezone.now(),
+            )
+            enrollment.last_accessed_session = instance.session
+
+    def _coalesce_heartbeat(self, instance: SessionProgress, data) -> bool:
+        """
+        Absorb a playback heartbeat that arrives within the coalescing window.
+
+        Heartbeats carry cumulative totals, so skipping the write loses nothing
+        that the next persisted heartbeat won't carry. Returns True when the
+        write was skipped.
+        """
+        window = getattr(settings, "SESSION_PROGRESS_HEARTBEAT_SECONDS", 0)
+        if not window or not instance.last_accessed_at:
+            return False
+        if timezone.now() - instance.last_accessed_at >= timedelta(seconds=window):
+            return False
+        for attr, value in data.items():
+            setattr(instance, attr, value)
+        return True
 
     def perform_create(self, serializer):
         instance = serializer.save()
-        self._sync_enrollment_rollup(instance)
+        self._sync_enrollment_rollup(instance, was_completed=False)
 
     def perform_update(self, serializer):
-        instance = serializer.save()
-        self._sync_enrollment_rollup(instance)
+        instance = serializer.instance
+        was_completed = instance.is_completed
+        data = serializer.validated_data
+        is_heartbeat = (
+            set(data) - {"is_completed"} <= self.HEARTBEAT_FIELDS
+            and data.get("is_completed", was_completed) == was_completed
+            and instance.enrollment.last_accessed_session_id == instance.session_id
+        )
+        if is_heartbeat and self._coalesce_heartbeat(instance, data):
+            return
+        with transaction.atomic():
+            completed = data.get("is_completed", was_completed)
+            if completed != was_completed and not SessionProgress.objects.filter(
+                pk=instance.pk, is_completed=was_completed
+            ).update(is_completed=completed):
+                # A concurrent request already applied this flip; don't count it twice.
+                was_completed = completed
+            instance = serializer.save()
+            self._sync_enrollment_rollup(instance, was_completed)
 
     @extend_schema(
         summary="List session progress",
@@ -462,7 +520,7 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
     )
 
     def get_permissions(self):
-        if self.action == "verify":
+        if self.action in ("verify", "verify_batch"):
             return [AllowAny()]
         return super().get_permissions()
 
@@ -566,9 +624,16 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
 
     @extend_schema(
         summary="Verify certificate",
-        description="Verify a certificate by its number",
+        description=(
+            "Public. Verify a certificate by its number. Pass the sig from the certificate's "
+            "verification_url to have forged links rejected without a lookup."
+        ),
+        parameters=[
+            OpenApiParameter(name="number", type=str, required=True),
+            OpenApiParameter(name="sig", type=str, description="Signature from verification_url"),
+        ],
         responses={
-            200: CertificateSerializer,
+            200: OpenApiResponse(description="Certificate verification"),
             404: OpenApiResponse(description="Certificate not found"),
         },
     )
@@ -582,15 +647,64 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        try:
-            certificate = Certificate.objects.get(certificate_number=certificate_number)
-            serializer = self.get_serializer(certificate)
-            return Response(serializer.data)
-        except Certificate.DoesNotExist:
+        sig = request.query_params.get("sig")
+        payload = None
+        if sig is None or certificate_verification.signature_matches(certificate_number, sig):
+            payload = certificate_verification.lookup([certificate_number]).get(certificate_number)
+        if payload is None:
             return Response(
                 {"error": "Certificate not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
+        response = Response(payload)
+        patch_cache_control(
+            response, public=True, max_age=settings.CERTIFICATE_VERIFY_MAX_AGE
+        )
+        return response
+
+    @extend_schema(
+        summary="Verify certificates in bulk",
+        description=(
+            "Public. Verify up to CERTIFICATE_VERIFY_BATCH_MAX certificates at once. "
+            "Each item is a certificate number or {number, sig}; results keep the request order."
+        ),
+        responses={
+            200: OpenApiResponse(description="One result per requested certificate"),
+            400: OpenApiResponse(description="Invalid request"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="verify/batch")
+    def verify_batch(self, request):
+        items = request.data.get("certificates") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "certificates must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > settings.CERTIFICATE_VERIFY_BATCH_MAX:
+            return Response(
+                {"error": f"At most {settings.CERTIFICATE_VERIFY_BATCH_MAX} certificates per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        requested = []
+        for item in items:
+            number, sig = (item.get("number"), item.get("sig")) if isinstance(item, dict) else (item, None)
+            number = str(number or "")
+            signed = sig is None or certificate_verification.signature_matches(number, sig)
+            requested.append((number, bool(number) and signed))
+
+        payloads = certificate_verification.lookup(
+            [number for number, checkable in requested if checkable]
+        )
+        results = [
+            {**payloads[number], "found": True}
+            if checkable and number in payloads
+            else {"certificate_number": number, "found": False}
+            for number, checkable in requested
+        ]
+        return Response({"results": results})
+
     @extend_schema(
         summary="Regenerate certificate",
         description=(
@@ -628,9 +742,8 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
             enrollment=enrollment,
             expiry_date=timezone.now() + __import__("datetime").timedelta(days=365),
         )
-        from django.conf import settings as _settings
-        new_cert.verification_url = (
-            f"{_settings.FRONTEND_URL}/verify-certificate?number={new_cert.certificate_number}"
+        new_cert.verification_url = certificate_verification.verification_url(
+            new_cert.certificate_number
         )
         new_cert.save(update_fields=["verification_url"])
 
@@ -665,17 +778,22 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
         now = timezone.now()
         start_of_month = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-        total = all_certs.count()
-        this_month = all_certs.filter(issued_at__gte=start_of_month).count()
-        total_courses = all_certs.values("enrollment__course").distinct().count()
-        valid = all_certs.filter(is_valid=True).count()
+        counts = bucket_counts(
+            all_certs,
+            {
+                "total": None,
+                "this_month": Q(issued_at__gte=start_of_month),
+                "valid": Q(is_valid=True),
+            },
+            total_courses_with_certs=Count("enrollment__course", distinct=True),
+        )
 
         return Response(
             {
-                "total": total,
-                "this_month": this_month,
-                "total_courses_with_certs": total_courses,
-                "valid": valid,
+                "total": counts["total"],
+                "this_month": counts["this_month"],
+                "total_courses_with_certs": counts["total_courses_with_certs"],
+                "valid": counts["valid"],
             }
         )
 
@@ -705,8 +823,7 @@ class CertificateViewSet(viewsets.ReadOnlyModelViewSet):
             enrollment=enrollment,
             status=Certificate.Status.PENDING,
         )
-        from django.conf import settings as _settings
-        cert.verification_url = f"{_settings.FRONTEND_URL}/verify-certificate?number={cert.certificate_number}"
+        cert.verification_url = certificate_verification.verification_url(cert.certificate_number)
         cert.save(update_fields=["verification_url"])
         serializer = self.get_serializer(cert)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
@@ -1186,10 +1303,34 @@ class ReportViewSet(
             parameters=serializer.validated_data.get("parameters", {}),
         )
 
-        generate_report.delay(report.id)
+        enqueue_task_on_commit(generate_report, report.id)
 
         return Response(ReportSerializer(report).data, status=status.HTTP_201_CREATED)
 
+    @extend_schema(
+        summary="Regenerate report",
+        description="Restart generation of a failed report",
+    )
+    @action(detail=True, methods=["post"])
+    def regenerate(self, request, pk=None):
+        """Restart a failed report from scratch"""
+        from .tasks import generate_report
+
+        report = self.get_object()
+        if report.status != Report.Status.FAILED:
+            return Response(
+                {"error": "Only failed reports can be regenerated"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        report.status = Report.Status.PROCESSING
+        report.error_message = ""
+        report.rows_written = 0
+        report.save(update_fields=["status", "error_message", "rows_written"])
+        enqueue_task_on_commit(generate_report, report.id)
+
+        return Response(ReportSerializer(report).data)
+
     @extend_schema(
         summary="Download report",
         description="Download a generated report file",
@@ -1314,6 +1455,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         submission.graded_at = timezone.now()
         submission.graded_by = request.user
         submission.save()
+        grading.notify_graded([submission])
 
         return Response(SubmissionSerializer(submission).data)
 
@@ -1325,7 +1467,7 @@ class SubmissionViewSet(viewsets.ModelViewSet):
     def statistics(self, request):
         """Get grade distribution for a course"""
         from django.contrib.auth import get_user_model
-        from django.db.models import Avg, Count, Q
+        from django.db.models import Avg
 
         User = get_user_model()
 
@@ -1347,38 +1489,24 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             else:
                 submissions = submissions.none()
 
-        total = submissions.count()
-        graded = submissions.exclude(grade__isnull=True).count()
+        counts = bucket_counts(
+            submissions,
+            {
+                "total": None,
+                "graded": Q(grade__isnull=False),
+                **{label: condition for label, _, condition in GRADE_BANDS},
+            },
+            average=Avg("grade"),
+        )
+        total = counts["total"]
+        graded = counts["graded"]
         pending = total - graded
 
-        avg_grade = submissions.aggregate(Avg("grade"))["grade__avg"] or 0
+        avg_grade = counts["average"] or 0
 
         distribution = [
-            {
-                "range": "90-100",
-                "label": "A",
-                "count": submissions.filter(grade__gte=90).count(),
-            },
-            {
-                "range": "80-89",
-                "label": "B",
-                "count": submissions.filter(grade__gte=80, grade__lt=90).count(),
-            },
-            {
-                "range": "70-79",
-                "label": "C",
-                "count": submissions.filter(grade__gte=70, grade__lt=80).count(),
-            },
-            {
-                "range": "60-69",
-                "label": "D",
-                "count": submissions.filter(grade__gte=60, grade__lt=70).count(),
-            },
-            {
-                "range": "0-59",
-                "label": "F",
-                "count": submissions.filter(grade__lt=60).count(),
-            },
+            {"range": grade_range, "label": label, "count": counts[label]}
+            for label, grade_range, _ in GRADE_BANDS
         ]
 
         for d in distribution:
@@ -1431,22 +1559,29 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             quiz_qs = quiz_qs.filter(enrollment__organization=org)
         # instructor, lms_manager, tasc_admin: platform-wide (matches submission list visibility)
 
-        total_assignments = submissions_qs.count()
-        graded = submissions_qs.filter(status=Submission.Status.GRADED).count()
-        pending = submissions_qs.filter(status=Submission.Status.SUBMITTED).count()
-        avg_grade = (
-            submissions_qs.filter(
-                status=Submission.Status.GRADED, grade__isnull=False
-            ).aggregate(avg=Avg("grade"))["avg"]
-            or 0
+        graded_filter = Q(status=Submission.Status.GRADED)
+        assignment_counts = bucket_counts(
+            submissions_qs,
+            {
+                "total": None,
+                "graded": graded_filter,
+                "pending": Q(status=Submission.Status.SUBMITTED),
+            },
+            average=Avg("grade", filter=graded_filter & Q(grade__isnull=False)),
         )
+        total_assignments = assignment_counts["total"]
+        graded = assignment_counts["graded"]
+        pending = assignment_counts["pending"]
+        avg_grade = assignment_counts["average"] or 0
 
-        total_quizzes = quiz_qs.count()
-        avg_quiz_score = quiz_qs.aggregate(avg=Avg("score"))["avg"] or 0
+        quiz_counts = bucket_counts(
+            quiz_qs, {"total": None, "passed": Q(passed=True)}, average=Avg("score")
+        )
+        total_quizzes = quiz_counts["total"]
+        avg_quiz_score = quiz_counts["average"] or 0
         quiz_pass_rate = 0
         if total_quizzes > 0:
-            passed = quiz_qs.filter(passed=True).count()
-            quiz_pass_rate = round((passed / total_quizzes) * 100, 1)
+            quiz_pass_rate = round((quiz_counts["passed"] / total_quizzes) * 100, 1)
 
         return Response(
             {
@@ -1471,6 +1606,15 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         from django.contrib.auth import get_user_model
 
         User = get_user_model()
+        if getattr(request.user, "role", None) not in (
+            User.Role.INSTRUCTOR,
+            User.Role.LMS_MANAGER,
+            User.Role.TASC_ADMIN,
+        ):
+            return Response(
+                {"detail": "Only instructors and admins can grade submissions."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
 
         grades_data = request.data.get("grades", [])
         if not grades_data:
@@ -1479,55 +1623,9 @@ class SubmissionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        results = []
-        graded_count = 0
-
-        for grade_item in grades_data:
-            submission_id = grade_item.get("submission_id")
-            grade = grade_item.get("grade")
-            feedback = grade_item.get("feedback", "")
-
-            if not submission_id or grade is None:
-                results.append(
-                    {
-                        "submission_id": submission_id,
-                        "status": "error",
-                        "error": "submission_id and grade are required",
-                    }
-                )
-                continue
-
-            try:
-                submission = Submission.objects.get(id=submission_id)
-            except Submission.DoesNotExist:
-                results.append(
-                    {
-                        "submission_id": submission_id,
-                        "status": "error",
-                        "error": "Submission not found",
-                    }
-                )
-                continue
-
-            if submission.status != Submission.Status.SUBMITTED:
-                results.append(
-                    {
-                        "submission_id": submission_id,
-                        "status": "error",
-                        "error": "Only submitted submissions can be graded",
-                    }
-                )
-                continue
-
-            submission.grade = grade
-            submission.feedback = feedback
-            submission.status = Submission.Status.GRADED
-            submission.graded_at = timezone.now()
-            submission.graded_by = request.user
-            submission.save()
-
-            results.append({"submission_id": submission_id, "status": "success"})
-            graded_count += 1
+        graded_count, results = grading.bulk_grade(
+            self.get_queryset(), grades_data, request.user
+        )
 
         return Response({"graded": graded_count, "results": results})
 
@@ -1610,7 +1708,7 @@ class QuizSubmissionViewSet(
         )
 
 
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, Q, Sum
 from django.db.models.functions import TruncMonth
 from datetime import timedelta
 
@@ -1627,24 +1725,32 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
         start_date = timezone.now() - timedelta(days=months * 30)
 
         user = request.user
-        base_qs = _analytics_enrollment_scope_qs(user).filter(enrolled_at__gte=start_date)
-
-        # Enrolls by month
-        enrolls = (
-            base_qs.annotate(month=TruncMonth("enrolled_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
+        rollup_filter = _analytics_rollup_filter(request)
+        if rollup_filter is not None:
+            daily = EnrollmentDailyRollup.objects.filter(
+                date__gte=timezone.localdate(start_date), **rollup_filter
+            ).annotate(month=TruncMonth("date"))
+            enrolls = daily.values("month").annotate(count=Sum("enrollments")).order_by("month")
+            comps = daily.values("month").annotate(count=Sum("completions")).order_by("month")
+        else:
+            base_qs = _analytics_enrollment_scope_qs(user).filter(enrolled_at__gte=start_date)
+
+            # Enrolls by month
+            enrolls = (
+                base_qs.annotate(month=TruncMonth("enrolled_at"))
+                .values("month")
+                .annotate(count=Count("id"))
+                .order_by("month")
+            )
 
-        # Completions by month
-        comps = (
-            base_qs.filter(status="completed")
-            .annotate(month=TruncMonth("completed_at"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
-        )
+            # Completions by month
+            comps = (
+                base_qs.filter(status="completed")
+                .annotate(month=TruncMonth("completed_at"))
+                .values("month")
+                .annotate(count=Count("id"))
+                .order_by("month")
+            )
 
         # Build consistent month list
         labels_map = {}
@@ -1675,15 +1781,12 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
     @action(detail=False, methods=["get"], url_path="learning-stats")
     def learning_stats(self, request):
         user = request.user
-        base_qs = _analytics_enrollment_scope_qs(user)
+        rollup_filter = _analytics_rollup_filter(request)
+        if rollup_filter is not None:
+            return Response(self._learning_stats_from_rollups(user, rollup_filter))
 
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        active_learners = (
-            base_qs.filter(last_accessed_at__gte=thirty_days_ago)
-            .values("user")
-            .distinct()
-            .count()
-        )
+        base_qs = _analytics_enrollment_scope_qs(user)
+        total_learners, active_learners = self._learner_counts(base_qs)
 
         avg_completion = base_qs.aggregate(avg=Avg("progress_percentage"))["avg"] or 0.0
 
@@ -1692,8 +1795,6 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
 
         quiz_qs = _analytics_quiz_submission_scope_qs(user)
 
-        avg_quiz = quiz_qs.aggregate(avg=Avg('score'))['avg'] or 0.0
-
         avg_quiz = quiz_qs.aggregate(avg=Avg("score"))["avg"] or 0.0
 
         return Response(
@@ -1707,6 +1808,49 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
             }
         )
 
+    @staticmethod
+    def _learner_counts(base_qs):
+        """Distinct learners in ``base_qs``, in total and active in the last 30 days."""
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        counts = base_qs.aggregate(
+            total=Count("user", distinct=True),
+            active=Count("user", distinct=True, filter=Q(last_accessed_at__gte=thirty_days_ago)),
+        )
+        return counts["total"], counts["active"]
+
+    def _learning_stats_from_rollups(self, user, rollup_filter):
+        totals = CourseAnalyticsRollup.objects.filter(**rollup_filter).aggregate(
+            enrollments=Sum("enrollments_total", default=0),
+            active=Sum("active_count", default=0),
+            completed=Sum("completed_count", default=0),
+            progress=Sum("progress_sum", default=0),
+            quiz_scored=Sum("quiz_scored_count", default=0),
+            quiz_score=Sum("quiz_score_sum", default=0),
+        )
+        if "course__instructor" in rollup_filter:
+            # Learners overlap across courses, so instructors' distinct counts stay live.
+            total_learners, active_learners = self._learner_counts(
+                _analytics_enrollment_scope_qs(user)
+            )
+        else:
+            learners = LearnerActivityRollup.objects.filter(
+                organization=rollup_filter.get("organization")
+            ).first()
+            total_learners = learners.total_learners if learners else 0
+            active_learners = learners.active_learners if learners else 0
+
+        enrollments, quiz_scored = totals["enrollments"], totals["quiz_scored"]
+        avg_completion = totals["progress"] / enrollments if enrollments else 0.0
+        avg_quiz = totals["quiz_score"] / quiz_scored if quiz_scored else 0.0
+        return {
+            "total_learners": total_learners,
+            "active_learners": active_learners,
+            "avg_completion_rate": round(avg_completion, 1),
+            "total_courses_in_progress": totals["active"],
+            "total_completed_courses": totals["completed"],
+            "avg_quiz_score": round(avg_quiz, 1),
+        }
+
     @action(detail=False, methods=["get"], url_path="top-course-performance")
     def top_course_performance(self, request):
         """Per-course enrollment and completion aggregates for analytics dashboards."""
@@ -1723,13 +1867,6 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
             base_qs = Enrollment.objects.all()
         elif role == User.Role.INSTRUCTOR:
             base_qs = Enrollment.objects.filter(course__instructor=user)
-        elif user.role == "lms_manager":
-            from apps.accounts.models import get_active_membership_organization
-            org = get_active_membership_organization(user)
-            if org:
-                base_qs = Enrollment.objects.filter(organization=org)
-            else:
-                base_qs = Enrollment.objects.none()
         else:
             raise PermissionDenied(
                 "You do not have permission to access this resource."
@@ -1741,14 +1878,27 @@ class LearningAnalyticsViewSet(viewsets.ViewSet):
             limit = 5
         limit = max(1, min(limit, 50))
 
-        rows = (
-            base_qs.values("course_id", "course__title")
-            .annotate(
-                enrollments=Count("id"),
-                completed=Count("id", filter=Q(status="completed")),
+        rollup_filter = _analytics_rollup_filter(request)
+        if rollup_filter is not None:
+            rows = (
+                CourseAnalyticsRollup.objects.filter(**rollup_filter)
+                .values("course_id", "course__title")
+                .annotate(
+                    enrollments=Sum("enrollments_total"),
+                    completed=Sum("completed_count"),
+                )
+                .filter(enrollments__gt=0)
+                .order_by("-enrollments")[:limit]
+            )
+        else:
+            rows = (
+                base_qs.values("course_id", "course__title")
+                .annotate(
+                    enrollments=Count("id"),
+                    completed=Count("id", filter=Q(status="completed")),
+                )
+                .order_by("-enrollments")[:limit]
             )
-            .order_by("-enrollments")[:limit]
-        )
 
         data = []
         for row in rows:
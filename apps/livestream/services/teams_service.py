@@ -6,6 +6,8 @@ import logging
 from datetime import timedelta
 from django.conf import settings
 
+from apps.common.http_client import ProviderClient, TokenCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,12 +26,16 @@ class TeamsService:
 
     GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
 
+    http = ProviderClient("teams")
+
     def __init__(self):
         self.tenant_id = getattr(settings, 'TEAMS_TENANT_ID', '')
         self.client_id = getattr(settings, 'TEAMS_CLIENT_ID', '')
         self.client_secret = getattr(settings, 'TEAMS_CLIENT_SECRET', '')
         self.organizer_user_id = getattr(settings, 'TEAMS_ORGANIZER_USER_ID', '')
-        self._access_token = None
+        self._token = TokenCache(
+            f"teams_access_token:{self.tenant_id}:{self.client_id}", self._fetch_access_token
+        )
 
     # ------------------------------------------------------------------
     # Authentication
@@ -42,11 +48,9 @@ class TeamsService:
         Returns:
             str: Bearer access token
         """
-        if self._access_token:
-            return self._access_token
-
-        import requests
+        return self._token.get()
 
+    def _fetch_access_token(self):
         token_url = (
             f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
         )
@@ -57,10 +61,10 @@ class TeamsService:
             "scope": "https://graph.microsoft.com/.default",
         }
 
-        response = requests.post(token_url, data=payload, timeout=30)
+        response = self.http.post(token_url, data=payload)
         response.raise_for_status()
-        self._access_token = response.json()["access_token"]
-        return self._access_token
+        data = response.json()
+        return data["access_token"], data.get("expires_in", 3599)
 
     def _headers(self):
         """Return authorised request headers."""
@@ -96,7 +100,6 @@ class TeamsService:
         Raises:
             Exception: If Microsoft Graph API call fails
         """
-        import requests
 
         start_time = session_data["start_time"]
         duration = session_data.get("duration", 60)
@@ -130,7 +133,7 @@ class TeamsService:
         )
 
         try:
-            resp = requests.post(
+            resp = self.http.post(
                 url, json=body, headers=self._headers(), timeout=30
             )
             resp.raise_for_status()
@@ -166,7 +169,6 @@ class TeamsService:
         Raises:
             Exception: If Microsoft Graph API call fails
         """
-        import requests
 
         body = {}
         if "topic" in session_data:
@@ -184,7 +186,7 @@ class TeamsService:
         )
 
         try:
-            resp = requests.patch(
+            resp = self.http.patch(
                 url, json=body, headers=self._headers(), timeout=30
             )
             resp.raise_for_status()
@@ -213,7 +215,6 @@ class TeamsService:
         Raises:
             Exception: If Microsoft Graph API call fails
         """
-        import requests
 
         url = (
             f"{self.GRAPH_BASE_URL}/users/{self.organizer_user_id}"
@@ -221,7 +222,7 @@ class TeamsService:
         )
 
         try:
-            resp = requests.delete(
+            resp = self.http.delete(
                 url, headers=self._headers(), timeout=30
             )
             resp.raise_for_status()
@@ -245,7 +246,6 @@ class TeamsService:
         Raises:
             Exception: If Microsoft Graph API call fails
         """
-        import requests
 
         url = (
             f"{self.GRAPH_BASE_URL}/users/{self.organizer_user_id}"
@@ -253,7 +253,7 @@ class TeamsService:
         )
 
         try:
-            resp = requests.get(
+            resp = self.http.get(
                 url, headers=self._headers(), timeout=30
             )
             resp.raise_for_status()
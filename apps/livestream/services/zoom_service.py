@@ -2,10 +2,8 @@
 Zoom API integration service for livestream sessions.
 Handles automatic meeting creation, management, and webhooks.
 """
-import requests
 import base64
 import json
-import time
 import hashlib
 import hmac
 from datetime import datetime, timedelta
@@ -13,6 +11,8 @@ from django.conf import settings
 from django.utils import timezone
 import jwt
 
+from apps.common.http_client import ProviderClient, TokenCache
+
 
 class ZoomService:
     """
@@ -20,22 +20,23 @@ class ZoomService:
     Handles meeting creation, updates, deletions, and webhooks.
     """
 
+    http = ProviderClient("zoom")
+
     def __init__(self):
         self.api_key = settings.ZOOM_API_KEY
         self.api_secret = settings.ZOOM_API_SECRET
         self.account_id = settings.ZOOM_ACCOUNT_ID
         self.base_url = "https://api.zoom.us/v2"
         self.webhook_secret = settings.ZOOM_WEBHOOK_SECRET
-        self._access_token = None
-        self._token_expiry = 0
+        self._token = TokenCache(f"zoom_access_token:{self.account_id}", self._fetch_access_token)
 
     def _get_access_token(self):
         """
         Get OAuth access token for Zoom API using Server-to-Server OAuth.
         """
-        if self._access_token and time.time() < self._token_expiry:
-            return self._access_token
+        return self._token.get()
 
+    def _fetch_access_token(self):
         url = f"https://zoom.us/oauth/token?grant_type=account_credentials&account_id={self.account_id}"
 
         auth_string = f"{self.api_key}:{self.api_secret}"
@@ -46,13 +47,11 @@ class ZoomService:
             "Content-Type": "application/x-www-form-urlencoded"
         }
 
-        response = requests.post(url, headers=headers)
+        response = self.http.post(url, headers=headers)
 
         if response.status_code == 200:
             data = response.json()
-            self._access_token = data['access_token']
-            self._token_expiry = time.time() + data['expires_in'] - 60
-            return self._access_token
+            return data['access_token'], data['expires_in']
         else:
             raise Exception(f"Failed to get Zoom access token: {response.text}")
 
@@ -113,7 +112,7 @@ class ZoomService:
             meeting_data["type"] = 8
             meeting_data["recurrence"] = session_data['recurrence']
 
-        response = requests.post(
+        response = self.http.post(
             f"{self.base_url}/users/me/meetings",
             headers=headers,
             json=meeting_data
@@ -162,7 +161,7 @@ class ZoomService:
         if 'settings' in session_data:
             meeting_data["settings"] = session_data['settings']
 
-        response = requests.patch(
+        response = self.http.patch(
             f"{self.base_url}/meetings/{meeting_id}",
             headers=headers,
             json=meeting_data
@@ -183,7 +182,7 @@ class ZoomService:
         """
         headers = self._get_headers()
 
-        response = requests.delete(
+        response = self.http.delete(
             f"{self.base_url}/meetings/{meeting_id}",
             headers=headers
         )
@@ -203,7 +202,7 @@ class ZoomService:
         """
         headers = self._get_headers()
 
-        response = requests.get(
+        response = self.http.get(
             f"{self.base_url}/meetings/{meeting_id}",
             headers=headers
         )
@@ -223,7 +222,7 @@ class ZoomService:
         """
         headers = self._get_headers()
 
-        response = requests.get(
+        response = self.http.get(
             f"{self.base_url}/meetings/{meeting_id}/recordings",
             headers=headers
         )
@@ -243,7 +242,7 @@ class ZoomService:
         """
         headers = self._get_headers()
 
-        response = requests.get(
+        response = self.http.get(
             f"{self.base_url}/report/meetings/{meeting_id}/participants",
             headers=headers
         )
@@ -0,0 +1,124 @@
+# Generated by Django 5.1.5 on 2026-10-16 19:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_inbox_state(apps, schema_editor):
+    Conversation = apps.get_model("messaging", "Conversation")
+    ConversationReadState = apps.get_model("messaging", "ConversationReadState")
+    Message = apps.get_model("messaging", "Message")
+    Participant = Conversation.participants.through
+
+    for conversation in Conversation.objects.all().iterator():
+        last = (
+            Message.objects.filter(conversation_id=conversation.pk)
+            .order_by("-created_at", "-id")
+            .first()
+        )
+        if last is not None:
+            Conversation.objects.filter(pk=conversation.pk).update(
+                last_message=last, last_message_at=last.created_at
+            )
+
+        unread_by_sender = dict(
+            Message.objects.filter(conversation_id=conversation.pk, is_read=False)
+            .order_by()
+            .values_list("sender_id")
+            .annotate(n=models.Count("id"))
+        )
+        total_unread = sum(unread_by_sender.values())
+        ConversationReadState.objects.bulk_create(
+            [
+                ConversationReadState(
+                    conversation_id=conversation.pk,
+                    user_id=user_id,
+                    unread_count=total_unread - unread_by_sender.get(user_id, 0),
+                )
+                for user_id in Participant.objects.filter(
+                    conversation_id=conversation.pk
+                ).values_list("user_id", flat=True)
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messaging", "0002_alter_conversation_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ConversationReadState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("unread_count", models.PositiveIntegerField(default=0)),
+                ("last_read_at", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="last_message",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="messaging.message",
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="last_message_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["conversation", "created_at"], name="msg_conv_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["conversation", "is_read"], name="msg_conv_read_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversationreadstate",
+            name="conversation",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="read_states",
+                to="messaging.conversation",
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversationreadstate",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="conversation_read_states",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="conversationreadstate",
+            constraint=models.UniqueConstraint(
+                fields=("conversation", "user"), name="uniq_conversation_read_state"
+            ),
+        ),
+        migrations.RunPython(backfill_inbox_state, migrations.RunPython.noop),
+    ]
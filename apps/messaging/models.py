@@ -5,6 +5,12 @@ User = get_user_model()
 
 class Conversation(models.Model):
     participants = models.ManyToManyField(User, related_name='conversations')
+    # Denormalized from Message so the inbox renders without touching messages;
+    # kept current by apps.messaging.signals.
+    last_message = models.ForeignKey(
+        'Message', null=True, blank=True, on_delete=models.SET_NULL, related_name='+'
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -14,6 +20,31 @@ class Conversation(models.Model):
     def __str__(self):
         return f"Conversation {self.id}"
 
+class ConversationReadState(models.Model):
+    """Per-participant unread counter for a conversation."""
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='read_states')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='conversation_read_states')
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['conversation', 'user'], name='uniq_conversation_read_state'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} in conversation {self.conversation_id}: {self.unread_count} unread"
+
+    @classmethod
+    def ensure(cls, conversation_id, user_ids):
+        """Create missing rows for the given participants."""
+        cls.objects.bulk_create(
+            [cls(conversation_id=conversation_id, user_id=user_id) for user_id in user_ids],
+            ignore_conflicts=True,
+        )
+
 class Message(models.Model):
     conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
@@ -23,6 +54,10 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at'], name='msg_conv_created_idx'),
+            models.Index(fields=['conversation', 'is_read'], name='msg_conv_read_idx'),
+        ]
 
     def __str__(self):
         return f"Message {self.id} from {self.sender.email}"
@@ -21,8 +21,8 @@ class ConversationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Conversation
-        fields = ['id', 'participants', 'participants_details', 'last_message', 'unread_count', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = ['id', 'participants', 'participants_details', 'last_message', 'last_message_at', 'unread_count', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'last_message_at', 'created_at', 'updated_at']
 
     @extend_schema_field(serializers.ListField(child=serializers.JSONField()))
     def get_participants_details(self, obj):
@@ -30,9 +30,8 @@ class ConversationSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.JSONField(allow_null=True))
     def get_last_message(self, obj):
-        last = obj.messages.last()
-        if last:
-            return MessageSerializer(last).data
+        if obj.last_message_id:
+            return MessageSerializer(obj.last_message).data
         return None
 
     @extend_schema_field(serializers.IntegerField)
@@ -40,4 +39,8 @@ class ConversationSerializer(serializers.ModelSerializer):
         request = self.context.get('request')
         if not request or not request.user.is_authenticated:
             return 0
-        return obj.messages.exclude(sender=request.user).filter(is_read=False).count()
+        # Annotated by ConversationViewSet.get_queryset
+        if hasattr(obj, 'user_unread_count'):
+            return obj.user_unread_count
+        state = obj.read_states.filter(user=request.user).values_list('unread_count', flat=True).first()
+        return state or 0
@@ -0,0 +1,56 @@
+from django.db.models import F, Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.messaging.models import Conversation, ConversationReadState, Message
+
+
+@receiver(post_save, sender=Message)
+def record_message_sent(sender, instance, created, **kwargs):
+    if not created:
+        return
+    conversation_id = instance.conversation_id
+
+    # Concurrent sends may commit out of order; never move last_message backwards
+    Conversation.objects.filter(pk=conversation_id).filter(
+        Q(last_message_at__isnull=True) | Q(last_message_at__lte=instance.created_at)
+    ).update(
+        last_message=instance,
+        last_message_at=instance.created_at,
+        updated_at=timezone.now(),
+    )
+
+    if instance.is_read:
+        return
+    recipient_ids = list(
+        Conversation.participants.through.objects
+        .filter(conversation_id=conversation_id)
+        .exclude(user_id=instance.sender_id)
+        .values_list('user_id', flat=True)
+    )
+    ConversationReadState.ensure(conversation_id, recipient_ids)
+    ConversationReadState.objects.filter(
+        conversation_id=conversation_id, user_id__in=recipient_ids
+    ).update(unread_count=F('unread_count') + 1)
+
+
+@receiver(post_delete, sender=Message)
+def record_message_deleted(sender, instance, **kwargs):
+    conversation_id = instance.conversation_id
+
+    if not instance.is_read:
+        ConversationReadState.objects.filter(
+            conversation_id=conversation_id, unread_count__gt=0
+        ).exclude(user_id=instance.sender_id).update(unread_count=F('unread_count') - 1)
+
+    # SET_NULL has already cleared last_message if it pointed at this message
+    last = (
+        Message.objects.filter(conversation_id=conversation_id)
+        .order_by('-created_at', '-id')
+        .first()
+    )
+    Conversation.objects.filter(pk=conversation_id, last_message__isnull=True).update(
+        last_message=last,
+        last_message_at=last.created_at if last else None,
+    )
@@ -1,8 +1,10 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
-from apps.messaging.models import Conversation, Message
+from apps.messaging.models import Conversation, ConversationReadState, Message
 
 User = get_user_model()
 
@@ -63,3 +65,87 @@ class TestMessagingAPI:
         assert response.data['messages_marked_read'] == 1
         
         assert Message.objects.filter(is_read=True).count() == 1
+
+
+def _conversation(*users):
+    conv = Conversation.objects.create()
+    conv.participants.add(*users)
+    return conv
+
+
+def _unread(conv, user):
+    return ConversationReadState.objects.get(conversation=conv, user=user).unread_count
+
+
+@pytest.mark.django_db
+class TestInboxDenormalization:
+    def test_send_updates_last_message_and_recipient_unread(self, api_client, user1, user2):
+        conv = _conversation(user1, user2)
+        api_client.force_authenticate(user=user1)
+        for text in ('one', 'two'):
+            api_client.post(f'/api/v1/messaging/conversations/{conv.id}/messages/send/', {'content': text}, format='json')
+
+        conv.refresh_from_db()
+        assert conv.last_message.content == 'two'
+        assert conv.last_message_at == conv.last_message.created_at
+        assert _unread(conv, user2) == 2
+        assert not ConversationReadState.objects.filter(conversation=conv, user=user1, unread_count__gt=0).exists()
+
+    def test_mark_read_resets_counter(self, api_client, user1, user2):
+        conv = _conversation(user1, user2)
+        Message.objects.create(conversation=conv, sender=user1, content='Hello!')
+        assert _unread(conv, user2) == 1
+
+        api_client.force_authenticate(user=user2)
+        api_client.post(f'/api/v1/messaging/conversations/{conv.id}/read/')
+        assert _unread(conv, user2) == 0
+
+        response = api_client.get('/api/v1/messaging/conversations/')
+        assert response.data['results'][0]['unread_count'] == 0
+
+    def test_deleting_last_message_falls_back_to_previous(self, user1, user2):
+        conv = _conversation(user1, user2)
+        first = Message.objects.create(conversation=conv, sender=user1, content='first')
+        last = Message.objects.create(conversation=conv, sender=user1, content='last')
+        last.delete()
+
+        conv.refresh_from_db()
+        assert conv.last_message_id == first.id
+        assert _unread(conv, user2) == 1
+
+    def test_inbox_query_count_is_constant(self, api_client, user1, user2):
+        api_client.force_authenticate(user=user1)
+
+        def inbox_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = api_client.get('/api/v1/messaging/conversations/')
+            assert response.status_code == status.HTTP_200_OK
+            return len(ctx.captured_queries), response.data['results']
+
+        conv = _conversation(user1, user2)
+        Message.objects.create(conversation=conv, sender=user2, content='hi')
+        baseline, _ = inbox_queries()
+
+        for i in range(4):
+            other = User.objects.create_user(username=f'inbox{i}', email=f'inbox{i}@test.com', password='password123')
+            conv = _conversation(user1, other)
+            Message.objects.create(conversation=conv, sender=other, content=f'hi {i}')
+        count, results = inbox_queries()
+
+        assert count == baseline
+        assert len(results) == 5
+        assert all(row['unread_count'] == 1 for row in results)
+        assert all(row['last_message']['content'].startswith('hi') for row in results)
+
+    def test_list_messages_cursor_paginates_newest_first(self, api_client, user1, user2):
+        conv = _conversation(user1, user2)
+        for i in range(5):
+            Message.objects.create(conversation=conv, sender=user1, content=f'm{i}')
+        api_client.force_authenticate(user=user1)
+
+        response = api_client.get(f'/api/v1/messaging/conversations/{conv.id}/messages/', {'page_size': 2})
+        assert [m['content'] for m in response.data['results']] == ['m3', 'm4']
+        assert response.data['next']
+
+        response = api_client.get(response.data['next'])
+        assert [m['content'] for m in response.data['results']] == ['m1', 'm2']
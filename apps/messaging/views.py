@@ -1,21 +1,43 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework.permissions import IsAuthenticated
-from .models import Conversation, Message
+from .models import Conversation, ConversationReadState, Message
 from .serializers import ConversationSerializer, MessageSerializer
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+class MessageCursorPagination(CursorPagination):
+    """Newest page first; `next` walks back through older messages."""
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
 class ConversationViewSet(viewsets.ModelViewSet):
     serializer_class = ConversationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Conversation.objects.filter(participants=self.request.user).prefetch_related('participants')
+        user = self.request.user
+        unread = ConversationReadState.objects.filter(
+            conversation=OuterRef('pk'), user=user
+        ).values('unread_count')[:1]
+        return (
+            Conversation.objects.filter(participants=user)
+            .select_related('last_message__sender')
+            .prefetch_related('participants')
+            .annotate(user_unread_count=Coalesce(Subquery(unread), 0))
+        )
 
     def perform_create(self, serializer):
         conversation = serializer.save()
@@ -25,30 +47,38 @@ class ConversationViewSet(viewsets.ModelViewSet):
     def list_messages(self, request, pk=None):
         conversation = self.get_object()
         messages = conversation.messages.all().select_related('sender')
-        
-        # Paginate messages if needed, here we'll just return all for simplicity
-        page = self.paginate_queryset(messages)
-        if page is not None:
-            serializer = MessageSerializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-            
-        serializer = MessageSerializer(messages, many=True)
-        return Response(serializer.data)
+
+        paginator = MessageCursorPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        # Each page is fetched newest-first but rendered oldest-first. Don't
+        # reverse in place: the paginator builds its cursors from `page`.
+        serializer = MessageSerializer(page[::-1], many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'], url_path='messages/send', serializer_class=MessageSerializer)
     def send_message(self, request, pk=None):
         conversation = self.get_object()
         serializer = MessageSerializer(data=request.data)
         if serializer.is_valid():
+            # apps.messaging.signals updates last_message, updated_at and unread counters
             serializer.save(conversation=conversation, sender=request.user)
-            conversation.save() # Updates Conversation.updated_at
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @action(detail=True, methods=['post'], url_path='read')
     def mark_read(self, request, pk=None):
         conversation = self.get_object()
-        updated = conversation.messages.exclude(sender=request.user).filter(is_read=False).update(is_read=True)
+        with transaction.atomic():
+            # Lock the reader's counter so a concurrent send can't be
+            # counted and then wiped by the reset below.
+            ConversationReadState.ensure(conversation.pk, [request.user.pk])
+            state = ConversationReadState.objects.select_for_update().get(
+                conversation=conversation, user=request.user
+            )
+            updated = conversation.messages.exclude(sender=request.user).filter(is_read=False).update(is_read=True)
+            state.unread_count = 0
+            state.last_read_at = timezone.now()
+            state.save(update_fields=['unread_count', 'last_read_at'])
         return Response({'status': 'ok', 'messages_marked_read': updated})
 
     @action(detail=False, methods=['get'], url_path='user-search')
@@ -0,0 +1,194 @@
+"""
+Outbound email queue.
+
+`send_tasc_email` renders each email and stores it as an OutboundEmail;
+`deliver_queued_emails` (Celery, kicked after each commit and swept every
+minute by beat) claims due rows with SKIP LOCKED and sends them off the
+request path.
+
+Emails with identical content go out together: through SendGrid as one API
+call with a personalization per email (at most 1000 recipients per call),
+otherwise as one batch over a single EMAIL_BACKEND connection. For local
+testing point EMAIL_BACKEND at Django's console or file-based backend
+(the latter writes to EMAIL_FILE_PATH).
+
+A failed send is retried with exponential backoff and marked failed after
+EMAIL_QUEUE_MAX_ATTEMPTS. Claims lapse after EMAIL_QUEUE_CLAIM_SECONDS, so
+rows held by a worker that died are picked up again.
+"""
+import logging
+from datetime import timedelta
+from itertools import groupby
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.common.async_tasks import enqueue_task_on_commit
+
+logger = logging.getLogger(__name__)
+
+SENDGRID_MAX_RECIPIENTS = 1000
+
+
+def queue_email(*, subject, to, html, text, from_addr, reply_to=None, dedup_key=None):
+    """
+    Store a rendered email for delivery after the current transaction commits.
+    Returns the OutboundEmail, or None if ``dedup_key`` was already queued.
+    """
+    from .models import OutboundEmail
+    from .tasks import deliver_queued_emails
+
+    if dedup_key and OutboundEmail.objects.filter(dedup_key=dedup_key).exists():
+        return None
+    try:
+        with transaction.atomic():
+            email = OutboundEmail.objects.create(
+                subject=subject,
+                recipients=list(to),
+                from_email=from_addr,
+                reply_to=reply_to or "",
+                html_body=html,
+                text_body=text,
+                dedup_key=dedup_key or None,
+            )
+    except IntegrityError:
+        if dedup_key:
+            return None
+        raise
+    enqueue_task_on_commit(deliver_queued_emails)
+    return email
+
+
+def _claim(limit):
+    from .models import OutboundEmail
+
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                status__in=[OutboundEmail.Status.QUEUED, OutboundEmail.Status.SENDING],
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[:limit]
+        )
+        if batch:
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status=OutboundEmail.Status.SENDING,
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=settings.EMAIL_QUEUE_CLAIM_SECONDS),
+            )
+    for email in batch:
+        email.attempts += 1
+    return batch
+
+
+def _content_key(email):
+    return (email.subject, email.from_email, email.reply_to, email.html_body, email.text_body)
+
+
+def _provider_batches(emails):
+    """Group emails with identical content, at most SENDGRID_MAX_RECIPIENTS recipients per group."""
+    for _, same_content in groupby(sorted(emails, key=_content_key), key=_content_key):
+        batch, recipients = [], 0
+        for email in same_content:
+            if batch and recipients + len(email.recipients) > SENDGRID_MAX_RECIPIENTS:
+                yield batch
+                batch, recipients = [], 0
+            batch.append(email)
+            recipients += len(email.recipients)
+        yield batch
+
+
+def _send(batch, sendgrid_key):
+    first = batch[0]
+    if sendgrid_key:
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Content, Email, Mail, Personalization, To
+
+        mail = Mail(from_email=Email(first.from_email), subject=first.subject)
+        for email in batch:
+            personalization = Personalization()
+            for address in email.recipients:
+                personalization.add_to(To(address))
+            mail.add_personalization(personalization)
+        mail.add_content(Content("text/plain", first.text_body))
+        mail.add_content(Content("text/html", first.html_body))
+        if first.reply_to:
+            mail.reply_to = Email(first.reply_to)
+        SendGridAPIClient(sendgrid_key).send(mail)
+        return
+
+    from django.core.mail import EmailMultiAlternatives, get_connection
+
+    messages = []
+    for email in batch:
+        msg = EmailMultiAlternatives(
+            subject=email.subject,
+            body=email.text_body,
+            from_email=email.from_email,
+            to=email.recipients,
+            reply_to=[email.reply_to] if email.reply_to else None,
+        )
+        msg.attach_alternative(email.html_body, "text/html")
+        messages.append(msg)
+    get_connection(fail_silently=False).send_messages(messages)
+
+
+def _record_failure(batch, error, counts):
+    from .models import OutboundEmail
+
+    now = timezone.now()
+    for email in batch:
+        if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            status, next_attempt_at = OutboundEmail.Status.FAILED, now
+            counts["failed"] += 1
+        else:
+            delay = settings.EMAIL_QUEUE_RETRY_BACKOFF_SECONDS * 2 ** (email.attempts - 1)
+            status, next_attempt_at = OutboundEmail.Status.QUEUED, now + timedelta(seconds=delay)
+            counts["retried"] += 1
+        OutboundEmail.objects.filter(pk=email.pk).update(
+            status=status, next_attempt_at=next_attempt_at, last_error=error[:2000]
+        )
+
+
+def deliver_due(batch_size=None):
+    """Send every due queued email. Returns counts of sent, retried and failed emails."""
+    from .models import OutboundEmail
+    from .services import sendgrid_api_key
+
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    counts = {"sent": 0, "retried": 0, "failed": 0}
+    while True:
+        claimed = _claim(batch_size)
+        if not claimed:
+            break
+        try:
+            sendgrid_key = sendgrid_api_key()
+        except Exception as exc:
+            _record_failure(claimed, str(exc), counts)
+            logger.exception("Email queue: provider is misconfigured")
+            break
+
+        for batch in _provider_batches(claimed):
+            try:
+                _send(batch, sendgrid_key)
+            except Exception as exc:
+                logger.warning(
+                    "Email queue: send of %d emails failed", len(batch), exc_info=True
+                )
+                _record_failure(batch, str(exc), counts)
+                continue
+            OutboundEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                status=OutboundEmail.Status.SENT, sent_at=timezone.now(), last_error=""
+            )
+            counts["sent"] += len(batch)
+
+        if len(claimed) < batch_size:
+            break
+
+    if any(counts.values()):
+        logger.info("Email queue: %(sent)d sent, %(retried)d retried, %(failed)d failed", counts)
+    return counts
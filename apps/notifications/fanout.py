@@ -0,0 +1,83 @@
+"""
+Notification fan-out.
+
+`fan_out` writes one Notification per recipient while streaming recipient
+ids in chunks of ``NOTIFICATION_FANOUT_BATCH_SIZE``, so neither the ids nor
+the rows for a large audience are held in memory at once. Course-wide
+notices run on Celery (`apps.notifications.tasks.fan_out_course_update`),
+off the request that triggered them.
+"""
+from itertools import islice
+
+from django.conf import settings
+
+from apps.notifications import unread
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def create_notifications(notifications, batch_size=None):
+    """Bulk-insert prepared Notification objects and drop their users' unread counters."""
+    from .models import Notification
+
+    notifications = list(notifications)
+    if not notifications:
+        return 0
+    Notification.objects.bulk_create(
+        notifications,
+        batch_size=batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    unread.forget({notification.user_id for notification in notifications})
+    return len(notifications)
+
+
+def fan_out(user_ids, *, type, title, description, link=None, batch_size=None):
+    """Notify every user in ``user_ids`` (any iterable, e.g. a values_list iterator)."""
+    from .models import Notification
+
+    batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    total = 0
+    for chunk in _chunks(user_ids, batch_size):
+        total += create_notifications(
+            (
+                Notification(
+                    user_id=user_id,
+                    type=type,
+                    title=title,
+                    description=description,
+                    link=link,
+                )
+                for user_id in chunk
+            ),
+            batch_size=batch_size,
+        )
+    return total
+
+
+def notify_course_learners(course_id, title, description, link=None):
+    """Notify the learners actively enrolled in a course."""
+    from apps.learning.models import Enrollment
+
+    from .models import Notification
+
+    batch_size = settings.NOTIFICATION_FANOUT_BATCH_SIZE
+    user_ids = (
+        Enrollment.objects.filter(course_id=course_id, status=Enrollment.Status.ACTIVE)
+        .order_by("user_id")
+        .values_list("user_id", flat=True)
+        .distinct()
+        .iterator(chunk_size=batch_size)
+    )
+    return fan_out(
+        user_ids,
+        type=Notification.Type.COURSE_UPDATE,
+        title=title,
+        description=description,
+        link=link or f"/learner/courses/{course_id}",
+        batch_size=batch_size,
+    )
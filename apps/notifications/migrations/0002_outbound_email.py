@@ -0,0 +1,85 @@
+# Generated by Django 5.1.5 on 2026-10-16 20:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifications", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="notification",
+            name="type",
+            field=models.CharField(
+                choices=[
+                    ("approval", "Approval"),
+                    ("registration", "Registration"),
+                    ("system", "System"),
+                    ("milestone", "Milestone"),
+                    ("course_update", "Course Update"),
+                    ("subscription_expiry", "Subscription Expiry"),
+                ],
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="OutboundEmail",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("subject", models.CharField(max_length=500)),
+                ("recipients", models.JSONField(default=list)),
+                ("from_email", models.CharField(max_length=255)),
+                ("reply_to", models.CharField(blank=True, default="", max_length=255)),
+                ("html_body", models.TextField()),
+                ("text_body", models.TextField()),
+                (
+                    "dedup_key",
+                    models.CharField(
+                        blank=True, max_length=255, null=True, unique=True
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("sending", "Sending"),
+                            ("sent", "Sent"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=10,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="notificatio_status_36aace_idx",
+                    )
+                ],
+            },
+        ),
+    ]
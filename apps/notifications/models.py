@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 
 class Notification(models.Model):
@@ -49,28 +50,49 @@ def notify_enrolled_learners(course, title, description, link=None):
     """
     Notify all learners enrolled in a course about an update.
     Used when course content changes (new sessions, quiz updates, etc.)
+    The notifications are written by a Celery task once the transaction commits.
     """
-    from apps.learning.models import Enrollment
+    from apps.common.async_tasks import enqueue_task_on_commit
+    from apps.notifications.tasks import fan_out_course_update
 
-    enrolled_user_ids = (
-        Enrollment.objects.filter(course=course, is_active=True)
-        .values_list("user_id", flat=True)
-        .distinct()
-    )
+    enqueue_task_on_commit(fan_out_course_update, course.id, title, description, link)
+
+
+class OutboundEmail(models.Model):
+    """
+    A rendered email waiting for (or done with) delivery by the email queue.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
+    subject = models.CharField(max_length=500)
+    recipients = models.JSONField(default=list)
+    from_email = models.CharField(max_length=255)
+    reply_to = models.CharField(max_length=255, blank=True, default="")
+    html_body = models.TextField()
+    text_body = models.TextField()
+
+    # Callers pass one to make a retried operation queue its email only once
+    dedup_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
 
-    notifications = []
-    for user_id in enrolled_user_ids:
-        notifications.append(
-            Notification(
-                user_id=user_id,
-                type=Notification.Type.COURSE_UPDATE,
-                title=title,
-                description=description,
-                link=link or f"/learner/courses/{course.id}",
-            )
-        )
-
-    if notifications:
-        Notification.objects.bulk_create(notifications, ignore_conflicts=True)
-
-    return len(notifications)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default="")
+    # Earliest next delivery attempt; for SENDING rows, when the claim lapses
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.recipients)} ({self.status})"
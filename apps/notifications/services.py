@@ -7,6 +7,7 @@ from typing import Any
 
 from django.conf import settings
 from django.template.loader import render_to_string
+from django.utils import timezone
 from django.utils.html import strip_tags
 
 logger = logging.getLogger(__name__)
@@ -27,6 +28,98 @@ def send_account_locked_email(user) -> None:
     )
 
 
+def _render_email(template: str, context: dict[str, Any]) -> tuple[str, str]:
+    """Render ``template`` to (html, text), with the base template's support_email and year."""
+    enriched_context = {
+        "support_email": getattr(settings, "SUPPORT_EMAIL", None) or getattr(settings, "DEFAULT_FROM_EMAIL", "support@tasc-lms.com"),
+        "year": datetime.now().year,
+        **context,
+    }
+    html = render_to_string(template, enriched_context)
+    return html, strip_tags(html)
+
+
+def _email_envelope(subject: str, from_email: str | None, reply_to: str | None) -> tuple[str, str, str | None]:
+    """Return (full_subject, from_addr, reply_to) with the configured defaults applied."""
+    subject_prefix = getattr(settings, "EMAIL_SUBJECT_PREFIX", "") or ""
+    from_addr = (
+        from_email
+        or getattr(settings, "DEFAULT_FROM_EMAIL", None)
+        or "no-reply@example.com"
+    )
+    return f"{subject_prefix}{subject}", from_addr, reply_to or getattr(settings, "SUPPORT_EMAIL", None)
+
+
+def sendgrid_api_key() -> str:
+    """
+    The SendGrid key to send with, or "" to use Django's EMAIL_BACKEND.
+    Raises RuntimeError when EMAIL_PROVIDER is 'sendgrid' but no key is configured.
+    """
+    provider = str(getattr(settings, "EMAIL_PROVIDER", "auto")).lower()
+    if provider not in {"console", "django", "sendgrid", "auto"}:
+        logger.warning(
+            "Unknown EMAIL_PROVIDER value; falling back to auto",
+            extra={"email_provider": provider},
+        )
+        provider = "auto"
+
+    if provider == "sendgrid":
+        sendgrid_key = getattr(settings, "SENDGRID_API_KEY", None) or ""
+        if not sendgrid_key:
+            raise RuntimeError(
+                "EMAIL_PROVIDER is 'sendgrid' but SENDGRID_API_KEY is not configured."
+            )
+        return sendgrid_key
+    if provider in {"console", "django"}:
+        return ""
+    return (
+        getattr(settings, "SENDGRID_API_KEY", None)
+        or os.getenv("SENDGRID_API_KEY")
+        or ""
+    )
+
+
+def deliver_email(*, subject: str, to: list[str], html: str, text: str, from_addr: str, reply_to: str | None) -> None:
+    """Hand one rendered email to the configured provider, blocking until it is accepted."""
+    sendgrid_key = sendgrid_api_key()
+
+    # Use SendGrid when selected/available
+    if sendgrid_key:
+        from sendgrid import SendGridAPIClient
+        from sendgrid.helpers.mail import Mail, Email, To, Content
+
+        mail = Mail(
+            from_email=Email(from_addr),
+            to_emails=[To(x) for x in to],
+            subject=subject,
+        )
+
+        # Plain text + HTML
+        mail.add_content(Content("text/plain", text))
+        mail.add_content(Content("text/html", html))
+
+        if reply_to:
+            mail.reply_to = Email(reply_to)
+
+        sg = SendGridAPIClient(sendgrid_key)
+        sg.send(mail)
+        return
+
+    # Fallback (SMTP or whatever EMAIL_BACKEND is configured)
+    from django.core.mail import EmailMultiAlternatives
+
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text,
+        from_email=from_addr,
+        to=to,
+    )
+    if reply_to:
+        msg.reply_to = [reply_to]
+    msg.attach_alternative(html, "text/html")
+    msg.send(fail_silently=False)
+
+
 def send_tasc_email(
     *,
     subject: str,
@@ -36,13 +129,21 @@ def send_tasc_email(
     from_email: str | None = None,
     reply_to: str | None = None,
     raise_on_error: bool = False,
+    dedup_key: str | None = None,
 ) -> None:
     """
     Sends an email using SendGrid Web API (HTTPS) to avoid SMTP port blocks (465/587).
     Falls back to Django EmailMultiAlternatives (uses EMAIL_BACKEND) only if SendGrid is not configured.
 
+    With EMAIL_QUEUE_ENABLED (the default) the email is rendered here and queued
+    as an OutboundEmail; a Celery worker delivers it after the transaction
+    commits (see apps.notifications.email_queue). raise_on_error then covers
+    rendering and provider configuration, not the provider call itself.
+    An email whose dedup_key was already queued is not queued again.
+
     Controlled by:
       - settings.DJANGO_EMAIL_ENABLED / env DJANGO_EMAIL_ENABLED (true/false)
+      - settings.EMAIL_QUEUE_ENABLED / env EMAIL_QUEUE_ENABLED (true/false)
       - settings.EMAIL_PROVIDER / env EMAIL_PROVIDER (console|django|sendgrid|auto)
       - settings.SENDGRID_API_KEY / env SENDGRID_API_KEY
       - settings.EMAIL_SUBJECT_PREFIX (optional)
@@ -53,85 +154,34 @@ def send_tasc_email(
     if not enabled:
         return
 
-    # Inject support_email and year for base template
-    enriched_context = {
-        "support_email": getattr(settings, "SUPPORT_EMAIL", None) or getattr(settings, "DEFAULT_FROM_EMAIL", "support@tasc-lms.com"),
-        "year": datetime.now().year,
-        **context,
-    }
-
     try:
-        html = render_to_string(template, enriched_context)
-        text = strip_tags(html)
+        html, text = _render_email(template, context)
+        full_subject, from_addr, support_email = _email_envelope(subject, from_email, reply_to)
 
-        subject_prefix = getattr(settings, "EMAIL_SUBJECT_PREFIX", "") or ""
-        full_subject = f"{subject_prefix}{subject}"
+        if getattr(settings, "EMAIL_QUEUE_ENABLED", False):
+            # Surface a misconfigured provider to the caller, not just the worker
+            sendgrid_api_key()
+            from apps.notifications.email_queue import queue_email
 
-        from_addr = (
-            from_email
-            or getattr(settings, "DEFAULT_FROM_EMAIL", None)
-            or "no-reply@example.com"
-        )
-        support_email = reply_to or getattr(settings, "SUPPORT_EMAIL", None)
-
-        provider = str(getattr(settings, "EMAIL_PROVIDER", "auto")).lower()
-        if provider not in {"console", "django", "sendgrid", "auto"}:
-            logger.warning(
-                "Unknown EMAIL_PROVIDER value; falling back to auto",
-                extra={"email_provider": provider},
-            )
-            provider = "auto"
-
-        if provider == "sendgrid":
-            sendgrid_key = getattr(settings, "SENDGRID_API_KEY", None) or ""
-            if not sendgrid_key:
-                raise RuntimeError(
-                    "EMAIL_PROVIDER is 'sendgrid' but SENDGRID_API_KEY is not configured."
-                )
-        elif provider in {"console", "django"}:
-            sendgrid_key = ""
-        else:
-            sendgrid_key = (
-                getattr(settings, "SENDGRID_API_KEY", None)
-                or os.getenv("SENDGRID_API_KEY")
-                or ""
-            )
-
-        # Use SendGrid when selected/available
-        if sendgrid_key:
-            from sendgrid import SendGridAPIClient
-            from sendgrid.helpers.mail import Mail, Email, To, Content
-
-            mail = Mail(
-                from_email=Email(from_addr),
-                to_emails=[To(x) for x in to],
+            queue_email(
                 subject=full_subject,
+                to=to,
+                html=html,
+                text=text,
+                from_addr=from_addr,
+                reply_to=support_email,
+                dedup_key=dedup_key,
             )
-
-            # Plain text + HTML
-            mail.add_content(Content("text/plain", text))
-            mail.add_content(Content("text/html", html))
-
-            if support_email:
-                mail.reply_to = Email(support_email)
-
-            sg = SendGridAPIClient(sendgrid_key)
-            sg.send(mail)
             return
 
-        # Fallback (SMTP or whatever EMAIL_BACKEND is configured)
-        from django.core.mail import EmailMultiAlternatives
-
-        msg = EmailMultiAlternatives(
+        deliver_email(
             subject=full_subject,
-            body=text,
-            from_email=from_addr,
             to=to,
+            html=html,
+            text=text,
+            from_addr=from_addr,
+            reply_to=support_email,
         )
-        if support_email:
-            msg.reply_to = [support_email]
-        msg.attach_alternative(html, "text/html")
-        msg.send(fail_silently=False)
     except Exception:
         logger.exception(
             "Email send failed",
@@ -144,6 +194,7 @@ def send_tasc_email(
 
 def send_subscription_expiry_warning(organization, days_remaining):
     """Send 30/7 day warning to Org Admin before subscription expires."""
+    today = timezone.localdate()
     frontend_base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:5173")
     renewal_url = f"{frontend_base}/org-admin/billing"
     
@@ -166,6 +217,7 @@ def send_subscription_expiry_warning(organization, days_remaining):
                 "days_remaining": days_remaining,
                 "renewal_url": renewal_url,
             },
+            dedup_key=f"subscription-expiry-warning:{organization.pk}:{admin.user_id}:{days_remaining}:{today}",
         )
         
         # Also create in-app notification
@@ -181,6 +233,7 @@ def send_subscription_expiry_warning(organization, days_remaining):
 
 def send_subscription_expired_notification(organization):
     """Notify Org Admin when subscription has expired."""
+    today = timezone.localdate()
     frontend_base = getattr(settings, "FRONTEND_BASE_URL", "http://localhost:5173")
     renewal_url = f"{frontend_base}/org-admin/billing"
     
@@ -201,6 +254,7 @@ def send_subscription_expired_notification(organization):
                 "admin": admin.user,
                 "renewal_url": renewal_url,
             },
+            dedup_key=f"subscription-expired:{organization.pk}:{admin.user_id}:{today}",
         )
         
         from apps.notifications.models import Notification
@@ -299,6 +353,9 @@ def send_learner_org_subscription_expired(organization):
     subscription_url = f"{frontend_base}/subscription"
 
     from apps.accounts.models import Membership
+    from apps.notifications.fanout import create_notifications
+    from apps.notifications.models import Notification
+
     learner_memberships = Membership.objects.filter(
         organization=organization,
         is_active=True,
@@ -318,9 +375,7 @@ def send_learner_org_subscription_expired(organization):
             ),
         )
 
-    if notifications:
-        from apps.notifications.models import Notification
-        Notification.objects.bulk_create(notifications, ignore_conflicts=False)
+    create_notifications(notifications)
 
 
 def send_subscription_payment_success_email(payment) -> bool:
@@ -369,6 +424,7 @@ def send_subscription_payment_success_email(payment) -> bool:
                 "currency": currency,
             },
             raise_on_error=True,
+            dedup_key=f"subscription-payment-success:{payment.pk}",
         )
         return True
     except Exception:
@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.notifications import unread
+from apps.notifications.models import Notification
+
+
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance, created, **kwargs):
+    if created:
+        if not instance.is_read:
+            unread.adjust(instance.user_id, 1)
+    else:
+        # is_read may or may not have changed; recount on the next read
+        unread.forget([instance.user_id])
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        unread.adjust(instance.user_id, -1)
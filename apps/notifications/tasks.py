@@ -0,0 +1,17 @@
+from celery import shared_task
+
+
+@shared_task
+def deliver_queued_emails():
+    """Send due emails from the outbound queue (see apps.notifications.email_queue)."""
+    from apps.notifications.email_queue import deliver_due
+
+    return deliver_due()
+
+
+@shared_task
+def fan_out_course_update(course_id, title, description, link=None):
+    """Notify a course's active learners (see apps.notifications.fanout)."""
+    from apps.notifications.fanout import notify_course_learners
+
+    return notify_course_learners(course_id, title, description, link)
@@ -1,13 +1,16 @@
 from unittest.mock import patch
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 
+from apps.notifications.email_queue import deliver_due
+from apps.notifications.fanout import fan_out
 from apps.notifications.services import send_tasc_email
-from apps.notifications.models import Notification
+from apps.notifications.models import Notification, OutboundEmail
 
 User = get_user_model()
 
@@ -16,6 +19,7 @@ class SendTascEmailProviderRoutingTests(TestCase):
     @override_settings(
         EMAIL_PROVIDER="console",
         DJANGO_EMAIL_ENABLED=True,
+        EMAIL_QUEUE_ENABLED=False,
         SENDGRID_API_KEY="",
         EMAIL_BACKEND="django.core.mail.backends.console.EmailBackend",
     )
@@ -60,6 +64,171 @@ class SendTascEmailProviderRoutingTests(TestCase):
                 raise_on_error=False,
             )
 
+@override_settings(
+    DJANGO_EMAIL_ENABLED=True,
+    EMAIL_QUEUE_ENABLED=True,
+    EMAIL_QUEUE_MAX_ATTEMPTS=2,
+    EMAIL_QUEUE_RETRY_BACKOFF_SECONDS=30,
+    EMAIL_PROVIDER="console",
+    EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+)
+@patch("apps.notifications.services.render_to_string", return_value="<p>Hello</p>")
+class OutboundEmailQueueTests(TestCase):
+    def _queue(self, to, **kwargs):
+        send_tasc_email(
+            subject="Queued",
+            to=to,
+            template="emails/auth/mfa_code.html",
+            context={},
+            **kwargs,
+        )
+
+    def test_send_is_queued_until_commit_and_delivered_in_one_connection(self, _mock_render):
+        from django.core import mail
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._queue(["a@example.com"])
+            self._queue(["b@example.com"])
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.QUEUED).count(), 2)
+
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages",
+                   autospec=True, side_effect=lambda backend, messages: len(messages)) as mock_send:
+            for callback in callbacks:
+                callback()
+        mock_send.assert_called_once()
+        self.assertEqual(len(mock_send.call_args.args[1]), 2)
+        self.assertEqual(OutboundEmail.objects.filter(status=OutboundEmail.Status.SENT).count(), 2)
+
+    def test_dedup_key_queues_once(self, _mock_render):
+        self._queue(["a@example.com"], dedup_key="receipt:1")
+        self._queue(["a@example.com"], dedup_key="receipt:1")
+        self.assertEqual(OutboundEmail.objects.count(), 1)
+
+    @override_settings(EMAIL_PROVIDER="sendgrid", SENDGRID_API_KEY="key")
+    @patch("sendgrid.SendGridAPIClient.send")
+    def test_sendgrid_batches_identical_emails_as_personalizations(self, mock_send, _mock_render):
+        for address in ("a@example.com", "b@example.com", "c@example.com"):
+            self._queue([address])
+
+        counts = deliver_due()
+
+        self.assertEqual(counts["sent"], 3)
+        mock_send.assert_called_once()
+        payload = mock_send.call_args.args[0].get()
+        self.assertEqual(
+            sorted(p["to"][0]["email"] for p in payload["personalizations"]),
+            ["a@example.com", "b@example.com", "c@example.com"],
+        )
+
+    def test_failed_send_backs_off_then_gives_up(self, _mock_render):
+        self._queue(["a@example.com"])
+        email = OutboundEmail.objects.get()
+
+        with patch("django.core.mail.backends.locmem.EmailBackend.send_messages",
+                   side_effect=RuntimeError("provider down")):
+            self.assertEqual(deliver_due()["retried"], 1)
+            email.refresh_from_db()
+            self.assertEqual(email.status, OutboundEmail.Status.QUEUED)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            self.assertIn("provider down", email.last_error)
+            # Not due yet, so nothing is claimed
+            self.assertEqual(deliver_due(), {"sent": 0, "retried": 0, "failed": 0})
+
+            OutboundEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(deliver_due()["failed"], 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboundEmail.Status.FAILED)
+        self.assertEqual(email.attempts, 2)
+
+
+class NotificationFanOutTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.users = [
+            User.objects.create_user(
+                username=f"fanout{i}",
+                email=f"fanout{i}@example.com",
+                password="testpass123",
+                email_verified=True,
+                is_active=True,
+            )
+            for i in range(5)
+        ]
+        self.user = self.users[0]
+        self.client.force_authenticate(user=self.user)
+
+    def _unread(self):
+        response = self.client.get("/api/v1/notifications/unread_count/")
+        return response.data["unread_count"]
+
+    def test_fan_out_inserts_in_batches(self):
+        user_ids = (user.id for user in self.users)
+        # One INSERT per batch of two
+        with self.assertNumQueries(3):
+            total = fan_out(
+                user_ids,
+                type=Notification.Type.SYSTEM,
+                title="Maintenance",
+                description="Tonight",
+                batch_size=2,
+            )
+        self.assertEqual(total, 5)
+        self.assertEqual(Notification.objects.filter(title="Maintenance").count(), 5)
+
+    def test_unread_counter_tracks_reads_and_new_notifications(self):
+        for i in range(3):
+            Notification.objects.create(
+                user=self.user, type=Notification.Type.SYSTEM, title=f"N{i}", description="d"
+            )
+        self.assertEqual(self._unread(), 3)
+        with self.assertNumQueries(0):
+            from apps.notifications.unread import unread_count
+
+            self.assertEqual(unread_count(self.user.id), 3)
+
+        first = Notification.objects.filter(user=self.user).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/v1/notifications/{first.id}/mark_read/")
+            self.client.post(f"/api/v1/notifications/{first.id}/mark_read/")
+        self.assertEqual(self._unread(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.objects.create(
+                user=self.user, type=Notification.Type.SYSTEM, title="N3", description="d"
+            )
+        self.assertEqual(self._unread(), 3)
+
+        fan_out([self.user.id], type=Notification.Type.SYSTEM, title="Bulk", description="d")
+        self.assertEqual(self._unread(), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/v1/notifications/mark_all_read/")
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(self._unread(), 0)
+
+    def test_notification_during_recount_is_not_cached_stale(self):
+        from django.db.models import QuerySet
+
+        from apps.notifications import unread
+
+        real_count = QuerySet.count
+
+        def count_then_notify(queryset):
+            value = real_count(queryset)
+            Notification.objects.create(
+                user=self.user, type=Notification.Type.SYSTEM, title="Late", description="d"
+            )
+            return value
+
+        with patch.object(QuerySet, "count", count_then_notify), patch(
+            "apps.notifications.unread._after_commit", side_effect=lambda func: func()
+        ):
+            self.assertEqual(unread.unread_count(self.user.id), 0)
+        self.assertIsNone(cache.get(unread._key(self.user.id)))
+        self.assertEqual(unread.unread_count(self.user.id), 1)
+
+
 class NotificationViewSetTests(APITestCase):
     def setUp(self):
         self.user = User.objects.create_user(
@@ -0,0 +1,82 @@
+"""
+Per-user unread notification counters.
+
+Each user's unread count is cached under ``notifications:unread:<user id>``.
+Creating, reading and deleting single notifications adjusts it with atomic
+incr/decr (`apps.notifications.signals` and the NotificationViewSet
+actions); bulk inserts drop it instead. A missing counter is recounted
+from the table, and every counter expires after
+``NOTIFICATION_UNREAD_COUNT_TTL`` seconds, which reconciles drift from
+writes that go around these helpers.
+
+A recount marks itself in progress under ``notifications:unread-fill``. An
+adjustment that finds no counter clears that mark, and the recount then
+discards its result instead of caching a count that missed the change.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CACHE_PREFIX = "notifications:unread"
+FILL_PREFIX = "notifications:unread-fill"
+FILL_TIMEOUT = 30
+
+
+def _key(user_id):
+    return f"{CACHE_PREFIX}:{user_id}"
+
+
+def _fill_key(user_id):
+    return f"{FILL_PREFIX}:{user_id}"
+
+
+def _after_commit(func):
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(func)
+    else:
+        func()
+
+
+def unread_count(user_id):
+    """Return the user's unread notification count, counting it only on a cache miss."""
+    from .models import Notification
+
+    count = cache.get(_key(user_id))
+    if count is None:
+        token = uuid.uuid4().hex
+        cache.set(_fill_key(user_id), token, FILL_TIMEOUT)
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(_key(user_id), count, settings.NOTIFICATION_UNREAD_COUNT_TTL)
+        if cache.get(_fill_key(user_id)) != token:
+            # An adjustment landed mid-count; let the next read recount.
+            cache.delete(_key(user_id))
+        else:
+            cache.delete(_fill_key(user_id))
+    return count
+
+
+def adjust(user_id, delta):
+    """Add ``delta`` to a cached counter once the transaction commits; a missing counter is left to the next recount."""
+    if not delta:
+        return
+
+    def apply():
+        try:
+            value = cache.incr(_key(user_id), delta)
+        except ValueError:
+            cache.delete(_fill_key(user_id))
+            return
+        if value < 0:
+            cache.delete(_key(user_id))
+
+    _after_commit(apply)
+
+
+def forget(user_ids):
+    """Drop cached counters so the next read recounts them."""
+    keys = [_key(user_id) for user_id in user_ids]
+    if keys:
+        cache.delete_many(keys)
+        _after_commit(lambda: cache.delete_many(keys))
@@ -5,6 +5,7 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from django.utils import timezone
 
+from . import unread
 from .models import Notification
 from .serializers import (
     NotificationSerializer,
@@ -77,9 +78,13 @@ class NotificationViewSet(viewsets.ModelViewSet):
     def mark_read(self, request, pk=None):
         """Mark a single notification as read"""
         notification = self.get_object()
-        notification.is_read = True
-        notification.read_at = timezone.now()
-        notification.save()
+        if not notification.is_read:
+            # Conditional update so concurrent requests decrement the counter once
+            marked = Notification.objects.filter(pk=notification.pk, is_read=False).update(
+                is_read=True, read_at=timezone.now()
+            )
+            unread.adjust(request.user.id, -marked)
+            notification.refresh_from_db(fields=['is_read', 'read_at'])
         serializer = self.get_serializer(notification)
         return Response(serializer.data)
     
@@ -96,6 +101,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
             is_read=True,
             read_at=timezone.now()
         )
+        unread.adjust(request.user.id, -updated_count)
         return Response({
             'message': f'{updated_count} notifications marked as read',
             'count': updated_count
@@ -109,10 +115,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def unread_count(self, request):
         """Get count of unread notifications"""
-        count = Notification.objects.filter(
-            user=request.user,
-            is_read=False
-        ).count()
+        count = unread.unread_count(request.user.id)
         return Response({'unread_count': count})
     
     @extend_schema(
@@ -0,0 +1,120 @@
+"""
+Cached subscription entitlements.
+
+A user's (or organization's) access is fully described by its active
+subscriptions' end dates: access never lapses if one is open-ended,
+otherwise it runs until the latest ``end_date`` (plus the grace period).
+That window is computed with one query, cached until the next point where
+the answer can change, and checked against the clock on every read.
+
+`apps.payments.signals` drops the cached window whenever a UserSubscription
+is saved or deleted.
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+CACHE_PREFIX = 'entitlement'
+
+GRACE_PERIOD_DAYS = 7
+GRACE_PERIOD = timedelta(days=GRACE_PERIOD_DAYS)
+
+
+@dataclass(frozen=True)
+class AccessWindow:
+    """When subscription access ends; ``open_ended`` means it doesn't."""
+
+    open_ended: bool = False
+    ends_at: datetime | None = None
+
+    def allows(self, include_grace_period=True, now=None):
+        """True if access is live at ``now`` (by default, counting the grace period)."""
+        if self.open_ended:
+            return True
+        if self.ends_at is None:
+            return False
+        cutoff = now or timezone.now()
+        if include_grace_period:
+            cutoff -= GRACE_PERIOD
+        return self.ends_at > cutoff
+
+    def seconds_until_change(self, now):
+        """Seconds until ``allows()`` can next flip on its own, or None if it can't."""
+        if self.open_ended or self.ends_at is None:
+            return None
+        for boundary in (self.ends_at, self.ends_at + GRACE_PERIOD):
+            if boundary > now:
+                return (boundary - now).total_seconds()
+        return None
+
+
+def _key(kind, pk):
+    return f'{CACHE_PREFIX}:{kind}:{pk}'
+
+
+def _compute(**owner):
+    from .models import UserSubscription
+
+    window = UserSubscription.objects.filter(
+        status=UserSubscription.Status.ACTIVE, **owner
+    ).aggregate(
+        open_ended=Count('id', filter=Q(end_date__isnull=True)),
+        ends_at=Max('end_date'),
+    )
+    return AccessWindow(open_ended=bool(window['open_ended']), ends_at=window['ends_at'])
+
+
+def _store(key, window):
+    timeout = settings.SUBSCRIPTION_ENTITLEMENT_CACHE_TTL
+    remaining = window.seconds_until_change(timezone.now())
+    if remaining is not None:
+        timeout = min(timeout, max(1, math.ceil(remaining)))
+
+    # Rows read inside a transaction may still be rolled back, so only
+    # publish the window once they are committed.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.set(key, window, timeout))
+    else:
+        cache.set(key, window, timeout)
+
+
+def _resolve(kind, pk, **owner):
+    key = _key(kind, pk)
+    window = cache.get(key)
+    if window is None:
+        window = _compute(**owner)
+        _store(key, window)
+    return window
+
+
+def user_access_window(user_id):
+    """Return the AccessWindow of a user's own subscriptions."""
+    return _resolve('user', user_id, user_id=user_id)
+
+
+def organization_access_window(organization_id):
+    """Return the AccessWindow of an organization's subscriptions."""
+    return _resolve('org', organization_id, organization_id=organization_id)
+
+
+def invalidate(user_id=None, organization_id=None):
+    """
+    Drop cached windows after a subscription change.
+
+    Deletes right away and again once the transaction commits, so a request
+    that re-filled the cache from the pre-commit rows doesn't outlive it.
+    """
+    keys = [_key('user', user_id)] if user_id else []
+    if organization_id:
+        keys.append(_key('org', organization_id))
+    if not keys:
+        return
+    cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: cache.delete_many(keys))
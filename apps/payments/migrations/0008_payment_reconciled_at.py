@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-16 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0007_add_cancellation_reason"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="payment",
+            name="reconciled_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -60,6 +60,8 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Last time the reconciliation job asked the provider for this payment's status
+    reconciled_at = models.DateTimeField(null=True, blank=True)
 
     # Card details
     card_last4 = models.CharField(max_length=4, blank=True)
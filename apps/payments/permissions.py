@@ -7,10 +7,9 @@ from django.utils import timezone
 from rest_framework.permissions import BasePermission
 
 from apps.accounts.rbac import is_admin_like, is_instructor
+from .entitlements import GRACE_PERIOD_DAYS, organization_access_window, user_access_window
 from .models import UserSubscription
 
-GRACE_PERIOD_DAYS = 7
-
 
 def user_has_active_subscription(user, include_grace_period=True):
     """
@@ -20,58 +19,14 @@ def user_has_active_subscription(user, include_grace_period=True):
     """
     if not user or not user.is_authenticated:
         return False
-
-    now = timezone.now()
-
-    # Check for active subscription with no expiry or future expiry
-    qs = UserSubscription.objects.filter(
-        user=user,
-        status=UserSubscription.Status.ACTIVE,
-    ).filter(Q(end_date__isnull=True) | Q(end_date__gt=now))
-
-    if qs.exists():
-        return True
-
-    # Check grace period
-    if include_grace_period:
-        grace_cutoff = now - timedelta(days=GRACE_PERIOD_DAYS)
-        grace_qs = UserSubscription.objects.filter(
-            user=user,
-            status=UserSubscription.Status.ACTIVE,
-            end_date__gt=grace_cutoff,
-            end_date__lte=now,
-        )
-        return grace_qs.exists()
-
-    return False
+    return user_access_window(user.pk).allows(include_grace_period)
 
 
 def organization_has_active_subscription(organization, include_grace_period=True):
     """Check if organization has an active subscription (for org learners)."""
     if not organization:
         return False
-
-    now = timezone.now()
-
-    qs = UserSubscription.objects.filter(
-        organization=organization,
-        status=UserSubscription.Status.ACTIVE,
-    ).filter(Q(end_date__isnull=True) | Q(end_date__gt=now))
-
-    if qs.exists():
-        return True
-
-    if include_grace_period:
-        grace_cutoff = now - timedelta(days=GRACE_PERIOD_DAYS)
-        grace_qs = UserSubscription.objects.filter(
-            organization=organization,
-            status=UserSubscription.Status.ACTIVE,
-            end_date__gt=grace_cutoff,
-            end_date__lte=now,
-        )
-        return grace_qs.exists()
-
-    return False
+    return organization_access_window(organization.pk).allows(include_grace_period)
 
 
 def get_best_active_subscription(user):
@@ -198,6 +153,9 @@ class HasActiveSubscription(BasePermission):
     - Unauthenticated -> False
     - Admin-like (TASC_ADMIN, LMS_MANAGER) or Instructor -> True (bypass)
     - Else -> user must have active UserSubscription (with grace period)
+
+    Entitlements come from the cache in apps.payments.entitlements, and the
+    result is kept on the request for any later checks.
     """
 
     def has_permission(self, request, view):
@@ -205,9 +163,11 @@ class HasActiveSubscription(BasePermission):
             return False
         if is_admin_like(request.user) or is_instructor(request.user):
             return True
-        if user_has_active_subscription(request.user):
-            return True
-        org = getattr(request.user, 'organization', None)
-        if org and organization_has_active_subscription(org):
-            return True
-        return False
+        entitled = getattr(request, '_has_active_subscription', None)
+        if entitled is None:
+            org = getattr(request.user, 'organization', None)
+            entitled = user_has_active_subscription(request.user) or bool(
+                org and organization_has_active_subscription(org)
+            )
+            request._has_active_subscription = entitled
+        return entitled
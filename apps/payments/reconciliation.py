@@ -0,0 +1,217 @@
+"""
+Reconciliation of stale pending Pesapal payments.
+
+`reconcile_stale_payments()` drains the backlog in batches:
+
+1. Claim a batch with ``SELECT ... FOR UPDATE SKIP LOCKED`` and stamp it
+   with ``reconciled_at`` in the same short transaction, so concurrent
+   workers pick disjoint batches and a payment is not asked about again
+   until ``PESAPAL_RECONCILE_RECHECK_MINUTES`` have passed.
+2. Ask Pesapal for every claimed payment's status concurrently, on a
+   bounded thread pool, with no database locks held.
+3. Apply the answers: FAILED / INVALID payments (and the PAUSED
+   subscriptions they were holding) are closed with bulk updates;
+   COMPLETED / REVERSED go through `_sync_payment_from_pesapal_verify` one
+   by one, since they enroll, invoice, email and audit; PENDING needs
+   nothing beyond the stamp.
+
+A run stops when nothing is left to claim or its time budget is spent, and
+returns a `ReconciliationSummary` with counts and provider latency.
+"""
+import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER = timedelta(minutes=15)
+
+# Provider answers closed in bulk, and the payment status each maps to.
+BULK_STATUSES = {"FAILED": "failed", "INVALID": "cancelled"}
+
+
+@dataclass
+class ReconciliationSummary:
+    batches: int = 0
+    claimed: int = 0
+    errors: int = 0
+    outcomes: Counter = field(default_factory=Counter)
+    elapsed_seconds: float = 0.0
+    provider_total_ms: float = 0.0
+    provider_max_ms: float = 0.0
+
+    @property
+    def per_second(self):
+        return self.claimed / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def provider_avg_ms(self):
+        return self.provider_total_ms / self.claimed if self.claimed else 0.0
+
+    def as_dict(self):
+        data = asdict(self)
+        data["outcomes"] = dict(self.outcomes)
+        data.update(
+            per_second=round(self.per_second, 2),
+            provider_avg_ms=round(self.provider_avg_ms, 1),
+        )
+        return data
+
+
+def _claim_batch(batch_size):
+    """Lock, stamp and return up to ``batch_size`` payments due for a check."""
+    from .models import Payment
+
+    now = timezone.now()
+    recheck_before = now - timedelta(minutes=settings.PESAPAL_RECONCILE_RECHECK_MINUTES)
+    with transaction.atomic():
+        batch = list(
+            Payment.objects.select_for_update(skip_locked=True)
+            .filter(
+                status="pending",
+                payment_method="pesapal",
+                created_at__lt=now - STALE_AFTER,
+            )
+            .exclude(provider_order_id__isnull=True)
+            .exclude(provider_order_id="")
+            .filter(Q(reconciled_at__isnull=True) | Q(reconciled_at__lt=recheck_before))
+            .order_by(F("reconciled_at").asc(nulls_first=True), "created_at")[:batch_size]
+        )
+        if batch:
+            Payment.objects.filter(pk__in=[p.pk for p in batch]).update(reconciled_at=now)
+    for payment in batch:
+        payment.reconciled_at = now
+    return batch
+
+
+def _verify(service, payment):
+    started = time.monotonic()
+    try:
+        result = service.verify_payment(payment.provider_order_id)
+    except Exception as exc:
+        logger.warning("Pesapal status check failed for payment %s", payment.pk, exc_info=True)
+        result = {"success": False, "message": str(exc)}
+    return result, (time.monotonic() - started) * 1000
+
+
+def _close_in_bulk(payments, new_status):
+    """Move still-pending ``payments`` to ``new_status`` and release their PAUSED subscriptions."""
+    from .models import Payment, UserSubscription
+
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Payment.objects.select_for_update()
+            .filter(pk__in=[p.pk for p in payments], status="pending")
+            .values_list("pk", flat=True)
+        )
+        Payment.objects.filter(pk__in=ids).update(status=new_status, updated_at=now)
+        closed = set(ids)
+        subscription_ids = [
+            p.metadata["user_subscription_id"]
+            for p in payments
+            if p.pk in closed and (p.metadata or {}).get("user_subscription_id")
+        ]
+        # A PAUSED subscription grants no access, so no entitlement cache is affected.
+        UserSubscription.objects.filter(
+            id__in=subscription_ids, status=UserSubscription.Status.PAUSED
+        ).update(
+            status=UserSubscription.Status.CANCELLED, cancelled_at=now, auto_renew=False
+        )
+    return len(ids)
+
+
+def _apply_one(payment, result):
+    from .views_pesapal import _sync_payment_from_pesapal_verify
+
+    # The webhook may have settled it since the batch was claimed.
+    payment.refresh_from_db(fields=["status"])
+    return _sync_payment_from_pesapal_verify(payment, result)
+
+
+def _apply(results, summary):
+    to_close = {new_status: [] for new_status in BULK_STATUSES.values()}
+    for payment, result in results:
+        if not result.get("success"):
+            summary.errors += 1
+            continue
+        provider_status = (result.get("status") or "").upper()
+        if provider_status in BULK_STATUSES:
+            to_close[BULK_STATUSES[provider_status]].append(payment)
+            continue
+        if provider_status in ("COMPLETED", "REVERSED"):
+            try:
+                if _apply_one(payment, result):
+                    summary.outcomes[provider_status.lower()] += 1
+                    continue
+            except Exception:
+                logger.exception("Failed to apply Pesapal status for payment %s", payment.pk)
+                summary.errors += 1
+                continue
+        summary.outcomes["unchanged"] += 1
+
+    for new_status, payments in to_close.items():
+        if payments:
+            closed = _close_in_bulk(payments, new_status)
+            summary.outcomes[new_status] += closed
+            summary.outcomes["unchanged"] += len(payments) - closed
+
+
+def reconcile_stale_payments(batch_size=None, max_seconds=None):
+    """
+    Check stale pending Pesapal payments against the provider until none
+    are due or ``max_seconds`` have passed. Returns a ReconciliationSummary.
+    """
+    from .services.pesapal_services import PesapalService
+
+    batch_size = batch_size or settings.PESAPAL_RECONCILE_BATCH_SIZE
+    max_seconds = max_seconds or settings.PESAPAL_RECONCILE_MAX_SECONDS
+    summary = ReconciliationSummary()
+    started = time.monotonic()
+    service = PesapalService()
+
+    with ThreadPoolExecutor(
+        max_workers=settings.PESAPAL_RECONCILE_CONCURRENCY,
+        thread_name_prefix="pesapal-reconcile",
+    ) as pool:
+        while time.monotonic() - started < max_seconds:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                break
+            summary.batches += 1
+            summary.claimed += len(batch)
+
+            results = []
+            for payment, (result, elapsed_ms) in zip(
+                batch, pool.map(lambda p: _verify(service, p), batch)
+            ):
+                summary.provider_total_ms += elapsed_ms
+                summary.provider_max_ms = max(summary.provider_max_ms, elapsed_ms)
+                results.append((payment, result))
+            _apply(results, summary)
+
+            if len(batch) < batch_size:
+                break
+
+    summary.elapsed_seconds = round(time.monotonic() - started, 3)
+    logger.info(
+        "Pesapal reconciliation: %d payments in %d batches, %.3fs (%.1f/s), "
+        "provider avg %.1fms max %.1fms, %d errors, outcomes %s",
+        summary.claimed,
+        summary.batches,
+        summary.elapsed_seconds,
+        summary.per_second,
+        summary.provider_avg_ms,
+        summary.provider_max_ms,
+        summary.errors,
+        dict(summary.outcomes),
+    )
+    return summary
@@ -4,9 +4,12 @@ import hmac
 import hashlib
 from django.conf import settings
 from django.utils import timezone
+from apps.common.http_client import ProviderClient
 from ..models import Payment
 
 class FlutterwaveService:
+    http = ProviderClient('flutterwave')
+
     def __init__(self):
         self.secret_key = settings.FLUTTERWAVE_SECRET_KEY
         self.public_key = settings.FLUTTERWAVE_PUBLIC_KEY
@@ -64,7 +67,7 @@ class FlutterwaveService:
             }
             
             # Make API request
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/payments",
                 headers=self._get_headers(),
                 json=payment_data
@@ -117,7 +120,7 @@ class FlutterwaveService:
             dict: Verification result
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/transactions/{transaction_id}/verify",
                 headers=self._get_headers()
             )
@@ -367,7 +370,7 @@ class FlutterwaveService:
                 "amount": amount if amount else None  # None means full refund
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/transactions/{payment.provider_payment_id}/refund",
                 headers=self._get_headers(),
                 json=refund_data
@@ -409,7 +412,7 @@ class FlutterwaveService:
             dict: List of banks
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/banks/{country}",
                 headers=self._get_headers()
             )
@@ -449,7 +452,7 @@ class FlutterwaveService:
             dict: Exchange rate information
         """
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/transfers/rates",
                 headers=self._get_headers(),
                 params={
@@ -15,11 +15,11 @@ Also: PESAPAL_CONSUMER_KEY, PESAPAL_CONSUMER_SECRET, PESAPAL_BASE_URL, PESAPAL_I
 import logging
 from datetime import timedelta
 
-import requests
 from django.conf import settings
-from django.core.cache import cache
 from django.utils import timezone
 
+from apps.common.http_client import ProviderClient, TokenCache
+
 logger = logging.getLogger(__name__)
 
 PESAPAL_DEMO_BASE = "https://cybqa.pesapal.com/pesapalv3"
@@ -74,11 +74,13 @@ def _pesapal_billing_address_for_user(user) -> dict:
 class PesapalService:
     """
     Handles all communication with the Pesapal v3 API.
-    Token is fetched once and cached until expiry.
+    Token is shared across processes and refreshed shortly before expiry.
     """
 
     TOKEN_CACHE_KEY = "pesapal_access_token"
-    TOKEN_CACHE_TTL = 60 * 4  # 4 minutes (Pesapal tokens last 5 min)
+    TOKEN_LIFETIME = 60 * 5  # Pesapal tokens last 5 min
+
+    http = ProviderClient("pesapal")
 
     def __init__(self):
         self.consumer_key = settings.PESAPAL_CONSUMER_KEY
@@ -87,6 +89,7 @@ class PesapalService:
         env = getattr(settings, "PESAPAL_ENV", "demo")
         self.ipn_url = getattr(settings, "PESAPAL_IPN_URL", "")
         self.callback_url = getattr(settings, "PESAPAL_CALLBACK_URL", "")
+        self._token = TokenCache(self.TOKEN_CACHE_KEY, self._fetch_token)
 
     # ------------------------------------------------------------------
     # Internal helpers
@@ -96,18 +99,16 @@ class PesapalService:
         """
         Returns a valid bearer token, fetching a fresh one if needed.
         """
-        cached = cache.get(self.TOKEN_CACHE_KEY)
-        if cached:
-            return cached
+        return self._token.get()
 
-        response = requests.post(
+    def _fetch_token(self):
+        response = self.http.post(
             f"{self.base_url}/api/Auth/RequestToken",
             json={
                 "consumer_key": self.consumer_key,
                 "consumer_secret": self.consumer_secret,
             },
             headers={"Content-Type": "application/json", "Accept": "application/json"},
-            timeout=30,
         )
         response.raise_for_status()
         data = response.json()
@@ -116,9 +117,8 @@ class PesapalService:
         if not token:
             raise ValueError(f"Pesapal token request failed: {data}")
 
-        cache.set(self.TOKEN_CACHE_KEY, token, self.TOKEN_CACHE_TTL)
         logger.info("Pesapal: fetched fresh access token")
-        return token
+        return token, self.TOKEN_LIFETIME
 
     def _headers(self) -> dict:
         return {
@@ -133,21 +133,19 @@ class PesapalService:
         return d.strftime("%d-%m-%Y")
 
     def _post(self, path: str, payload: dict) -> dict:
-        resp = requests.post(
+        resp = self.http.post(
             f"{self.base_url}{path}",
             json=payload,
             headers=self._headers(),
-            timeout=30,
         )
         resp.raise_for_status()
         return resp.json()
 
     def _get(self, path: str, params: dict = None) -> dict:
-        resp = requests.get(
+        resp = self.http.get(
             f"{self.base_url}{path}",
             params=params,
             headers=self._headers(),
-            timeout=30,
         )
         resp.raise_for_status()
         return resp.json()
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.payments import entitlements
+from apps.payments.models import UserSubscription
+
+
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_subscription_entitlements(sender, instance, **kwargs):
+    """Drop the cached access windows of the subscription's user and organization."""
+    entitlements.invalidate(instance.user_id, instance.organization_id)
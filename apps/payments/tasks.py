@@ -14,126 +14,178 @@ def check_and_notify_expiring_subscriptions():
     _check()
 
 
+# Organizations per notification task queued by expire_overdue_subscriptions
+EXPIRY_NOTIFICATION_BATCH_SIZE = 50
+
+
 @shared_task
 def expire_overdue_subscriptions():
+    """
+    Expire active subscriptions past their end date plus the grace period.
+
+    Only the rows that change are touched: the expiring subscriptions are
+    locked and their ids captured before the status update (the portable
+    form of UPDATE ... RETURNING), and the enrollment and certificate
+    cascades run against those ids. Organization notifications are queued
+    in batches once the transaction commits.
+    """
+    from datetime import timedelta
+
+    from django.db import transaction
+
+    from apps.common.async_tasks import enqueue_task_on_commit
+    from apps.learning import certificate_verification
+    from apps.learning.models import Certificate, Enrollment
+    from apps.payments import entitlements
     from apps.payments.models import UserSubscription
-    from apps.payments.permissions import GRACE_PERIOD_DAYS
-
-    now = timezone.now()
-    grace_cutoff = now - __import__('datetime').timedelta(days=GRACE_PERIOD_DAYS)
-    expired = UserSubscription.objects.filter(
-        status=UserSubscription.Status.ACTIVE,
-        end_date__isnull=False,
-        end_date__lte=grace_cutoff,
-    )
-    count = expired.update(status=UserSubscription.Status.EXPIRED)
-
-    # Revoke active enrollments for users whose subscriptions just expired
-    try:
-        from apps.learning.models import Enrollment
-        from django.contrib.auth import get_user_model
-        User = get_user_model()
-        expired_user_ids = set(expired.values_list('user_id', flat=True))
-        if expired_user_ids:
+
+    grace_cutoff = timezone.now() - timedelta(days=entitlements.GRACE_PERIOD_DAYS)
+
+    with transaction.atomic():
+        expired = list(
+            UserSubscription.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=UserSubscription.Status.ACTIVE,
+                end_date__isnull=False,
+                end_date__lte=grace_cutoff,
+            )
+            .values_list("id", "user_id", "organization_id")
+        )
+        if not expired:
+            return 0
+
+        UserSubscription.objects.filter(
+            id__in=[sub_id for sub_id, _, _ in expired]
+        ).update(status=UserSubscription.Status.EXPIRED)
+        user_ids = {user_id for _, user_id, _ in expired if user_id}
+        org_ids = sorted({org_id for _, _, org_id in expired if org_id})
+
+        # Revoke active enrollments for users whose subscriptions just expired
+        enrollment_ids = list(
             Enrollment.objects.filter(
-                user_id__in=expired_user_ids,
+                user_id__in=user_ids,
                 status=Enrollment.Status.ACTIVE,
-            ).update(status=Enrollment.Status.EXPIRED)
-    except Exception:
-        logger.warning("Failed to revoke enrollments on subscription expiry", exc_info=True)
-
-    # Invalidate certificates for expired enrollments
-    try:
-        from apps.learning.models import Certificate
-        Certificate.objects.filter(
-            enrollment__status=Enrollment.Status.EXPIRED,
-            is_valid=True,
-        ).update(is_valid=False)
-    except Exception:
-        logger.warning("Failed to invalidate certificates on subscription expiry", exc_info=True)
-
-    # Notify individual learners whose org subscriptions expired
-    try:
-        from apps.notifications.services import send_learner_org_subscription_expired
-        org_ids = set(expired.values_list('organization_id', flat=True))
-        from apps.accounts.models import Organization
-        for org_id in org_ids:
-            if org_id:
-                org = Organization.objects.get(pk=org_id)
-                send_learner_org_subscription_expired(org)
-                try:
-                    from apps.notifications.services import send_subscription_expired_notification
-                    send_subscription_expired_notification(org)
-                except Exception:
-                    logger.warning("Failed to send subscription expired notification for org %s", org_id, exc_info=True)
-    except Exception:
-        logger.warning("Failed to notify learners of org subscription expiry", exc_info=True)
-
-    return count
+            ).values_list("id", flat=True)
+        )
+        if enrollment_ids:
+            Enrollment.objects.filter(id__in=enrollment_ids).update(
+                status=Enrollment.Status.EXPIRED
+            )
+            # Invalidate certificates of the enrollments revoked above
+            certificates = Certificate.objects.filter(
+                enrollment_id__in=enrollment_ids,
+                is_valid=True,
+            )
+            certificate_numbers = list(certificates.values_list("certificate_number", flat=True))
+            certificates.update(is_valid=False)
+            # update() skips the post_save receiver that drops cached verifications
+            certificate_verification.invalidate(certificate_numbers)
+
+        # update() skips the post_save receivers that normally drop cached access
+        for user_id, org_id in {(user_id, org_id) for _, user_id, org_id in expired}:
+            entitlements.invalidate(user_id, org_id)
+
+        for i in range(0, len(org_ids), EXPIRY_NOTIFICATION_BATCH_SIZE):
+            enqueue_task_on_commit(
+                notify_organization_subscriptions_expired,
+                org_ids[i:i + EXPIRY_NOTIFICATION_BATCH_SIZE],
+            )
+
+    logger.info(
+        "Expired %d subscriptions, %d enrollments; notifying %d organizations",
+        len(expired), len(enrollment_ids), len(org_ids),
+    )
+    return len(expired)
+
+
+@shared_task
+def notify_organization_subscriptions_expired(organization_ids):
+    """Tell the admins and learners of each organization that its subscription expired."""
+    from apps.accounts.models import Organization
+    from apps.notifications.services import (
+        send_learner_org_subscription_expired,
+        send_subscription_expired_notification,
+    )
+
+    for org in Organization.objects.filter(pk__in=organization_ids):
+        try:
+            send_learner_org_subscription_expired(org)
+        except Exception:
+            logger.warning("Failed to notify learners of org %s subscription expiry", org.pk, exc_info=True)
+        try:
+            send_subscription_expired_notification(org)
+        except Exception:
+            logger.warning("Failed to send subscription expired notification for org %s", org.pk, exc_info=True)
 
 
 @shared_task
 def reconcile_stale_pesapal_payments():
     """
     Background task to reconcile stuck pending Pesapal payments.
-    Iterates over all pending Pesapal payments older than 15 minutes
-    and checks their status with Pesapal.
+    Checks pending Pesapal payments older than 15 minutes with Pesapal, in
+    concurrent batches (see apps.payments.reconciliation), and returns the
+    run's summary.
     """
-    from apps.payments.models import Payment
-    from apps.payments.views_pesapal import _reconcile_stale_subscription_checkouts_for_user
-    from django.contrib.auth import get_user_model
-
-    User = get_user_model()
-    cutoff = timezone.now() - __import__('datetime').timedelta(minutes=15)
-
-    pending_user_ids = (
-        Payment.objects.filter(
-            status="pending",
-            payment_method="pesapal",
-            created_at__lt=cutoff,
-        )
-        .values_list("user_id", flat=True)
-        .distinct()
-    )
+    from apps.payments.reconciliation import reconcile_stale_payments
 
-    reconciled = 0
-    for user_id in pending_user_ids:
-        try:
-            user = User.objects.get(pk=user_id)
-            _reconcile_stale_subscription_checkouts_for_user(user)
-            reconciled += 1
-        except Exception:
-            logger.warning("Reconciliation failed for user %s", user_id, exc_info=True)
+    return reconcile_stale_payments().as_dict()
 
-    logger.info("Reconciled stale Pesapal payments for %d users", reconciled)
-    return reconciled
+
+# Organizations per notification task queued by check_seat_capacity
+SEAT_ALERT_BATCH_SIZE = 50
 
 
 @shared_task
 def check_seat_capacity():
     """
     Check organizations approaching seat capacity and notify admins.
-    Triggers at 80% and 100% thresholds.
+    Triggers at 80% and 100% thresholds, once per crossing: the level last
+    alerted is kept in Organization.seat_alert_threshold and falls back with
+    usage, so only a fresh crossing alerts again.
     """
-    from apps.accounts.models import Organization, Membership
+    from collections import defaultdict
+
+    from django.db import transaction
+
+    from apps.accounts.models import Organization
+    from apps.accounts.seat_usage import all_seat_usage
+    from apps.common.async_tasks import enqueue_task_on_commit
+
+    levels = defaultdict(list)
+    alerts = []
+    for org_id, usage in all_seat_usage().items():
+        level = usage.threshold()
+        if level == usage.alert_threshold:
+            continue
+        levels[level].append(org_id)
+        if level > usage.alert_threshold:
+            alerts.append([org_id, usage.percent_used()])
+
+    with transaction.atomic():
+        for level, org_ids in levels.items():
+            Organization.objects.filter(pk__in=org_ids).update(seat_alert_threshold=level)
+        for i in range(0, len(alerts), SEAT_ALERT_BATCH_SIZE):
+            enqueue_task_on_commit(send_seat_capacity_warnings, alerts[i:i + SEAT_ALERT_BATCH_SIZE])
+
+    logger.info("Seat capacity warnings queued for %d organizations", len(alerts))
+    return len(alerts)
+
+
+@shared_task
+def send_seat_capacity_warnings(alerts):
+    """Notify the admins of each ``[organization_id, percent_used]`` in ``alerts``."""
+    from apps.accounts.models import Organization
     from apps.notifications.services import send_seat_capacity_warning
 
-    orgs = Organization.objects.filter(is_active=True, max_seats__isnull=False)
-    notified = 0
-    for org in orgs:
-        used = Membership.objects.filter(
-            organization=org, is_active=True
-        ).count()
-        if org.max_seats and org.max_seats > 0:
-            percent = (used / org.max_seats) * 100
-            if percent >= 80:
-                try:
-                    send_seat_capacity_warning(org, percent)
-                    notified += 1
-                except Exception:
-                    logger.warning(
-                        "Seat capacity notification failed for org %s",
-                        org.id, exc_info=True,
-                    )
-    logger.info("Seat capacity warnings sent for %d organizations", notified)
-    return notified
+    orgs = Organization.objects.in_bulk([org_id for org_id, _ in alerts])
+    for org_id, percent in alerts:
+        org = orgs.get(org_id)
+        if org is None:
+            continue
+        try:
+            send_seat_capacity_warning(org, percent)
+        except Exception:
+            logger.warning(
+                "Seat capacity notification failed for org %s",
+                org_id, exc_info=True,
+            )
@@ -0,0 +1,87 @@
+"""Tests for the cached subscription entitlements behind HasActiveSubscription."""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.payments.entitlements import AccessWindow, GRACE_PERIOD
+from apps.payments.models import Subscription, UserSubscription
+from apps.payments.permissions import user_has_active_subscription
+
+User = get_user_model()
+
+
+class SubscriptionEntitlementCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='entitled',
+            email='entitled@example.com',
+            password='pass1234',
+            role=User.Role.LEARNER,
+        )
+        self.plan = Subscription.objects.create(
+            name='Entitlement Plan',
+            description='desc',
+            price=Decimal('9.99'),
+            currency='USD',
+            billing_cycle='monthly',
+            status=Subscription.Status.ACTIVE,
+        )
+
+    def tearDown(self):
+        cache.clear()
+
+    def _subscribe(self, end_date):
+        return UserSubscription.objects.create(
+            user=self.user,
+            subscription=self.plan,
+            price=self.plan.price,
+            end_date=end_date,
+        )
+
+    def _check(self):
+        # The window is only cached once the reading transaction commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            return user_has_active_subscription(self.user)
+
+    def test_cached_window_answers_without_queries(self):
+        self._subscribe(timezone.now() + timedelta(days=30))
+        self.assertTrue(self._check())
+        with self.assertNumQueries(0):
+            self.assertTrue(user_has_active_subscription(self.user))
+
+    def test_subscription_save_invalidates_cached_window(self):
+        self.assertFalse(self._check())
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription = self._subscribe(timezone.now() + timedelta(days=30))
+        self.assertTrue(self._check())
+
+        subscription.status = UserSubscription.Status.CANCELLED
+        with self.captureOnCommitCallbacks(execute=True):
+            subscription.save()
+        self.assertFalse(self._check())
+
+    def test_window_expires_with_grace_period_without_refetching(self):
+        now = timezone.now()
+        window = AccessWindow(ends_at=now - timedelta(days=1))
+        self.assertTrue(window.allows(now=now))
+        self.assertFalse(window.allows(include_grace_period=False, now=now))
+        self.assertFalse(window.allows(now=now + GRACE_PERIOD))
+        self.assertTrue(AccessWindow(open_ended=True).allows(include_grace_period=False))
+        self.assertFalse(AccessWindow().allows())
+
+    def test_cache_lifetime_stops_at_next_expiry_boundary(self):
+        now = timezone.now()
+        window = AccessWindow(ends_at=now + timedelta(hours=1))
+        self.assertEqual(window.seconds_until_change(now), 3600)
+        self.assertEqual(
+            AccessWindow(ends_at=now - timedelta(days=1)).seconds_until_change(now),
+            (GRACE_PERIOD - timedelta(days=1)).total_seconds(),
+        )
+        self.assertIsNone(AccessWindow(open_ended=True).seconds_until_change(now))
@@ -112,10 +112,12 @@ class PaymentTests(APITestCase):
         )
         response = self.client.get("/api/v1/payments/transactions/export-csv/")
         self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertIn('Content-Disposition', response)
-        self.assertTrue(response.content.decode('utf-8').startswith('ID,Transaction ID,Amount,Currency,Status,Payment Method,Created At,Completed At'))
-        self.assertIn('99.99', response.content.decode('utf-8'))
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(content.startswith('ID,Transaction ID,Amount,Currency,Status,Payment Method,Created At,Completed At'))
+        self.assertIn('99.99', content)
 
 
 # ════════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,146 @@
+"""Tests for the batched, concurrent Pesapal reconciliation job."""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.payments.models import Payment, Subscription, UserSubscription
+from apps.payments.reconciliation import reconcile_stale_payments
+from apps.payments.tasks import reconcile_stale_pesapal_payments
+
+User = get_user_model()
+
+
+def _verify_result(status):
+    return {
+        "success": True,
+        "status": status,
+        "payment_method": "",
+        "amount": None,
+        "currency": "",
+        "confirmation_code": "CONF-1" if status == "COMPLETED" else "",
+        "message": "",
+        "raw": {},
+    }
+
+
+@override_settings(PESAPAL_RECONCILE_CONCURRENCY=4, PESAPAL_RECONCILE_RECHECK_MINUTES=15)
+class PesapalReconciliationTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="reconuser",
+            email="recon@example.com",
+            password="pass1234",
+            role=User.Role.LEARNER,
+            email_verified=True,
+            is_active=True,
+        )
+        self.plan = Subscription.objects.create(
+            name="Recon Plan",
+            description="Plan for tests",
+            price=Decimal("49.00"),
+            currency="UGX",
+            billing_cycle="monthly",
+            status=Subscription.Status.ACTIVE,
+            duration_days=180,
+        )
+
+    def _payment(self, tracking_id, age=timedelta(hours=1), subscription=None, **fields):
+        metadata = {"user_subscription_id": subscription.id} if subscription else {}
+        payment = Payment.objects.create(
+            user=self.user,
+            amount=self.plan.price,
+            currency="UGX",
+            payment_method="pesapal",
+            status="pending",
+            provider_order_id=tracking_id,
+            metadata=metadata,
+            **fields,
+        )
+        Payment.objects.filter(pk=payment.pk).update(created_at=timezone.now() - age)
+        return payment
+
+    def _paused_subscription(self):
+        return UserSubscription.objects.create(
+            user=self.user,
+            subscription=self.plan,
+            status=UserSubscription.Status.PAUSED,
+            price=self.plan.price,
+            currency=self.plan.currency,
+            end_date=timezone.now() + timedelta(days=180),
+        )
+
+    @patch("apps.payments.services.pesapal_services.PesapalService.verify_payment")
+    def test_applies_provider_status_across_batches(self, mock_verify):
+        failed_sub = self._paused_subscription()
+        completed_sub = self._paused_subscription()
+        statuses = {
+            "T-FAILED": "FAILED",
+            "T-INVALID": "INVALID",
+            "T-COMPLETED": "COMPLETED",
+            "T-PENDING": "PENDING",
+        }
+        failed = self._payment("T-FAILED", subscription=failed_sub)
+        invalid = self._payment("T-INVALID")
+        completed = self._payment("T-COMPLETED", subscription=completed_sub)
+        pending = self._payment("T-PENDING")
+        mock_verify.side_effect = lambda tracking_id: _verify_result(statuses[tracking_id])
+
+        summary = reconcile_stale_payments(batch_size=3)
+
+        self.assertEqual(summary.claimed, 4)
+        self.assertEqual(summary.batches, 2)
+        self.assertEqual(summary.errors, 0)
+        self.assertEqual(
+            dict(summary.outcomes),
+            {"failed": 1, "cancelled": 1, "completed": 1, "unchanged": 1},
+        )
+        for payment in (failed, invalid, completed, pending):
+            payment.refresh_from_db()
+            self.assertIsNotNone(payment.reconciled_at)
+        self.assertEqual(failed.status, "failed")
+        self.assertEqual(invalid.status, "cancelled")
+        self.assertEqual(completed.status, "completed")
+        self.assertEqual(completed.provider_payment_id, "CONF-1")
+        self.assertEqual(pending.status, "pending")
+
+        failed_sub.refresh_from_db()
+        completed_sub.refresh_from_db()
+        self.assertEqual(failed_sub.status, UserSubscription.Status.CANCELLED)
+        self.assertFalse(failed_sub.auto_renew)
+        self.assertEqual(completed_sub.status, UserSubscription.Status.ACTIVE)
+
+    @patch("apps.payments.services.pesapal_services.PesapalService.verify_payment")
+    def test_skips_fresh_and_recently_checked_payments(self, mock_verify):
+        mock_verify.return_value = _verify_result("PENDING")
+        self._payment("T-FRESH", age=timedelta(minutes=1))
+        self._payment("T-CHECKED", reconciled_at=timezone.now() - timedelta(minutes=5))
+        self._payment("")
+        due = self._payment("T-DUE", reconciled_at=timezone.now() - timedelta(hours=1))
+
+        summary = reconcile_stale_payments()
+
+        self.assertEqual(summary.claimed, 1)
+        mock_verify.assert_called_once_with("T-DUE")
+        # Stamped, so an immediate second run has nothing to do.
+        self.assertEqual(reconcile_stale_payments().claimed, 0)
+        due.refresh_from_db()
+        self.assertEqual(due.status, "pending")
+
+    @patch("apps.payments.services.pesapal_services.PesapalService.verify_payment")
+    def test_provider_errors_are_counted_and_leave_payment_pending(self, mock_verify):
+        mock_verify.return_value = {"success": False, "message": "timeout"}
+        payment = self._payment("T-ERR")
+
+        result = reconcile_stale_pesapal_payments()
+
+        self.assertEqual(result["claimed"], 1)
+        self.assertEqual(result["errors"], 1)
+        self.assertIn("per_second", result)
+        self.assertIn("provider_avg_ms", result)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "pending")
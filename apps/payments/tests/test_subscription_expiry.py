@@ -0,0 +1,123 @@
+"""Tests for the hourly subscription expiry job."""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import Membership, Organization
+from apps.catalogue.models import Course
+from apps.learning.models import Certificate, Enrollment
+from apps.notifications.models import Notification
+from apps.payments.models import Subscription, UserSubscription
+from apps.payments.tasks import expire_overdue_subscriptions
+
+User = get_user_model()
+
+
+class ExpireOverdueSubscriptionsTest(TestCase):
+    def setUp(self):
+        self.plan = Subscription.objects.create(
+            name="Expiry Plan",
+            description="Plan for tests",
+            price=Decimal("49.00"),
+            currency="UGX",
+            billing_cycle="monthly",
+            status=Subscription.Status.ACTIVE,
+            duration_days=180,
+        )
+        self.course = Course.objects.create(
+            title="Expiry Course",
+            description="desc",
+            slug="expiry-course",
+            status="published",
+            instructor=self._user("expiry_inst", role=User.Role.INSTRUCTOR),
+        )
+        self.org = Organization.objects.create(name="Expiry Org")
+        self.admin = self._user("expiry_admin", role=User.Role.ORG_ADMIN)
+        Membership.objects.create(
+            user=self.admin, organization=self.org, role=Membership.Role.ORG_ADMIN, is_active=True
+        )
+
+    def _user(self, username, role=User.Role.LEARNER):
+        return User.objects.create_user(
+            username=username,
+            email=f"{username}@example.com",
+            password="pass1234",
+            role=role,
+            email_verified=True,
+            is_active=True,
+        )
+
+    def _subscription(self, user, ended_days_ago, organization=None):
+        return UserSubscription.objects.create(
+            user=user,
+            organization=organization,
+            subscription=self.plan,
+            status=UserSubscription.Status.ACTIVE,
+            price=self.plan.price,
+            currency=self.plan.currency,
+            end_date=timezone.now() - timedelta(days=ended_days_ago),
+        )
+
+    def _enrollment_with_certificate(self, user, number):
+        enrollment = Enrollment.objects.create(
+            user=user, course=self.course, status=Enrollment.Status.ACTIVE
+        )
+        certificate = Certificate.objects.create(enrollment=enrollment, certificate_number=number)
+        return enrollment, certificate
+
+    @patch("apps.notifications.services.send_tasc_email")
+    def test_expires_only_overdue_rows_and_cascades_to_their_enrollments(self, mock_send_email):
+        learner = self._user("expiry_learner")
+        Membership.objects.create(
+            user=learner, organization=self.org, role=Membership.Role.ORG_LEARNER, is_active=True
+        )
+        overdue = self._subscription(learner, ended_days_ago=30, organization=self.org)
+        enrollment, certificate = self._enrollment_with_certificate(learner, "CERT-EXP-1")
+
+        in_grace_user = self._user("grace_learner")
+        in_grace = self._subscription(in_grace_user, ended_days_ago=1)
+        kept_enrollment, kept_certificate = self._enrollment_with_certificate(in_grace_user, "CERT-EXP-2")
+
+        # An already-expired enrollment elsewhere keeps its certificate untouched.
+        other = self._user("other_learner")
+        stale_enrollment, stale_certificate = self._enrollment_with_certificate(other, "CERT-EXP-3")
+        Enrollment.objects.filter(pk=stale_enrollment.pk).update(status=Enrollment.Status.EXPIRED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            count = expire_overdue_subscriptions()
+
+        self.assertEqual(count, 1)
+        for obj in (overdue, in_grace, enrollment, kept_enrollment):
+            obj.refresh_from_db()
+        for cert in (certificate, kept_certificate, stale_certificate):
+            cert.refresh_from_db()
+        self.assertEqual(overdue.status, UserSubscription.Status.EXPIRED)
+        self.assertEqual(in_grace.status, UserSubscription.Status.ACTIVE)
+        self.assertEqual(enrollment.status, Enrollment.Status.EXPIRED)
+        self.assertEqual(kept_enrollment.status, Enrollment.Status.ACTIVE)
+        self.assertFalse(certificate.is_valid)
+        self.assertTrue(kept_certificate.is_valid)
+        self.assertTrue(stale_certificate.is_valid)
+
+        self.assertTrue(
+            Notification.objects.filter(
+                user=learner, type=Notification.Type.SUBSCRIPTION_EXPIRY
+            ).exists()
+        )
+        self.assertTrue(
+            Notification.objects.filter(user=self.admin, title="Subscription expired").exists()
+        )
+        mock_send_email.assert_called_once()
+
+    def test_nothing_overdue_is_a_no_op(self):
+        self._subscription(self._user("fresh_learner"), ended_days_ago=-10)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertEqual(expire_overdue_subscriptions(), 0)
+
+        self.assertEqual(callbacks, [])
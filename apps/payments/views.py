@@ -11,7 +11,6 @@ from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.utils import timezone
 from django.http import HttpResponse
 import uuid
-import csv
 from django.db.models import Q, Sum, Count
 from django.db.models.functions import TruncMonth
 
@@ -36,6 +35,7 @@ from .serializers import (
 )
 from .permissions import user_has_active_subscription, get_best_active_subscription, get_subscription_status, GRACE_PERIOD_DAYS
 from apps.accounts.permissions import IsFinanceDashboardUser
+from apps.common.csv_export import full_name, iter_rows, stream_csv
 
 
 def _is_finance_dashboard_user(user):
@@ -435,8 +435,6 @@ class InvoiceViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'], url_path='export-csv')
     def export_csv(self, request):
         """GET /api/v1/payments/invoices/export-csv/ — respects status, search filters"""
-        import csv as csv_module
-        from django.http import HttpResponse
         qs = self.get_queryset()
 
         status_filter = request.query_params.get('status')
@@ -446,25 +444,23 @@ class InvoiceViewSet(viewsets.ModelViewSet):
         if search:
             from django.db.models import Q as DQ
             qs = qs.filter(DQ(invoice_number__icontains=search) | DQ(user__email__icontains=search))
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="invoices.csv"'
-        writer = csv_module.writer(response)
-        writer.writerow([
-            'ID', 'Invoice Number', 'Customer', 'Amount', 'Currency',
-            'Status', 'Due Date', 'Created At',
-        ])
-        for inv in qs.select_related('user'):
-            writer.writerow([
-                inv.id,
-                inv.invoice_number,
-                inv.user.get_full_name() or inv.user.email if inv.user else '',
-                inv.total_amount,
-                getattr(inv, 'currency', 'USD'),
-                inv.status,
-                inv.due_date,
-                inv.created_at,
-            ])
-        return response
+
+        def to_row(row):
+            pk, number, user_id, first_name, last_name, email, total, currency, status_, due, created = row
+            customer = (full_name(first_name, last_name) or email) if user_id else ''
+            return [pk, number, customer, total, currency, status_, due, created]
+
+        return stream_csv(
+            'invoices.csv',
+            [
+                'ID', 'Invoice Number', 'Customer', 'Amount', 'Currency',
+                'Status', 'Due Date', 'Created At',
+            ],
+            iter_rows(qs, [
+                'id', 'invoice_number', 'user_id', 'user__first_name', 'user__last_name',
+                'user__email', 'total_amount', 'currency', 'status', 'due_date', 'created_at',
+            ], to_row),
+        )
 
 
 @extend_schema(
@@ -626,20 +622,17 @@ class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
         if to_date:
             qs = qs.filter(created_at__date__lte=to_date)
             
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="transactions.csv"'
-
-        writer = csv.writer(response)
-        writer.writerow([
-            'ID', 'Transaction ID', 'Amount', 'Currency', 'Status',
-            'Payment Method', 'Created At', 'Completed At',
-        ])
-        for t in qs:
-            writer.writerow([
-                t.id, t.transaction_id, t.amount, t.currency, t.status,
-                t.payment_method, t.created_at, t.completed_at,
-            ])
-        return response
+        return stream_csv(
+            'transactions.csv',
+            [
+                'ID', 'Transaction ID', 'Amount', 'Currency', 'Status',
+                'Payment Method', 'Created At', 'Completed At',
+            ],
+            iter_rows(qs, [
+                'id', 'transaction_id', 'amount', 'currency', 'status',
+                'payment_method', 'created_at', 'completed_at',
+            ]),
+        )
 
 
 @extend_schema(
@@ -1976,9 +1969,11 @@ class OrganizationSubscriptionListView(APIView):
         ):
             raise PermissionDenied("Only LMS Manager or TASC Admin can view this.")
 
-        from apps.accounts.models import Organization, Membership
+        from apps.accounts.models import Organization
+        from apps.accounts.seat_usage import all_seat_usage
 
         orgs = Organization.objects.filter(is_active=True)
+        seat_usage = all_seat_usage()
         results = []
         for org in orgs:
             sub = (
@@ -1990,9 +1985,8 @@ class OrganizationSubscriptionListView(APIView):
                 .order_by('-end_date')
                 .first()
             )
-            member_count = Membership.objects.filter(
-                organization=org, is_active=True
-            ).count()
+            usage = seat_usage.get(org.id)
+            member_count = usage.members if usage else 0
             results.append({
                 'organization_id': org.id,
                 'organization_name': org.name,
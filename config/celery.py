@@ -22,6 +22,18 @@ app.conf.beat_schedule = {
     },
     "reconcile-stale-pesapal-payments": {
         "task": "apps.payments.tasks.reconcile_stale_pesapal_payments",
-        "schedule": crontab(minute=15),
+        "schedule": crontab(minute="*/5"),
+    },
+    "refresh-learning-rollups-hourly": {
+        "task": "apps.learning.tasks.refresh_learning_rollups",
+        "schedule": crontab(minute=5),
+    },
+    "deliver-queued-emails": {
+        "task": "apps.notifications.tasks.deliver_queued_emails",
+        "schedule": crontab(),
+    },
+    "reconcile-storage-usage-daily": {
+        "task": "apps.common.tasks.reconcile_storage_usage",
+        "schedule": crontab(hour=3, minute=15),
     },
 }
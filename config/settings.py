@@ -5,7 +5,7 @@ Generated by 'django-admin startproject' using Django 6.0.1.
 """
 
 from pathlib import Path 
-import environ, os
+import environ, os, sys
 
 # ----------------------------------------
 # Base
@@ -20,6 +20,8 @@ environ.Env.read_env(BASE_DIR / ".env")
 SECRET_KEY = env("DJANGO_SECRET_KEY")
 DEBUG = env.bool("DJANGO_DEBUG", default=False)
 ALLOWED_HOSTS = env("DJANGO_ALLOWED_HOSTS").split(",")
+# True under `manage.py test` and pytest
+TESTING = (len(sys.argv) > 1 and sys.argv[1] == "test") or "pytest" in sys.modules
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # ----------------------------------------
@@ -113,6 +115,33 @@ else:
     }
 
 
+# ----------------------------------------
+# Cache
+# ----------------------------------------
+# Shared across workers and nodes when REDIS_URL is set; otherwise a
+# per-process local cache (development and tests).
+REDIS_URL = env("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": env("CACHE_KEY_PREFIX", default="tasc"),
+            "TIMEOUT": env.int("CACHE_DEFAULT_TIMEOUT", default=300),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tasc-default",
+        }
+    }
+# Seconds a process may serve a value from its in-memory tier
+# (apps.common.cache.tiered_cache) before re-reading the shared cache.
+CACHE_L1_TTL = env.float("CACHE_L1_TTL", default=2.0)
+
+
 # Email settings
 
 DJANGO_EMAIL_ENABLED = env.bool("DJANGO_EMAIL_ENABLED", default=True)
@@ -132,6 +161,19 @@ EMAIL_HOST_PASSWORD = env("EMAIL_HOST_PASSWORD", default="")
 EMAIL_USE_TLS = env.bool("EMAIL_USE_TLS", default=False)
 EMAIL_USE_SSL = env.bool("EMAIL_USE_SSL", default=False)
 
+# Outbound email queue (apps.notifications.email_queue). When enabled,
+# send_tasc_email stores the rendered email and a Celery worker delivers it.
+# For a local sink set EMAIL_PROVIDER=console and EMAIL_BACKEND to Django's
+# console or filebased backend (filebased writes to EMAIL_FILE_PATH).
+EMAIL_QUEUE_ENABLED = env.bool("EMAIL_QUEUE_ENABLED", default=True)
+EMAIL_QUEUE_BATCH_SIZE = env.int("EMAIL_QUEUE_BATCH_SIZE", default=500)
+EMAIL_QUEUE_MAX_ATTEMPTS = env.int("EMAIL_QUEUE_MAX_ATTEMPTS", default=5)
+# Retry n waits EMAIL_QUEUE_RETRY_BACKOFF_SECONDS * 2^(n-1) seconds.
+EMAIL_QUEUE_RETRY_BACKOFF_SECONDS = env.int("EMAIL_QUEUE_RETRY_BACKOFF_SECONDS", default=30)
+# A claimed email not sent within this many seconds is claimable again.
+EMAIL_QUEUE_CLAIM_SECONDS = env.int("EMAIL_QUEUE_CLAIM_SECONDS", default=300)
+EMAIL_FILE_PATH = env("EMAIL_FILE_PATH", default=str(BASE_DIR / "tmp" / "emails"))
+
 
 # ----------------------------------------
 # Authentication & Allauth
@@ -392,6 +434,15 @@ PESAPAL_BASE_URL = os.environ.get(
     "PESAPAL_BASE_URL", "https://cybqa.pesapal.com/pesapalv3"
 )
 
+# Stale pending payments are re-checked with Pesapal (apps.payments.reconciliation)
+# in batches of PESAPAL_RECONCILE_BATCH_SIZE, PESAPAL_RECONCILE_CONCURRENCY status
+# calls at a time; a run stops after PESAPAL_RECONCILE_MAX_SECONDS, and a payment
+# is not asked about again for PESAPAL_RECONCILE_RECHECK_MINUTES.
+PESAPAL_RECONCILE_BATCH_SIZE = env.int("PESAPAL_RECONCILE_BATCH_SIZE", default=200)
+PESAPAL_RECONCILE_CONCURRENCY = env.int("PESAPAL_RECONCILE_CONCURRENCY", default=8)
+PESAPAL_RECONCILE_MAX_SECONDS = env.int("PESAPAL_RECONCILE_MAX_SECONDS", default=240)
+PESAPAL_RECONCILE_RECHECK_MINUTES = env.int("PESAPAL_RECONCILE_RECHECK_MINUTES", default=15)
+
 # DigitalOcean Spaces (presigned uploads)
 DO_SPACES_REGION = env("DO_SPACES_REGION", default="")
 DO_SPACES_BUCKET = env("DO_SPACES_BUCKET", default="")
@@ -405,6 +456,140 @@ DO_SPACES_ACCESS_KEY_ID = env("DO_SPACES_ACCESS_KEY_ID", default="")
 DO_SPACES_SECRET_ACCESS_KEY = env("DO_SPACES_SECRET_ACCESS_KEY", default="")
 DO_SPACES_CDN_BASE_URL = env("DO_SPACES_CDN_BASE_URL", default="")
 DO_SPACES_PRESIGN_EXPIRY_SECONDS = env.int("DO_SPACES_PRESIGN_EXPIRY_SECONDS", default=300)
+# Storage quota per organization (or per user outside one); see apps.common.storage_usage.
+# When enforced, presigning is refused once the quota is used up. Off by
+# default: turn it on once the reconcile_storage_usage task has seeded the ledger.
+STORAGE_QUOTA_BYTES = env.int("STORAGE_QUOTA_BYTES", default=10 * 1024 * 1024 * 1024)
+STORAGE_QUOTA_ENFORCED = env.bool("STORAGE_QUOTA_ENFORCED", default=False)
+STORAGE_RECONCILE_PAGE_SIZE = env.int("STORAGE_RECONCILE_PAGE_SIZE", default=1000)
+
+# ----------------------------------------
+# Learning progress
+# ----------------------------------------
+# Playback heartbeats (time/position only) that arrive within this many
+# seconds of the last write to the same SessionProgress row are not persisted.
+SESSION_PROGRESS_HEARTBEAT_SECONDS = env.int("SESSION_PROGRESS_HEARTBEAT_SECONDS", default=15)
+
+# ----------------------------------------
+# Audit log (apps.audit)
+# ----------------------------------------
+# Entries are written in batches by a background thread (apps.audit.writer);
+# tests write them synchronously unless AUDIT_LOG_ASYNC is set.
+AUDIT_LOG_ASYNC = env.bool("AUDIT_LOG_ASYNC", default=not TESTING)
+AUDIT_LOG_BATCH_SIZE = env.int("AUDIT_LOG_BATCH_SIZE", default=200)
+AUDIT_LOG_FLUSH_INTERVAL = env.float("AUDIT_LOG_FLUSH_INTERVAL", default=1.0)
+# Entries allowed to wait in memory; beyond this callers write their own.
+AUDIT_LOG_QUEUE_SIZE = env.int("AUDIT_LOG_QUEUE_SIZE", default=10000)
+AUDIT_ACTOR_ORG_CACHE_TTL = env.int("AUDIT_ACTOR_ORG_CACHE_TTL", default=600)
+
+# ----------------------------------------
+# In-app notifications
+# ----------------------------------------
+# Rows per INSERT when notifying many users (apps.notifications.fanout).
+NOTIFICATION_FANOUT_BATCH_SIZE = env.int("NOTIFICATION_FANOUT_BATCH_SIZE", default=1000)
+# Cached unread counters are recounted from the table after this many seconds.
+NOTIFICATION_UNREAD_COUNT_TTL = env.int("NOTIFICATION_UNREAD_COUNT_TTL", default=900)
+
+# ----------------------------------------
+# Organization seat usage (apps.accounts.seat_usage)
+# ----------------------------------------
+# Seconds a member count is cached; membership changes invalidate it sooner.
+SEAT_USAGE_CACHE_TTL = env.int("SEAT_USAGE_CACHE_TTL", default=300)
+
+# ----------------------------------------
+# CSV user import (apps.accounts.user_import)
+# ----------------------------------------
+# Rows validated and inserted together; progress is saved after each chunk.
+USER_IMPORT_CHUNK_SIZE = env.int("USER_IMPORT_CHUNK_SIZE", default=500)
+USER_IMPORT_MAX_ROWS = env.int("USER_IMPORT_MAX_ROWS", default=50000)
+
+# ----------------------------------------
+# Bulk enrollment (apps.learning.bulk_enrollment)
+# ----------------------------------------
+# Enrollments checked and inserted together; progress is saved after each batch.
+BULK_ENROLLMENT_BATCH_SIZE = env.int("BULK_ENROLLMENT_BATCH_SIZE", default=1000)
+# Largest user_ids list accepted in one request.
+BULK_ENROLLMENT_MAX_USERS = env.int("BULK_ENROLLMENT_MAX_USERS", default=50000)
+
+# ----------------------------------------
+# Provider HTTP clients (apps.common.http_client)
+# ----------------------------------------
+# Payment and meeting provider calls share pooled keep-alive connections.
+PROVIDER_HTTP_TIMEOUT = env.int("PROVIDER_HTTP_TIMEOUT", default=30)
+PROVIDER_HTTP_POOL_SIZE = env.int("PROVIDER_HTTP_POOL_SIZE", default=10)
+# Retries for connection errors, and for 429/5xx on idempotent requests,
+# sleeping PROVIDER_HTTP_BACKOFF * 2^n seconds between attempts.
+PROVIDER_HTTP_RETRIES = env.int("PROVIDER_HTTP_RETRIES", default=3)
+PROVIDER_HTTP_BACKOFF = env.float("PROVIDER_HTTP_BACKOFF", default=0.5)
+# OAuth tokens are refreshed this many seconds before they expire.
+PROVIDER_TOKEN_REFRESH_MARGIN = env.int("PROVIDER_TOKEN_REFRESH_MARGIN", default=60)
+
+# ----------------------------------------
+# CSV exports
+# ----------------------------------------
+# Rows fetched per database round trip while streaming an export.
+CSV_EXPORT_CHUNK_SIZE = env.int("CSV_EXPORT_CHUNK_SIZE", default=2000)
+
+# ----------------------------------------
+# Reports
+# ----------------------------------------
+# How often (in rows) report generation saves its progress on the Report.
+REPORT_PROGRESS_ROWS = env.int("REPORT_PROGRESS_ROWS", default=5000)
+
+# ----------------------------------------
+# Learning analytics rollups
+# ----------------------------------------
+# Dashboards read the pre-aggregated rollups only if they were rebuilt within
+# this many seconds (clients may ask for fresher data with ?max_age=); older
+# or missing rollups fall back to aggregating the raw tables.
+ANALYTICS_ROLLUP_MAX_AGE_SECONDS = env.int("ANALYTICS_ROLLUP_MAX_AGE_SECONDS", default=7200)
+# Rows per INSERT when the rollups are rebuilt.
+ANALYTICS_ROLLUP_BATCH_SIZE = env.int("ANALYTICS_ROLLUP_BATCH_SIZE", default=1000)
+
+# ----------------------------------------
+# Public catalogue cache
+# ----------------------------------------
+# Server-side lifetime of cached public catalogue responses. Course, category,
+# tag and certificate writes invalidate them early; counts that depend on other
+# models (enrollments, users) can lag by up to this long.
+PUBLIC_CATALOGUE_CACHE_TTL = env.int("PUBLIC_CATALOGUE_CACHE_TTL", default=300)
+# Cache-Control max-age sent to browsers/CDNs, which revalidate via ETag after it.
+PUBLIC_CATALOGUE_MAX_AGE = env.int("PUBLIC_CATALOGUE_MAX_AGE", default=60)
+
+# ----------------------------------------
+# Subscription entitlements
+# ----------------------------------------
+# Upper bound on how long a user's/organization's subscription access window
+# stays cached. Subscription saves invalidate it, and entries never outlive
+# the next expiry boundary.
+SUBSCRIPTION_ENTITLEMENT_CACHE_TTL = env.int("SUBSCRIPTION_ENTITLEMENT_CACHE_TTL", default=3600)
+
+# ----------------------------------------
+# Quiz grading
+# ----------------------------------------
+# Lifetime of a quiz's compiled answer keys; edits to its questions retire
+# the cached table immediately.
+QUIZ_GRADING_TABLE_TTL = env.int("QUIZ_GRADING_TABLE_TTL", default=3600)
+
+# ----------------------------------------
+# Badges
+# ----------------------------------------
+# How long each process keeps the badge threshold index in memory.
+BADGE_INDEX_TTL_SECONDS = env.int("BADGE_INDEX_TTL_SECONDS", default=300)
+
+# ----------------------------------------
+# Certificate verification (apps.learning.certificate_verification)
+# ----------------------------------------
+# Key for the sig in certificate verification links; defaults to SECRET_KEY.
+# Changing it invalidates every link already issued.
+CERTIFICATE_SIGNING_KEY = env("CERTIFICATE_SIGNING_KEY", default="")
+# Server-side lifetime of cached verification results; certificate changes
+# drop them sooner.
+CERTIFICATE_VERIFY_CACHE_TTL = env.int("CERTIFICATE_VERIFY_CACHE_TTL", default=3600)
+# Cache-Control max-age sent with public verification responses.
+CERTIFICATE_VERIFY_MAX_AGE = env.int("CERTIFICATE_VERIFY_MAX_AGE", default=300)
+# Largest batch accepted by certificates/verify/batch/.
+CERTIFICATE_VERIFY_BATCH_MAX = env.int("CERTIFICATE_VERIFY_BATCH_MAX", default=1000)
 
 # ----------------------------------------
 # Celery Configuration (Database-backed for development)
@@ -412,6 +597,9 @@ DO_SPACES_PRESIGN_EXPIRY_SECONDS = env.int("DO_SPACES_PRESIGN_EXPIRY_SECONDS", d
 CELERY_BROKER_URL = env("CELERY_BROKER_URL", default="django://")
 CELERY_RESULT_BACKEND = "django-db"
 CELERY_CACHE_BACKEND = "default"
+# Run queued tasks inline (apps.common.async_tasks also falls back to this
+# when the broker can't be reached).
+CELERY_TASK_ALWAYS_EAGER = env.bool("CELERY_TASK_ALWAYS_EAGER", default=False)
 
 # Use database-backed scheduler for development
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
@@ -427,12 +615,24 @@ CELERY_BEAT_SCHEDULE = {
     },
     "reconcile-stale-pesapal-payments": {
         "task": "apps.payments.tasks.reconcile_stale_pesapal_payments",
-        "schedule": 1800.0,
+        "schedule": 300.0,
     },
     "check-seat-capacity-daily": {
         "task": "apps.payments.tasks.check_seat_capacity",
         "schedule": 86400.0,
     },
+    "refresh-learning-rollups-hourly": {
+        "task": "apps.learning.tasks.refresh_learning_rollups",
+        "schedule": 3600.0,
+    },
+    "deliver-queued-emails": {
+        "task": "apps.notifications.tasks.deliver_queued_emails",
+        "schedule": 60.0,
+    },
+    "reconcile-storage-usage-daily": {
+        "task": "apps.common.tasks.reconcile_storage_usage",
+        "schedule": 86400.0,
+    },
 }
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'